@@ -0,0 +1,76 @@
+"""Benchmark convergence of Hogwild training against core count.
+
+Trains fresh agents on a SharedQTable pre-sized from an enumeration of the
+game, with 1 to --workers processes, and a single-process agent on a dict,
+printing the policy error rate against the exact solution and the wall time
+after every round of episodes.
+
+To run:
+    python -m benchmarks.hogwild -g tictactoe -e 20000 -w 4
+
+"""
+
+
+import argparse
+import time
+import numpy as np
+
+from game.tictactoe import TicTacToe
+from game.chomp_young import YoungChomp
+from rl.agent import Agent
+from rl.shared import SharedQTable, enumerate_states
+from solver.exact import ExactSolver
+
+
+GAMES = {'tictactoe': lambda: TicTacToe(symmetry=True),
+         'chomp': lambda: YoungChomp(rows=5, cols=5)}
+
+
+def process_args():
+    """Process command line args."""
+    parser = argparse.ArgumentParser(description='Hogwild convergence benchmark.')
+    parser.add_argument('-g', '--game', dest='game', help='tictactoe or chomp.', default='tictactoe')
+    parser.add_argument('-e', '--episodes', dest='episodes', type=int, help='Training episodes.', default=20000)
+    parser.add_argument('-r', '--rounds', dest='rounds', type=int, help='Measurements per run.', default=10)
+    parser.add_argument('-w', '--workers', dest='workers', type=int, help='Most worker processes.', default=4)
+    parser.add_argument('-s', '--seed', dest='seed', type=int, help='NumPy seed.', default=0)
+    return parser.parse_args()
+
+
+def run(make_game, solver, qtable, episodes, rounds, workers, seed):
+    """Returns list of (episodes, seconds, policy error rate) after every round of training."""
+    np.random.seed(seed)
+    agent = Agent(make_game(), qtable=qtable)
+    results = []
+    seconds = 0.0
+    for k in range(1, rounds + 1):
+        start = time.time()
+        agent.train(episodes // rounds, history=[], workers=workers)
+        seconds += time.time() - start
+        results.append((k * (episodes // rounds), seconds, solver.policy_error_rate(agent.qtable)))
+    return results
+
+
+def main():
+    args = process_args()
+    make_game = GAMES[args.game]
+    solver = ExactSolver(make_game())
+    solver.solve()
+    states = enumerate_states(make_game())
+    print('States: {}'.format(len(states)))
+
+    runs = [('serial', run(make_game, solver, {}, args.episodes, args.rounds, 1, args.seed))]
+    workers = 1
+    while workers <= args.workers:
+        runs.append(('hogwild x{}'.format(workers),
+                     run(make_game, solver, SharedQTable(states), args.episodes, args.rounds, workers, args.seed)))
+        workers *= 2
+
+    print('{:>12} {:>10} {:>10} {:>10}'.format('run', 'episodes', 'seconds', 'error'))
+    for name, results in runs:
+        for episodes, seconds, error in results:
+            print('{:>12} {:>10} {:>10.2f} {:>10.4f}'.format(name, episodes, seconds, error))
+
+
+if __name__ == '__main__':
+    main()
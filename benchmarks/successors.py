@@ -0,0 +1,76 @@
+"""Benchmark reuse of next states between update and the next next_move.
+
+Plays self-play training games with the successor cache and with an agent
+that drops it after every lookup, reporting get_open_moves calls and time
+per game.
+
+To run:
+    python -m benchmarks.successors -g connectfour -e 2000
+
+"""
+
+
+import argparse
+import time
+import numpy as np
+
+from game.tictactoe import TicTacToe
+from game.connectfour import ConnectFour
+from game.chomp_young import YoungChomp
+from rl.agent import Agent
+
+
+GAMES = {'tictactoe': TicTacToe,
+         'connectfour': lambda: ConnectFour(hashed=True),
+         'chomp': lambda: YoungChomp(rows=6, cols=6)}
+
+
+class UncachedAgent(Agent):
+    """Agent that computes next states on every call, as before the cache."""
+
+    def successor_moves(self):
+        """Returns next states and actions without caching them."""
+        result = Agent.successor_moves(self)
+        self.successors = None
+        return result
+
+
+def process_args():
+    """Process command line args."""
+    parser = argparse.ArgumentParser(description='Successor cache benchmark.')
+    parser.add_argument('-g', '--game', dest='game', help='tictactoe, connectfour or chomp.', default='connectfour')
+    parser.add_argument('-e', '--episodes', dest='episodes', type=int, help='Training episodes.', default=2000)
+    parser.add_argument('-s', '--seed', dest='seed', type=int, help='NumPy seed.', default=0)
+    return parser.parse_args()
+
+
+def run(agent_class, make_game, episodes, seed):
+    """Returns get_open_moves calls and seconds per game of training."""
+    np.random.seed(seed)
+    game = make_game()
+    calls = [0]
+    get_open_moves = game.get_open_moves
+
+    def counted():
+        calls[0] += 1
+        return get_open_moves()
+    game.get_open_moves = counted
+
+    agent = agent_class(game, qtable={})
+    start = time.time()
+    agent.train(episodes, history=[])
+    seconds = time.time() - start
+    return (calls[0] * 1.0) / episodes, seconds / episodes
+
+
+def main():
+    args = process_args()
+    make_game = GAMES[args.game]
+    print('{:>10} {:>12} {:>14}'.format('agent', 'calls/game', 'ms/game'))
+    for name, agent_class in (('uncached', UncachedAgent), ('cached', Agent)):
+        calls, seconds = run(agent_class, make_game, args.episodes, args.seed)
+        print('{:>10} {:>12.2f} {:>14.3f}'.format(name, calls, seconds * 1000))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,237 @@
+"""Microbenchmark and regression suite for game engines and agent steps.
+
+Times get_open_moves, make_move (undone after every move), is_win and
+get_state on seeded random positions of every game, and Agent.step,
+Agent.train and Agent.stats end to end. Every benchmark is warmed up, then
+repeated, keeping the best and median seconds per operation.
+
+To run:
+    python -m benchmarks.suite run
+    python -m benchmarks.suite save
+    python -m benchmarks.suite compare --tolerance 0.1
+
+save records benchmarks/baseline.json, and compare exits with status 1
+if any benchmark is slower than its baseline by more than the tolerance.
+"""
+
+
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+import numpy as np
+
+from game.tictactoe import TicTacToe
+from game.connectfour import ConnectFour
+from game.chomp import Chomp
+from game.chomp_young import YoungChomp
+from rl.agent import Agent
+
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+GAMES = [('tictactoe', lambda: TicTacToe()),
+         ('connectfour_4x4', lambda: ConnectFour(rows=4, cols=4)),
+         ('connectfour_6x7', lambda: ConnectFour()),
+         ('connectfour_8x9', lambda: ConnectFour(rows=8, cols=9)),
+         ('chomp_3x4', lambda: Chomp(rows=3, cols=4)),
+         ('chomp_5x5', lambda: Chomp(rows=5, cols=5)),
+         ('youngchomp_6x6', lambda: YoungChomp(rows=6, cols=6))]
+
+
+def process_args():
+    """Process command line args."""
+    parser = argparse.ArgumentParser(description='Microbenchmark and regression suite.')
+    parser.add_argument('command', help='run, save or compare.')
+    parser.add_argument('-b', '--baseline', dest='baseline', help='Baseline JSON file.', default=BASELINE)
+    parser.add_argument('-f', '--filter', dest='filter', help='Only benchmarks containing this.', default='')
+    parser.add_argument('-r', '--repeat', dest='repeat', type=int, help='Timed repeats.', default=5)
+    parser.add_argument('-w', '--warmup', dest='warmup', type=int, help='Untimed warm-up runs.', default=1)
+    parser.add_argument('-t', '--tolerance', dest='tolerance', type=float,
+                        help='Allowed slowdown as a fraction of the baseline.', default=0.1)
+    return parser.parse_args()
+
+
+def positions(make_game, count=50, seed=0):
+    """Returns list of (game, action) of count seeded random unfinished positions and a legal move of each."""
+    rng = random.Random(seed)
+    result = []
+    while len(result) < count:
+        game = make_game()
+        depth = rng.randint(0, 20)
+        for i in range(depth):
+            actions = game.get_actions()
+            if game.make_move(rng.choice(actions)):
+                break
+        else:
+            result.append((game, rng.choice(game.get_actions())))
+    return result
+
+
+def get_state(game):
+    """Returns state of the game board, around the middle column for windowed Connect Four."""
+    if isinstance(game, ConnectFour) and game.window is not None:
+        return game.get_state(game.board, game.cols // 2)
+    return game.get_state(game.board)
+
+
+def record_tokens(game):
+    """Make apply_move of game record its undo tokens, returning the list they go to."""
+    tokens = []
+    apply_move = game.apply_move
+
+    def recorded(action):
+        token = apply_move(action)
+        tokens.append(token)
+        return token
+    game.apply_move = recorded
+    return tokens
+
+
+def engine_benchmarks(name, make_game):
+    """Returns list of (benchmark name, operations, function) of a game engine.
+
+    make_move runs on its own copies of the positions, as recording undo
+    tokens would slow the move generation of get_open_moves down.
+    """
+    cases = positions(make_game)
+    undo = [(game, action, record_tokens(game)) for game, action in positions(make_game)]
+
+    def open_moves():
+        for game, action in cases:
+            game.get_open_moves()
+
+    def make_move():
+        # make_move returns the winner, so its undo token is taken from apply_move
+        for game, action, tokens in undo:
+            game.make_move(action)
+            token = tokens[-1]
+            del tokens[:]
+            game.undo_move(token)
+
+    def is_win():
+        for game, action in cases:
+            game.is_win()
+
+    def state():
+        for game, action in cases:
+            get_state(game)
+
+    return [('{}.get_open_moves'.format(name), len(cases), open_moves),
+            ('{}.make_move'.format(name), len(cases), make_move),
+            ('{}.is_win'.format(name), len(cases), is_win),
+            ('{}.get_state'.format(name), len(cases), state)]
+
+
+def agent_benchmarks():
+    """Returns list of (benchmark name, operations, function) of the agent end to end."""
+    benchmarks = []
+    for name, make_game, episodes in (('tictactoe', lambda: TicTacToe(), 200),
+                                      ('connectfour_6x7', lambda: ConnectFour(hashed=True), 50),
+                                      ('chomp_5x5', lambda: Chomp(rows=5, cols=5), 100)):
+        agent = Agent(make_game(), qtable={})
+
+        def step(agent=agent):
+            np.random.seed(0)
+            agent.qtable = {}
+            for i in range(100):
+                winner, reward = agent.step()
+                if winner:
+                    agent.game.reset()
+            agent.game.reset()
+
+        def train(make_game=make_game, episodes=episodes):
+            np.random.seed(0)
+            Agent(make_game(), qtable={}).train(episodes, history=[])
+
+        def stats(agent=agent):
+            agent.stats(games=200)
+
+        benchmarks += [('agent.{}.step'.format(name), 100, step),
+                       ('agent.{}.train'.format(name), episodes, train),
+                       ('agent.{}.stats'.format(name), 200, stats)]
+    return benchmarks
+
+
+def measure(function, operations, repeat=5, warmup=1):
+    """Returns best and median seconds per operation of function over repeat timed runs after warmup runs."""
+    for i in range(warmup):
+        function()
+    times = []
+    for i in range(repeat):
+        start = time.time()
+        function()
+        times.append((time.time() - start) / operations)
+    return {'best': min(times), 'median': float(np.median(times))}
+
+
+def run(pattern='', repeat=5, warmup=1, out=sys.stdout):
+    """Returns dict of benchmark name to timings of every benchmark whose name contains pattern."""
+    benchmarks = []
+    for name, make_game in GAMES:
+        benchmarks += engine_benchmarks(name, make_game)
+    benchmarks += agent_benchmarks()
+    results = {}
+    stdout = sys.stdout
+    for name, operations, function in benchmarks:
+        if pattern not in name:
+            continue
+        # Silence progress printed by training and stats
+        sys.stdout = open(os.devnull, 'w')
+        try:
+            results[name] = measure(function, operations, repeat, warmup)
+        finally:
+            sys.stdout.close()
+            sys.stdout = stdout
+        out.write('{:<40} {:>12.2f} us\n'.format(name, results[name]['best'] * 1e6))
+    return results
+
+
+def compare(results, baseline, tolerance=0.1, out=sys.stdout):
+    """Print best times against baseline, returning list of names slower by more than tolerance."""
+    regressions = []
+    out.write('{:<40} {:>12} {:>12} {:>8}\n'.format('benchmark', 'baseline us', 'current us', 'change'))
+    for name in sorted(results):
+        if name not in baseline:
+            out.write('{:<40} {:>12} {:>12.2f}\n'.format(name, '-', results[name]['best'] * 1e6))
+            continue
+        before = baseline[name]['best']
+        after = results[name]['best']
+        change = (after - before) / before
+        flag = ''
+        if change > tolerance:
+            regressions.append(name)
+            flag = '  REGRESSION'
+        out.write('{:<40} {:>12.2f} {:>12.2f} {:>+7.1%}{}\n'.format(name, before * 1e6, after * 1e6, change, flag))
+    return regressions
+
+
+def main():
+    """Entry point."""
+    args = process_args()
+    if args.command == 'run':
+        run(args.filter, args.repeat, args.warmup)
+    elif args.command == 'save':
+        results = run(args.filter, args.repeat, args.warmup)
+        with open(args.baseline, 'w') as out:
+            json.dump({'python': platform.python_version(),
+                       'machine': platform.platform(),
+                       'results': results}, out, indent=2, sort_keys=True)
+    elif args.command == 'compare':
+        with open(args.baseline) as f:
+            baseline = json.load(f)['results']
+        results = run(args.filter, args.repeat, args.warmup, out=open(os.devnull, 'w'))
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print('{} regressions beyond {:.0%}'.format(len(regressions), args.tolerance))
+            sys.exit(1)
+    else:
+        print('Command {} is unsupported.'.format(args.command))
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,281 @@
+"""Batched board games.
+
+Batches hold N boards of one game in NumPy arrays and step all of them at once
+from a vector of actions. Players and winners are encoded as integers:
+0 is empty or no winner, 1 is X, 2 is O and 3 is a draw.
+
+States are the integer states of the matching hashed game, so a qtable trained
+on a batch can be played with the game:
+- BatchTicTacToe uses the state index of BitmaskTicTacToe(hashed=True)
+- BatchConnectFour uses the Zobrist hash of ConnectFour(hashed=True)
+- BatchChomp uses the packed heights of YoungChomp(hashed=True)
+"""
+
+
+import numpy as np
+
+from chomp_young import YoungChomp
+from connectfour import ConnectFour
+from tictactoe_bitmask import BitmaskTicTacToe, WIN_MASKS
+
+
+PLAYERS = {'X': 1, 'O': 2}
+VALUES = {1: 'X', 2: 'O', 3: 'Draw'}
+DRAW = 3
+
+
+class BatchGame(object):
+    """General batch of N boards of one game."""
+
+    def __init__(self, n, actions):
+        """Initialize batch of n boards with a fixed number of action slots."""
+        self.n = n
+        self.actions = actions
+        self.players = np.ones(n, dtype=np.int8)
+
+    def reset(self, done=None):
+        """Reset boards where done is True, or every board."""
+        if done is None:
+            done = np.ones(self.n, dtype=bool)
+        self.players[done] = 1
+        self.clear(done)
+
+    def step(self, actions):
+        """Make one move on every board from vector of action slots.
+
+        Finished boards are reset after the move.
+        Returns winner of every board (0 unfinished) and done flags.
+        """
+        rows = np.arange(self.n)
+        self.apply(rows, actions)
+        winners = self.winners()
+        self.players = 3 - self.players
+        done = winners != 0
+        if done.any():
+            self.reset(done)
+        return winners, done
+
+    def get_action(self, slot):
+        """Returns game action of action slot."""
+        return slot
+
+    def clear(self, done):
+        """Clear boards where done is True."""
+        raise NotImplementedError('Clear must be implemented.')
+
+    def legal(self):
+        """Returns (n, actions) mask of legal action slots."""
+        raise NotImplementedError('Legal must be implemented.')
+
+    def candidate_states(self):
+        """Returns (n, actions) integer states after each action slot, garbage where illegal."""
+        raise NotImplementedError('Candidate states must be implemented.')
+
+    def apply(self, rows, actions):
+        """Make move of current player on every board."""
+        raise NotImplementedError('Apply must be implemented.')
+
+    def winners(self):
+        """Returns winner of every board after the current player moved."""
+        raise NotImplementedError('Winners must be implemented.')
+
+
+class BatchTicTacToe(BatchGame):
+    """Batch of Tic Tac Toe boards."""
+
+    def __init__(self, n):
+        """Initialize batch of n empty boards."""
+        BatchGame.__init__(self, n, 9)
+        self.boards = np.zeros((n, 9), dtype=np.int8)
+        self.indices = np.zeros(n, dtype=np.int64)
+        self.powers = 3 ** np.arange(9, dtype=np.int64)
+        # Cells of every winning line as (9, 8) matrix
+        self.lines = np.array([[(mask >> i) & 1 for mask in WIN_MASKS] for i in range(9)],
+                              dtype=np.int8)
+
+    def clear(self, done):
+        """Clear boards where done is True."""
+        self.boards[done] = 0
+        self.indices[done] = 0
+
+    def legal(self):
+        """Returns (n, 9) mask of empty positions."""
+        return self.boards == 0
+
+    def candidate_states(self):
+        """Returns (n, 9) state indices after current player takes each position."""
+        return self.indices[:, None] + (self.players[:, None].astype(np.int64) * self.powers[None, :])
+
+    def apply(self, rows, actions):
+        """Make move of current player on every board."""
+        self.boards[rows, actions] = self.players
+        self.indices += self.players * self.powers[actions]
+
+    def winners(self):
+        """Returns winner of every board after the current player moved."""
+        mine = (self.boards == self.players[:, None]).astype(np.int8)
+        won = (mine.dot(self.lines) == 3).any(axis=1)
+        winners = np.where(won, self.players, 0).astype(np.int8)
+        winners[~won & (self.boards != 0).all(axis=1)] = DRAW
+        return winners
+
+
+class BatchConnectFour(BatchGame):
+    """Batch of Connect Four boards."""
+
+    def __init__(self, n, rows=6, cols=7, window=3):
+        """Initialize batch of n empty boards.
+
+        Zobrist keys are taken from ConnectFour(hashed=True) of the same size and window.
+        """
+        BatchGame.__init__(self, n, cols)
+        self.rows = rows
+        self.cols = cols
+        self.window = window
+        self.boards = np.zeros((n, rows, cols), dtype=np.int8)
+        self.heights = np.zeros((n, cols), dtype=np.int64)
+        game = ConnectFour(rows=rows, cols=cols, window=window, hashed=True)
+        span = cols if window is None else window
+        # Zobrist key of every (window offset, row, value), zero for empty
+        self.zobrist = np.zeros((span, rows, 3), dtype=np.uint64)
+        for k in range(span):
+            for row in range(rows):
+                for value, player in PLAYERS.items():
+                    self.zobrist[k, row, player] = game.zobrist[(k * rows) + row][value]
+        self.width_keys = np.array(game.width_keys, dtype=np.uint64)
+        if window is None:
+            self.hashes = np.zeros(n, dtype=np.uint64)
+        else:
+            self.hashes = np.zeros((n, cols, window), dtype=np.uint64)
+        self.clear(np.ones(n, dtype=bool))
+
+    def clear(self, done):
+        """Clear boards where done is True."""
+        self.boards[done] = 0
+        self.heights[done] = 0
+        if self.window is None:
+            self.hashes[done] = self.width_keys[self.cols]
+        else:
+            self.hashes[done] = 0
+
+    def legal(self):
+        """Returns (n, cols) mask of columns that are not full."""
+        return self.heights < self.rows
+
+    def candidate_states(self):
+        """Returns (n, cols) hashed states after current player drops in each column."""
+        states = np.zeros((self.n, self.cols), dtype=np.uint64)
+        # Landing row of every column, clipped for full columns
+        landing = np.maximum(self.rows - 1 - self.heights, 0)
+        for col in range(self.cols):
+            if self.window is None:
+                start = 0
+                h = self.hashes
+            else:
+                half = self.window // 2
+                start = max(col - half, 0)
+                end = min(col + half + 1, self.cols)
+                h = np.full(self.n, self.width_keys[end - start], dtype=np.uint64)
+                for i in range(start, end):
+                    h = h ^ self.hashes[:, i, i - start]
+            states[:, col] = h ^ self.zobrist[col - start, landing[:, col], self.players]
+        return states
+
+    def apply(self, rows, actions):
+        """Make move of current player on every board."""
+        landing = self.rows - 1 - self.heights[rows, actions]
+        self.boards[rows, landing, actions] = self.players
+        self.heights[rows, actions] += 1
+        if self.window is None:
+            self.hashes ^= self.zobrist[actions, landing, self.players]
+        else:
+            self.hashes[rows, actions, :] ^= self.zobrist[:, landing, self.players].T
+
+    def winners(self):
+        """Returns winner of every board after the current player moved."""
+        mine = self.boards == self.players[:, None, None]
+        won = (mine[:, :, :-3] & mine[:, :, 1:-2] & mine[:, :, 2:-1] & mine[:, :, 3:]).any(axis=(1, 2))
+        won |= (mine[:, :-3] & mine[:, 1:-2] & mine[:, 2:-1] & mine[:, 3:]).any(axis=(1, 2))
+        won |= (mine[:, :-3, :-3] & mine[:, 1:-2, 1:-2] &
+                mine[:, 2:-1, 2:-1] & mine[:, 3:, 3:]).any(axis=(1, 2))
+        won |= (mine[:, :-3, 3:] & mine[:, 1:-2, 2:-1] &
+                mine[:, 2:-1, 1:-2] & mine[:, 3:, :-3]).any(axis=(1, 2))
+        winners = np.where(won, self.players, 0).astype(np.int8)
+        winners[~won & (self.heights == self.rows).all(axis=1)] = DRAW
+        return winners
+
+
+class BatchChomp(BatchGame):
+    """Batch of Chomp boards kept as Young diagrams of column heights.
+
+    Action slot a is the square (a // cols, a % cols).
+    """
+
+    def __init__(self, n, rows=3, cols=4, transpose=True):
+        """Initialize batch of n full boards."""
+        BatchGame.__init__(self, n, rows * cols)
+        if (rows + 1) ** cols * 2 >= 2 ** 63:
+            raise ValueError('Chomp board {}x{} is too large for packed states.'.format(rows, cols))
+        self.rows = rows
+        self.cols = cols
+        self.transpose = transpose and rows == cols
+        self.heights = np.zeros((n, cols), dtype=np.int64)
+        slots = np.arange(rows * cols)
+        self.caps = rows - 1 - (slots // cols)
+        self.starts = slots % cols
+        # Columns capped by each action slot
+        self.capped = np.arange(cols)[None, :] >= self.starts[:, None]
+        self.powers = (rows + 1) ** np.arange(cols, dtype=np.int64)
+        self.clear(np.ones(n, dtype=bool))
+
+    def get_action(self, slot):
+        """Returns (row, col) action of action slot."""
+        return (slot // self.cols, slot % self.cols)
+
+    def clear(self, done):
+        """Clear boards where done is True."""
+        self.heights[done] = self.rows
+
+    def legal(self):
+        """Returns (n, rows * cols) mask of remaining squares other than the poison."""
+        legal = self.heights[:, self.starts] > self.caps[None, :]
+        legal[:, (self.rows - 1) * self.cols] = False
+        return legal
+
+    def chomp_heights(self, heights, slots):
+        """Returns column heights after chomping, broadcasting heights against action slots."""
+        return np.where(self.capped[slots], np.minimum(heights, self.caps[slots][..., None]), heights)
+
+    def candidate_states(self):
+        """Returns (n, rows * cols) packed states after current player chomps at each square."""
+        slots = np.arange(self.actions)
+        heights = self.chomp_heights(self.heights[:, None, :], slots[None, :])
+        states = heights.dot(self.powers)
+        if self.transpose:
+            conj = (heights[..., None] > np.arange(self.rows)).sum(axis=2)
+            states = np.minimum(states, conj.dot(self.powers))
+        return (states * 2) + (self.players[:, None] == 2)
+
+    def apply(self, rows, actions):
+        """Make move of current player on every board."""
+        self.heights = self.chomp_heights(self.heights, actions)
+
+    def winners(self):
+        """Returns winner of every board after the current player moved.
+
+        Win means only the poison block is left, there is no Draw.
+        """
+        done = (self.heights[:, 0] <= 1) & (self.heights[:, 1:] == 0).all(axis=1)
+        return np.where(done, self.players, 0).astype(np.int8)
+
+
+def make_batch(game, n):
+    """Returns batch of n boards matching game, which must use integer states."""
+    if isinstance(game, BitmaskTicTacToe) and game.hashed:
+        return BatchTicTacToe(n)
+    elif isinstance(game, ConnectFour) and game.hashed:
+        return BatchConnectFour(n, rows=game.rows, cols=game.cols, window=game.window)
+    elif isinstance(game, YoungChomp) and game.hashed and not game.history:
+        return BatchChomp(n, rows=game.rows, cols=game.cols, transpose=game.transpose)
+    raise ValueError('Batches need BitmaskTicTacToe, ConnectFour or YoungChomp '
+                     'with hashed=True, not {}.'.format(type(game).__name__))
@@ -8,14 +8,31 @@ import sys
 class Chomp(Game):
     """Chomp game class."""
 
-    def __init__(self, rows=3, cols=4):
-        """Construct new chomp game instance."""
+    def __init__(self, rows=3, cols=4, hashed=False):
+        """Construct new chomp game instance.
+
+        With hashed states are Zobrist hashes of the labelled board instead of Strings.
+        """
         self.rows = rows
         self.cols = cols
+        self.hashed = hashed
+        if hashed:
+            self.init_hash(rows * cols, self.get_labels())
         self.board = self.create_board(rows, cols)
         self.player = 'X'
         self.winner = None
 
+    @property
+    def board(self):
+        """2D list representation of board."""
+        return self._board
+
+    @board.setter
+    def board(self, board):
+        """Set board, which changes the position."""
+        self._board = board
+        self.version += 1
+
     def create_board(self, rows, cols):
         """Create board given dimensions."""
         board = []
@@ -32,6 +49,17 @@ class Chomp(Game):
         self.board = self.create_board(self.rows, self.cols)
         self.player = 'X'
         self.winner = None
+        self.hash = 0
+        self.version += 1
+
+    def get_labels(self):
+        """Returns every label an eaten square can have."""
+        labels = []
+        for value in ['X', 'O']:
+            for i in range(self.rows):
+                for j in range(self.cols):
+                    labels.append(value + str(i) + str(j))
+        return labels
 
     def flatten(self, board):
         """Returns flattened representation of board."""
@@ -57,6 +85,21 @@ class Chomp(Game):
                         board[i][j] = value + str(action[0]) + str(action[1])
         return board
 
+    def chomp_hash(self, action, value, eaten=None):
+        """Returns Zobrist hash of board after chomping at action without copying the board.
+
+        Eaten is the list of squares the chomp eats if already known.
+        """
+        h = self.hash
+        label = value + str(action[0]) + str(action[1])
+        if eaten is None:
+            board = self.board
+            eaten = [(i, j) for i in range(action[0] + 1) for j in range(action[1], self.cols)
+                     if board[i][j] == '-']
+        for i, j in eaten:
+            h ^= self.zobrist[(i * self.cols) + j][label]
+        return h
+
     def get_state(self, board):
         """Get state representation of board."""
         flat = self.flatten(board)
@@ -70,18 +113,36 @@ class Chomp(Game):
         """
         states = []
         actions = []
+        board = self.board
         for i in range(self.rows):
             for j in range(self.cols):
-                if self.board[i][j] == '-':
+                if board[i][j] == '-':
                     # Open position
                     action = (i, j)
                     actions.append(action)
-                    # Make potential move and get board output
-                    board = self.chomp(action, self.player)
-                    state = self.get_state(board)
-                    states.append(state)
+                    if self.hashed:
+                        states.append(self.chomp_hash(action, self.player))
+                        continue
+                    # Make potential move in place and get board output
+                    token = self.apply_move(action)
+                    states.append(self.get_state(board))
+                    self.undo_move(token)
         return states, actions
 
+    def get_actions(self):
+        """Return list of available moves as position tuples of (row, col)."""
+        board = self.board
+        return [(i, j) for i in range(self.rows) for j in range(self.cols) if board[i][j] == '-']
+
+    def successor_key(self, action):
+        """Return state after current player chomps at action."""
+        if self.hashed:
+            return self.chomp_hash(action, self.player)
+        token = self.apply_move(action)
+        state = self.get_state(self.board)
+        self.undo_move(token)
+        return state
+
     def is_win(self):
         """Check win condition.
 
@@ -116,15 +177,47 @@ class Chomp(Game):
 
     def make_move(self, action):
         """Make move and toggle player."""
-        # Make move
-        self.board = self.chomp(action, self.player)
+        self.apply_move(action)
+        # Check win condition
+        return self.is_win()
+
+    def apply_move(self, action):
+        """Chomps board in place at action and toggles player.
+
+        Returns undo token of eaten squares and previous hash.
+        """
+        token = ([], self.hash if self.hashed else None)
+        label = self.player + str(action[0]) + str(action[1])
+        board = self.board
+        for i in range(action[0] + 1):
+            row = board[i]
+            for j in range(action[1], self.cols):
+                if row[j] == '-':
+                    row[j] = label
+                    token[0].append((i, j))
+        if self.hashed:
+            self.hash = self.chomp_hash(action, self.player, token[0])
         # Toggle player
         if self.player == 'X':
             self.player = 'O'
         else:
             self.player = 'X'
-        # Check win condition
-        return self.is_win()
+        self.version += 1
+        return token
+
+    def undo_move(self, token):
+        """Restores squares eaten by apply_move and toggles player back."""
+        eaten, h = token
+        board = self.board
+        for i, j in eaten:
+            board[i][j] = '-'
+        if self.hashed:
+            self.hash = h
+        if self.player == 'X':
+            self.player = 'O'
+        else:
+            self.player = 'X'
+        self.version += 1
 
     def read_input(self):
         """Define game specific read in function from command line."""
@@ -0,0 +1,281 @@
+"""Young diagram Chomp."""
+
+
+from chomp import Chomp
+
+
+# Characters encoding column heights in state keys
+HEIGHTS = '0123456789abcdefghijklmnopqrstuvwxyz'
+
+
+def conjugate(heights, rows):
+    """Returns conjugate (transposed) diagram of non-increasing column heights."""
+    conj = []
+    for k in range(rows):
+        count = 0
+        for h in heights:
+            if h <= k:
+                break
+            count += 1
+        conj.append(count)
+    return conj
+
+
+class YoungChomp(Chomp):
+    """Chomp game class backed by a Young diagram of column heights.
+
+    The remaining chocolate is always a Young diagram, so the board is kept as
+    a non-increasing list of column heights counted from the bottom row, and a
+    move (i, j) caps every column from j onwards at height rows - 1 - i.
+
+    State is the player who moved followed by one character per column height,
+    e.g. X4431. On square boards the diagram and its transpose are the same
+    position, and with transpose=True the smaller of the two keys is used.
+
+    With history=True state is the labelled board of Chomp instead, which
+    records which rectangles were eaten together and by whom.
+
+    With hashed=True states are integers. Column heights are packed exactly in
+    base rows + 1 with the player who moved as the lowest bit, and labelled
+    boards use Zobrist hashes as in Chomp.
+    """
+
+    def __init__(self, rows=3, cols=4, history=False, transpose=True, hashed=False):
+        """Construct new Young diagram chomp game instance."""
+        if rows > len(HEIGHTS) - 1:
+            raise ValueError('Chomp boards support at most {} rows.'.format(len(HEIGHTS) - 1))
+        self.rows = rows
+        self.cols = cols
+        self.history = history
+        self.transpose = transpose and rows == cols and not history
+        self.hashed = hashed
+        if hashed and history:
+            self.init_hash(rows * cols, self.get_labels())
+        self.reset()
+
+    def reset(self):
+        """Reset game."""
+        self.heights = [self.rows] * self.cols
+        self.key = HEIGHTS[self.rows] * self.cols
+        if self.history:
+            self.labels = self.flatten(self.create_board(self.rows, self.cols))
+        self.player = 'X'
+        self.winner = None
+        self.hash = 0
+        self.version += 1
+
+    @property
+    def board(self):
+        """2D list representation of board.
+
+        Eaten squares are their labels with history, otherwise *.
+        """
+        if self.history:
+            return [self.labels[i * self.cols:(i + 1) * self.cols] for i in range(self.rows)]
+        board = []
+        for i in range(self.rows):
+            board.append([])
+            for j in range(self.cols):
+                board[i].append('-' if i >= self.rows - self.heights[j] else '*')
+        board[self.rows - 1][0] = 'P'
+        return board
+
+    @board.setter
+    def board(self, board):
+        """Load column heights from 2D list representation."""
+        self.heights = []
+        for j in range(self.cols):
+            height = 0
+            for i in range(self.rows - 1, -1, -1):
+                if board[i][j] not in ('-', 'P'):
+                    break
+                height += 1
+            self.heights.append(height)
+        self.key = ''.join([HEIGHTS[h] for h in self.heights])
+        if self.history:
+            self.labels = self.flatten(board)
+            if self.hashed:
+                self.hash = self.board_hash(self.labels)
+        self.version += 1
+
+    def chomp_heights(self, action):
+        """Returns column heights after chomping at action without modifying the board."""
+        cap = self.rows - 1 - action[0]
+        heights = self.heights[:]
+        for j in range(action[1], self.cols):
+            if heights[j] <= cap:
+                # Columns to the right are already no higher
+                break
+            heights[j] = cap
+        return heights
+
+    def get_key(self, heights, player):
+        """Returns state key of column heights reached by player's move."""
+        key = ''.join([HEIGHTS[h] for h in heights])
+        if self.transpose:
+            key = min(key, ''.join([HEIGHTS[h] for h in conjugate(heights, self.rows)]))
+        return player + key
+
+    def get_hash(self, heights, player):
+        """Returns packed integer state of column heights reached by player's move."""
+        key = 0
+        for h in reversed(heights):
+            key = (key * (self.rows + 1)) + h
+        if self.transpose:
+            conj = 0
+            for h in reversed(conjugate(heights, self.rows)):
+                conj = (conj * (self.rows + 1)) + h
+            key = min(key, conj)
+        return (key * 2) + (1 if player == 'O' else 0)
+
+    def labels_hash(self, action, value):
+        """Returns Zobrist hash of labelled board after chomping at action."""
+        h = self.hash
+        label = value + str(action[0]) + str(action[1])
+        for c in range(action[1], self.cols):
+            for r in range(self.rows - self.heights[c], action[0] + 1):
+                h ^= self.zobrist[(r * self.cols) + c][label]
+        return h
+
+    def get_state(self, board):
+        """Get state representation of board as reached by the last move."""
+        if self.history:
+            return ''.join(self.flatten(board))
+        player = 'O' if self.player == 'X' else 'X'
+        heights = []
+        for j in range(self.cols):
+            heights.append(sum([1 for row in board if row[j] in ('-', 'P')]))
+        return self.get_key(heights, player)
+
+    def candidate_state(self, action):
+        """Returns state after current player chomps at action.
+
+        Without history or transpose the key is spliced from the current key,
+        as chomping sets a run of columns starting at action to the same height.
+        """
+        i, j = action
+        if self.hashed:
+            if self.history:
+                return self.labels_hash(action, self.player)
+            return self.get_hash(self.chomp_heights(action), self.player)
+        if self.history:
+            token = self.apply_move(action)
+            state = ''.join(self.labels)
+            self.undo_move(token)
+            return state
+        if self.transpose:
+            return self.get_key(self.chomp_heights(action), self.player)
+        cap = self.rows - 1 - i
+        end = j
+        while end < self.cols and self.heights[end] > cap:
+            end += 1
+        return self.player + self.key[:j] + HEIGHTS[cap] * (end - j) + self.key[end:]
+
+    def get_open_moves(self):
+        """Return set of avaiable moves, given current state.
+
+        Action is position tuple of (row, col), in the same order as Chomp.
+        """
+        states = []
+        actions = []
+        for i in range(self.rows):
+            for j in range(self.cols):
+                if self.heights[j] <= self.rows - 1 - i:
+                    # Columns to the right are no higher
+                    break
+                if i == self.rows - 1 and j == 0:
+                    # Poison
+                    continue
+                action = (i, j)
+                actions.append(action)
+                states.append(self.candidate_state(action))
+        return states, actions
+
+    def get_actions(self):
+        """Return list of available moves, in the same order as Chomp."""
+        actions = []
+        for i in range(self.rows):
+            for j in range(self.cols):
+                if self.heights[j] <= self.rows - 1 - i:
+                    # Columns to the right are no higher
+                    break
+                if i != self.rows - 1 or j != 0:
+                    actions.append((i, j))
+        return actions
+
+    def successor_key(self, action):
+        """Return state after current player chomps at action."""
+        return self.candidate_state(action)
+
+    def is_win(self):
+        """Check win condition.
+
+        Win means only the Poison block is left, and it is not your turn.
+        There is no Draw.
+        """
+        if self.heights[0] > 1 or (self.cols > 1 and self.heights[1] > 0):
+            # Game not finished
+            return None
+        # Only poison block left
+        if self.player == 'X':
+            return 'O'
+        else:
+            return 'X'
+
+    def is_valid_move(self, action):
+        """Validate action position tuple.
+
+        Valid means in bounds and empty/not poison.
+        """
+        i = action[0]
+        j = action[1]
+        # Bounds check
+        if (i < self.rows and i >= 0 and
+                j < self.cols and j >= 0):
+            # Remaining and not poison check
+            return (self.heights[j] > self.rows - 1 - i and
+                    not (i == self.rows - 1 and j == 0))
+        else:
+            return False
+
+    def make_move(self, action):
+        """Make move and toggle player."""
+        self.apply_move(action)
+        # Check win condition
+        return self.is_win()
+
+    def apply_move(self, action):
+        """Chomps at action and toggles player.
+
+        Returns undo token of previous heights, key, hash and labelled squares.
+        """
+        i, j = action
+        token = (self.heights, self.key, self.hash, [])
+        if self.hashed and self.history:
+            self.hash = self.labels_hash(action, self.player)
+        if self.history:
+            label = self.player + str(i) + str(j)
+            for c in range(j, self.cols):
+                for r in range(self.rows - self.heights[c], i + 1):
+                    self.labels[(r * self.cols) + c] = label
+                    token[3].append((r * self.cols) + c)
+        self.heights = self.chomp_heights(action)
+        self.key = ''.join([HEIGHTS[h] for h in self.heights])
+        # Toggle player
+        if self.player == 'X':
+            self.player = 'O'
+        else:
+            self.player = 'X'
+        self.version += 1
+        return token
+
+    def undo_move(self, token):
+        """Restores board chomped by apply_move and toggles player back."""
+        self.heights, self.key, self.hash, labelled = token
+        for cell in labelled:
+            self.labels[cell] = '-'
+        if self.player == 'X':
+            self.player = 'O'
+        else:
+            self.player = 'X'
+        self.version += 1
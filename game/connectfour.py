@@ -2,24 +2,52 @@
 
 
 from game import Game
+from operator import itemgetter
+import random
 import sys
 
 
 class ConnectFour(Game):
     """Connect Four game class."""
 
-    def __init__(self, rows=6, cols=7):
+    def __init__(self, rows=6, cols=7, window=3, hashed=False, symmetry=False):
         """Construct new Connect Four game instance.
 
         The most commonly used Connect Four board size is 7 columns x 6 rows.
         Size variations include 8x7, 9x7, 10x7, 8x8
+
+        Window is the number of columns centered on the selected column that
+        make up the state (1, 3, 5, ...). None uses the full board as state.
+        With hashed states are Zobrist hashes of the window instead of Strings.
+        With symmetry left-right mirrored states share a canonical state.
         """
+        if window is not None and (window < 1 or window % 2 == 0 or window > cols):
+            raise ValueError('Window must be None or an odd number of columns from 1 to {}.'.format(cols))
         self.rows = rows
         self.cols = cols
+        self.window = window
+        self.hashed = hashed
+        if hashed:
+            self.init_window_hash()
+        self.symmetry = symmetry
+        if symmetry:
+            self.init_mirrors()
         self.board = self.create_board(rows, cols)
         self.player = 'X'
         self.winner = None
 
+    @property
+    def board(self):
+        """Flat list representation of board."""
+        return self._board
+
+    @board.setter
+    def board(self, board):
+        """Set board and rebuild cached state encodings."""
+        self._board = board
+        self.cache_state()
+        self.version += 1
+
     def create_board(self, rows, cols):
         """Create empty board of size rows x cols."""
         board = []
@@ -32,42 +60,189 @@ class ConnectFour(Game):
         self.board = self.create_board(self.rows, self.cols)
         self.player = 'X'
         self.winner = None
+        self.version += 1
+
+    def init_window_hash(self):
+        """Initialize Zobrist keys for cells by position within the window.
+
+        Windowed states do not depend on where the window sits on the board,
+        so keys are per (column offset in window, row). Windows cut short by
+        the board edge are told apart by an extra key per window width.
+        """
+        span = self.cols if self.window is None else self.window
+        self.init_hash(span * self.rows, ['X', 'O'])
+        rng = random.Random(self.zobrist_seed + 1)
+        self.width_keys = [rng.getrandbits(64) for i in range(span + 1)]
+
+    def init_mirrors(self):
+        """Initialize item getters that mirror states left to right.
+
+        Windowed states are whole columns, so mirroring reverses the order of
+        columns, keyed by state length. Full board states reverse each row.
+        """
+        if self.hashed:
+            raise ValueError('Symmetry needs String states, Zobrist hashes cannot be mirrored.')
+        self.mirrors = {}
+        if self.window is None:
+            mirror = []
+            for i in range(self.rows):
+                for j in range(self.cols - 1, -1, -1):
+                    mirror.append((i * self.cols) + j)
+            self.mirrors[self.rows * self.cols] = itemgetter(*mirror)
+            return
+        for width in range(1, self.window + 1):
+            mirror = []
+            for k in range(width - 1, -1, -1):
+                mirror.extend(range(k * self.rows, (k + 1) * self.rows))
+            self.mirrors[width * self.rows] = itemgetter(*mirror)
+
+    def cache_state(self):
+        """Rebuild cached column encodings and heights from board.
+
+        Columns are cached as Strings top to bottom, the same encoding
+        get_state concatenates, so candidate states are built by splicing
+        one token into a cached column instead of rescanning the board.
+        """
+        board = self.board
+        self.columns = []
+        self.heights = []
+        for i in range(self.cols):
+            column = ''.join(board[i::self.cols])
+            self.columns.append(column)
+            self.heights.append(self.rows - column.count('-'))
+        if self.window is None:
+            self.flat = ''.join(board)
+        if self.hashed:
+            self.cache_hash()
+
+    def cache_hash(self):
+        """Rebuild cached Zobrist hashes from column encodings.
+
+        Full board states keep one hash of the whole board. Windowed states
+        keep a hash per column for every offset it can take in a window.
+        """
+        if self.window is None:
+            self.hash = self.width_keys[self.cols]
+            for i, column in enumerate(self.columns):
+                for row, value in enumerate(column):
+                    if value != '-':
+                        self.hash ^= self.zobrist[(i * self.rows) + row][value]
+            return
+        self.column_hashes = []
+        for column in self.columns:
+            hashes = [0] * self.window
+            for row, value in enumerate(column):
+                if value != '-':
+                    for k in range(self.window):
+                        hashes[k] ^= self.zobrist[(k * self.rows) + row][value]
+            self.column_hashes.append(hashes)
+
+    def drop_cached(self, col, value):
+        """Update cached encodings for value dropped in column #col."""
+        row = self.rows - 1 - self.heights[col]
+        self.heights[col] += 1
+        if self.hashed:
+            # String encodings are only rebuilt from the board in cache_state
+            if self.window is None:
+                self.hash ^= self.zobrist[(col * self.rows) + row][value]
+            else:
+                hashes = self.column_hashes[col]
+                for k in range(self.window):
+                    hashes[k] ^= self.zobrist[(k * self.rows) + row][value]
+            return
+        column = self.columns[col]
+        self.columns[col] = column[:row] + value + column[row + 1:]
+        if self.window is None:
+            i = (row * self.cols) + col
+            self.flat = self.flat[:i] + value + self.flat[i + 1:]
+
+    def lift_cached(self, col, value):
+        """Update cached encodings for value lifted off the top of column #col."""
+        self.heights[col] -= 1
+        row = self.rows - 1 - self.heights[col]
+        if self.hashed:
+            if self.window is None:
+                self.hash ^= self.zobrist[(col * self.rows) + row][value]
+            else:
+                hashes = self.column_hashes[col]
+                for k in range(self.window):
+                    hashes[k] ^= self.zobrist[(k * self.rows) + row][value]
+            return
+        column = self.columns[col]
+        self.columns[col] = column[:row] + '-' + column[row + 1:]
+        if self.window is None:
+            i = (row * self.cols) + col
+            self.flat = self.flat[:i] + '-' + self.flat[i + 1:]
+
+    def candidate_state(self, col):
+        """Returns state after current player drops in column #col.
+
+        Built from cached column encodings without modifying the board.
+        """
+        row = self.rows - 1 - self.heights[col]
+        if self.hashed:
+            return self.candidate_hash(col, row)
+        if self.window is None:
+            i = (row * self.cols) + col
+            return self.flat[:i] + self.player + self.flat[i + 1:]
+        half = self.window // 2
+        column = self.columns[col]
+        return (''.join(self.columns[max(col - half, 0):col]) +
+                column[:row] + self.player + column[row + 1:] +
+                ''.join(self.columns[col + 1:col + half + 1]))
+
+    def candidate_hash(self, col, row):
+        """Returns Zobrist hash of state after current player drops in column #col at row."""
+        if self.window is None:
+            return self.hash ^ self.zobrist[(col * self.rows) + row][self.player]
+        half = self.window // 2
+        start = max(col - half, 0)
+        end = min(col + half + 1, self.cols)
+        h = self.width_keys[end - start]
+        for i in range(start, end):
+            h ^= self.column_hashes[i][i - start]
+        return h ^ self.zobrist[((col - start) * self.rows) + row][self.player]
 
     def get_open_moves(self):
         """Returns list of available moves given current states and next states."""
         actions = []
         states = []
-
         for i in range(self.cols):
-            column_indices = self.get_column_indices(i)
-            column_indices.reverse()
-            for j in column_indices:
-                # Iterate over input column backwards (bottom up) to determine drop landing position
-                if self.board[j] == '-':
-                    # Find first empty spot from bottom and 'drop' token there
-                    self.board[j] = self.player
-                    states.append(self.get_state(self.board, col=i))
-                    # Record column num as action
-                    actions.append(i)
-                    self.board[j] = '-'
-                    break
+            if self.heights[i] < self.rows:
+                states.append(self.candidate_state(i))
+                # Record column num as action
+                actions.append(i)
         return states, actions
 
-    def get_state(self, board, col):
+    def get_actions(self):
+        """Returns list of columns that are not full."""
+        return [i for i in range(self.cols) if self.heights[i] < self.rows]
+
+    def successor_key(self, col):
+        """Returns state after current player drops in column #col."""
+        return self.candidate_state(col)
+
+    def get_state(self, board, col=None):
         """Returns board state as String.
 
-        State is based on selected column and two adjacent columns.
+        State is based on selected column and its adjacent columns within the
+        window, or the whole board when window is None.
         """
+        if self.window is None:
+            return ''.join(board)
+        half = self.window // 2
         state = ''
-        for i in range(col - 1, col + 2):
+        for i in range(col - half, col + half + 1):
             if i >= 0 and i < self.cols:
-                column = []
-                bottom = len(self.board) - (self.cols - i)
-                for j in range(i, bottom + 1, self.cols):
-                    column.append(self.board[j])
-                state += ''.join(column)
+                state += ''.join(board[i::self.cols])
         return state
 
+    def canonical(self, state):
+        """Returns smaller of state and its left-right mirror."""
+        if not self.symmetry:
+            return state
+        return min(state, ''.join(self.mirrors[len(state)](state)))
+
     def get_grid(self, board):
         """Returns grid 2D representation of board."""
         grid = []
@@ -151,18 +326,34 @@ class ConnectFour(Game):
 
         Also toggles player and returns is_win result.
         """
-        # Find index of bottom position in selected column
-        column_indices = self.get_column_indices(col)
-        column_indices.reverse()
-        for i in column_indices:
-            # Iterate over input column backwards (bottom up) to determine drop landing position
-            if self.board[i] == '-':
-                # Find first empty spot from bottom and 'drop' token there
-                self.board[i] = self.player
-                break
-        self.player = 'O' if self.player == 'X' else 'X'
+        self.apply_move(col)
         return self.is_win()
 
+    def apply_move(self, col):
+        """Drops token in column #col and toggles player.
+
+        Returns column as undo token, None if the column was full.
+        """
+        token = None
+        if self.heights[col] < self.rows:
+            # Land on top of the column's current height
+            i = ((self.rows - 1 - self.heights[col]) * self.cols) + col
+            self.board[i] = self.player
+            self.drop_cached(col, self.player)
+            token = col
+        self.player = 'O' if self.player == 'X' else 'X'
+        self.version += 1
+        return token
+
+    def undo_move(self, col):
+        """Lifts token dropped by apply_move off column #col and toggles player back."""
+        self.player = 'O' if self.player == 'X' else 'X'
+        if col is not None:
+            self.lift_cached(col, self.player)
+            i = ((self.rows - 1 - self.heights[col]) * self.cols) + col
+            self.board[i] = '-'
+        self.version += 1
+
     def read_input(self):
         """Define game specific read in function from command line."""
         return int(sys.stdin.readline()[:-1])
@@ -0,0 +1,141 @@
+"""Bitboard Connect Four."""
+
+
+from connectfour import ConnectFour
+
+
+class BitboardConnectFour(ConnectFour):
+    """Connect Four game class backed by two integer bitboards.
+
+    Drop-in replacement for ConnectFour that produces the same states, actions
+    and winners. Each column takes rows + 1 bits, bit (col * (rows + 1) + height)
+    being the cell at that height counted from the bottom. The spare bit on top
+    of every column keeps shifted lines from wrapping into the next column.
+    """
+
+    def __init__(self, rows=6, cols=7, window=3, hashed=False, symmetry=False):
+        """Construct new bitboard Connect Four game instance.
+
+        The most commonly used Connect Four board size is 7 columns x 6 rows.
+        Size variations include 8x7, 9x7, 10x7, 8x8
+        """
+        if window is not None and (window < 1 or window % 2 == 0 or window > cols):
+            raise ValueError('Window must be None or an odd number of columns from 1 to {}.'.format(cols))
+        self.rows = rows
+        self.cols = cols
+        self.window = window
+        self.hashed = hashed
+        if hashed:
+            self.init_window_hash()
+        self.symmetry = symmetry
+        if symmetry:
+            self.init_mirrors()
+        self.height = rows + 1
+        # Bit of the bottom cell of every column
+        self.bottom_mask = 0
+        for col in range(cols):
+            self.bottom_mask |= 1 << (col * self.height)
+        self.board_mask = self.bottom_mask * ((1 << rows) - 1)
+        self.reset()
+
+    def reset(self):
+        """Reset board between games."""
+        self.bitboards = {'X': 0, 'O': 0}
+        self.cache_state()
+        self.player = 'X'
+        self.winner = None
+        self.version += 1
+
+    @property
+    def board(self):
+        """Flat list representation of board, same layout as ConnectFour."""
+        board = []
+        for row in range(self.rows):
+            for col in range(self.cols):
+                board.append(self.get_cell(col, self.rows - 1 - row))
+        return board
+
+    @board.setter
+    def board(self, board):
+        """Load bitboards and column heights from flat list representation."""
+        self.bitboards = {'X': 0, 'O': 0}
+        for i, val in enumerate(board):
+            if val in self.bitboards:
+                col = i % self.cols
+                height = self.rows - 1 - (i // self.cols)
+                self.bitboards[val] |= 1 << (col * self.height + height)
+        self.cache_state()
+        self.version += 1
+
+    def get_cell(self, col, height):
+        """Return value of cell at column and height from bottom."""
+        bit = 1 << (col * self.height + height)
+        if self.bitboards['X'] & bit:
+            return 'X'
+        elif self.bitboards['O'] & bit:
+            return 'O'
+        return '-'
+
+    def has_four(self, bitboard):
+        """Check bitboard for four in a row with shift and AND operations.
+
+        Shifts are vertical (1), horizontal (height) and both diagonals
+        (height - 1 and height + 1).
+        """
+        for shift in (1, self.height, self.height - 1, self.height + 1):
+            pairs = bitboard & (bitboard >> shift)
+            if pairs & (pairs >> (2 * shift)):
+                return True
+        return False
+
+    def is_win(self):
+        """Check the board for win condition.
+
+        Possible outputs are X, O, Draw, None.
+        """
+        if self.has_four(self.bitboards['X']):
+            return 'X'
+        if self.has_four(self.bitboards['O']):
+            return 'O'
+        # Check Draw condition
+        if (self.bitboards['X'] | self.bitboards['O']) == self.board_mask:
+            return 'Draw'
+        # Unfinished game
+        return None
+
+    def is_valid_move(self, col):
+        """Check that potential column selection is valid.
+
+        Valid means inbounds and column is not completely occupied.
+        """
+        return col >= 0 and col < self.cols and self.heights[col] < self.rows
+
+    def make_move(self, col):
+        """Makes move by vertically dropping token in column #col.
+
+        Also toggles player and returns is_win result.
+        """
+        self.apply_move(col)
+        return self.is_win()
+
+    def apply_move(self, col):
+        """Drops token in column #col and toggles player.
+
+        Returns column as undo token, None if the column was full.
+        """
+        token = None
+        if self.heights[col] < self.rows:
+            self.bitboards[self.player] |= 1 << (col * self.height + self.heights[col])
+            self.drop_cached(col, self.player)
+            token = col
+        self.player = 'O' if self.player == 'X' else 'X'
+        self.version += 1
+        return token
+
+    def undo_move(self, col):
+        """Lifts token dropped by apply_move off column #col and toggles player back."""
+        self.player = 'O' if self.player == 'X' else 'X'
+        if col is not None:
+            self.lift_cached(col, self.player)
+            self.bitboards[self.player] &= ~(1 << (col * self.height + self.heights[col]))
+        self.version += 1
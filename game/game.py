@@ -2,13 +2,79 @@
 
 
 from abc import ABCMeta, abstractmethod
+import random
 
 
 class Game(object):
-    """General Game Abstract base class."""
+    """General Game Abstract base class.
+
+    Games constructed with hashed=True return 64 bit integer state keys from
+    get_open_moves instead of Strings. Subclasses can build them from a
+    Zobrist table, XORing one random key per (cell, value) pair into a hash
+    that make_move updates incrementally.
+
+    Games constructed with symmetry=True map states to a canonical state with
+    canonical, which the agent applies to every qtable lookup.
+
+    make_move is apply_move followed by is_win. apply_move returns a token
+    that undo_move takes to restore the board, so move generation and search
+    can walk the game tree in place instead of copying boards.
+
+    get_actions and successor_key are the lazy form of get_open_moves, for
+    callers that need the state of only some actions.
+
+    version counts changes of the position by apply_move, undo_move,
+    reset and assignment of board, so callers can tell whether results
+    they computed for a position are still current.
+    """
 
     __metaclass__ = ABCMeta
 
+    # Seed of Zobrist keys, fixed so saved qtables stay valid across runs
+    zobrist_seed = 0
+
+    # Incremented by every apply_move, undo_move, reset and board assignment
+    version = 0
+
+    def init_hash(self, cells, values):
+        """Initialize Zobrist table with a random 64 bit key per cell and value."""
+        rng = random.Random(self.zobrist_seed)
+        self.zobrist = []
+        for i in range(cells):
+            self.zobrist.append(dict((value, rng.getrandbits(64)) for value in values))
+        self.hash = 0
+
+    def board_hash(self, values):
+        """Returns Zobrist hash of flat sequence of cell values from scratch."""
+        h = 0
+        for i, value in enumerate(values):
+            if value in self.zobrist[i]:
+                h ^= self.zobrist[i][value]
+        return h
+
+    def canonical(self, state):
+        """Returns canonical representative of state among its symmetric states.
+
+        Games constructed with symmetry=True override this so that equivalent
+        positions share one qtable entry. By default every state is its own.
+        """
+        return state
+
+    def get_actions(self):
+        """Retrieve legal actions without building next states.
+
+        Games override this when actions are cheaper than get_open_moves.
+        """
+        return self.get_open_moves()[1]
+
+    def successor_key(self, action):
+        """Retrieve state after current player takes action.
+
+        Games override this to build the one state instead of all of them.
+        """
+        states, actions = self.get_open_moves()
+        return states[actions.index(action)]
+
     @abstractmethod
     def get_open_moves(self):
         """Retrieve next move options."""
@@ -34,6 +100,16 @@ class Game(object):
         """Make move."""
         raise NotImplementedError('Make move must be implemented.')
 
+    @abstractmethod
+    def apply_move(self):
+        """Make move without checking win condition, returning undo token."""
+        raise NotImplementedError('Apply move must be implemented.')
+
+    @abstractmethod
+    def undo_move(self):
+        """Undo move made by apply_move given its undo token."""
+        raise NotImplementedError('Undo move must be implemented.')
+
     @abstractmethod
     def print_board(self):
         """Print game board."""
@@ -0,0 +1,33 @@
+"""Registry of games by name.
+
+Entries hold a game class and constructor keyword arguments instead of a
+game object, so every caller, such as a worker process, builds its own
+instance.
+"""
+
+
+from tictactoe import TicTacToe
+from connectfour import ConnectFour
+from chomp import Chomp
+from chomp_young import YoungChomp
+
+
+GAMES = {'tictactoe': (TicTacToe, {}),
+         'connectfour': (ConnectFour, {}),
+         'chomp': (Chomp, {'rows': 4, 'cols': 4}),
+         'youngchomp': (YoungChomp, {'rows': 4, 'cols': 4})}
+
+
+def register(name, game_class, **kwargs):
+    """Register game_class under name, constructed with kwargs."""
+    GAMES[name] = (game_class, kwargs)
+
+
+def make_game(name, **kwargs):
+    """Returns new instance of the game registered under name, kwargs overriding its registered ones."""
+    if name not in GAMES:
+        raise ValueError('Game {} is not registered.'.format(name))
+    game_class, defaults = GAMES[name]
+    options = dict(defaults)
+    options.update(kwargs)
+    return game_class(**options)
@@ -2,23 +2,75 @@
 
 
 from game import Game
+from operator import itemgetter
 import sys
 
 
+def square_symmetries(n):
+    """Returns permutations of n x n board positions for the 8 symmetries of the square.
+
+    Permutation p maps board to the symmetric board [board[i] for i in p].
+    """
+    transforms = [lambda r, c: (r, c),
+                  lambda r, c: (c, n - 1 - r),
+                  lambda r, c: (n - 1 - r, n - 1 - c),
+                  lambda r, c: (n - 1 - c, r),
+                  lambda r, c: (r, n - 1 - c),
+                  lambda r, c: (n - 1 - r, c),
+                  lambda r, c: (c, r),
+                  lambda r, c: (n - 1 - c, n - 1 - r)]
+    permutations = []
+    for transform in transforms:
+        permutation = []
+        for r in range(n):
+            for c in range(n):
+                i, j = transform(r, c)
+                permutation.append((i * n) + j)
+        permutations.append(permutation)
+    return permutations
+
+
+# Board rotations and reflections as item getters over state Strings
+SYMMETRIES = [itemgetter(*permutation) for permutation in square_symmetries(3)]
+
+
 class TicTacToe(Game):
     """Tic Tac Toe game class."""
 
-    def __init__(self):
-        """Construct new tictactoe game instance."""
+    def __init__(self, hashed=False, symmetry=False):
+        """Construct new tictactoe game instance.
+
+        With hashed states are Zobrist hashes of the board instead of Strings.
+        With symmetry rotated and reflected boards share a canonical state.
+        """
+        if hashed and symmetry:
+            raise ValueError('Symmetry needs String states, Zobrist hashes cannot be rotated.')
+        self.hashed = hashed
+        self.symmetry = symmetry
+        if hashed:
+            self.init_hash(9, ['X', 'O'])
         self.board = ['-', '-', '-', '-', '-', '-', '-', '-', '-']
         self.player = 'X'
         self.winner = None
 
+    @property
+    def board(self):
+        """List representation of board."""
+        return self._board
+
+    @board.setter
+    def board(self, board):
+        """Set board, which changes the position."""
+        self._board = board
+        self.version += 1
+
     def reset(self):
         """Reset board between games."""
         self.board = ['-', '-', '-', '-', '-', '-', '-', '-', '-']
         self.player = 'X'
         self.winner = None
+        self.hash = 0
+        self.version += 1
 
     def get_open_moves(self):
         """Returns list of available moves given current states and next states."""
@@ -27,29 +79,52 @@ class TicTacToe(Game):
         for i, val in enumerate(self.board):
             if val == '-':
                 actions.append(i)
-                self.board[i] = self.player
+                if self.hashed:
+                    states.append(self.hash ^ self.zobrist[i][self.player])
+                    continue
+                token = self.apply_move(i)
                 states.append(self.get_state(self.board))
-                self.board[i] = '-'
+                self.undo_move(token)
         return states, actions
 
+    def get_actions(self):
+        """Returns list of available moves."""
+        return [i for i, val in enumerate(self.board) if val == '-']
+
+    def successor_key(self, position):
+        """Returns state after current player takes position."""
+        if self.hashed:
+            return self.hash ^ self.zobrist[position][self.player]
+        token = self.apply_move(position)
+        state = self.get_state(self.board)
+        self.undo_move(token)
+        return state
+
     def get_state(self, board):
         """Returns board state as String."""
         return ''.join(board)
 
+    def canonical(self, state):
+        """Returns smallest of the 8 rotated and reflected states."""
+        if not self.symmetry:
+            return state
+        return min([''.join(symmetry(state)) for symmetry in SYMMETRIES])
+
     def is_win(self):
         """Check the board for win condition.
 
         Possible outputs are X, O, Draw, None.
         """
+        board = self.board
         # Check win condition
-        row_1 = self.board[0] + self.board[1] + self.board[2]
-        row_2 = self.board[3] + self.board[4] + self.board[5]
-        row_3 = self.board[6] + self.board[7] + self.board[8]
-        col_1 = self.board[0] + self.board[3] + self.board[6]
-        col_2 = self.board[1] + self.board[4] + self.board[7]
-        col_3 = self.board[2] + self.board[5] + self.board[8]
-        diag_1 = self.board[0] + self.board[4] + self.board[8]
-        diag_2 = self.board[2] + self.board[4] + self.board[6]
+        row_1 = board[0] + board[1] + board[2]
+        row_2 = board[3] + board[4] + board[5]
+        row_3 = board[6] + board[7] + board[8]
+        col_1 = board[0] + board[3] + board[6]
+        col_2 = board[1] + board[4] + board[7]
+        col_3 = board[2] + board[5] + board[8]
+        diag_1 = board[0] + board[4] + board[8]
+        diag_2 = board[2] + board[4] + board[6]
         triples = [row_1, row_2, row_3, col_1, col_2, col_3, diag_1, diag_2]
 
         for triple in triples:
@@ -59,7 +134,7 @@ class TicTacToe(Game):
                 return 'X'
 
         # Check draw condition
-        if '-' not in self.board:
+        if '-' not in board:
             return 'Draw'
 
         return None
@@ -74,13 +149,32 @@ class TicTacToe(Game):
         else:
             return False
 
+    def apply_move(self, position):
+        """Sets position to player value and toggles player.
+
+        Returns position as undo token.
+        """
+        self.board[position] = self.player
+        if self.hashed:
+            self.hash ^= self.zobrist[position][self.player]
+        self.player = 'O' if self.player == 'X' else 'X'
+        self.version += 1
+        return position
+
+    def undo_move(self, position):
+        """Clears position set by apply_move and toggles player back."""
+        self.player = 'O' if self.player == 'X' else 'X'
+        self.board[position] = '-'
+        if self.hashed:
+            self.hash ^= self.zobrist[position][self.player]
+        self.version += 1
+
     def make_move(self, position):
         """Makes move by setting position to player value.
 
         Also toggles player and returns is_win result.
         """
-        self.board[position] = self.player
-        self.player = 'O' if self.player == 'X' else 'X'
+        self.apply_move(position)
         return self.is_win()
 
     def read_input(self):
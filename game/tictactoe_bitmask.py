@@ -0,0 +1,180 @@
+"""Bitmask Tic Tac Toe."""
+
+
+from tictactoe import TicTacToe, square_symmetries
+
+
+# Winning lines as 9 bit masks, bit i being board position i
+WIN_MASKS = [0b000000111, 0b000111000, 0b111000000,  # Rows
+             0b001001001, 0b010010010, 0b100100100,  # Columns
+             0b100010001, 0b001010100]  # Diagonals
+FULL_MASK = 0b111111111
+
+# Lookup of whether any 9 bit mask contains a winning line
+WINNING = [any((mask & win) == win for win in WIN_MASKS) for mask in range(1 << 9)]
+
+# Base 3 digit of each player and place value of each position for state index
+DIGITS = {'X': 1, 'O': 2}
+POWERS = [3 ** i for i in range(9)]
+
+# Canonical state index of every state index, built on first use
+CANONICAL_INDICES = []
+
+
+def canonical_indices():
+    """Returns table of smallest rotated or reflected state index for every state index."""
+    if not CANONICAL_INDICES:
+        permutations = square_symmetries(3)
+        for index in range(3 ** 9):
+            digits = [(index // POWERS[i]) % 3 for i in range(9)]
+            CANONICAL_INDICES.append(min([sum([digits[p] * POWERS[i] for i, p in enumerate(permutation)])
+                                          for permutation in permutations]))
+    return CANONICAL_INDICES
+
+
+class BitmaskTicTacToe(TicTacToe):
+    """Tic Tac Toe game class backed by two 9 bit masks.
+
+    Drop-in replacement for TicTacToe that produces the same states, actions
+    and winners. Also keeps a compact integer state index, the board packed
+    in base 3 (0 empty, 1 X, 2 O) with position i as digit i, in [0, 3^9).
+    """
+
+    def __init__(self, hashed=False, symmetry=False):
+        """Construct new bitmask tictactoe game instance.
+
+        With hashed states are integer state indices instead of Strings. They
+        are exact, so no Zobrist table is needed, and with symmetry they are
+        canonicalized through a precomputed table of all 3^9 indices.
+        """
+        self.hashed = hashed
+        self.symmetry = symmetry
+        if hashed and symmetry:
+            self.canonical_indices = canonical_indices()
+        self.reset()
+
+    def reset(self):
+        """Reset board between games."""
+        self.masks = {'X': 0, 'O': 0}
+        self.state = '---------'
+        self.index = 0
+        self.player = 'X'
+        self.winner = None
+        self.version += 1
+
+    @property
+    def board(self):
+        """List representation of board, same layout as TicTacToe."""
+        return list(self.state)
+
+    @board.setter
+    def board(self, board):
+        """Load masks, state and index from list representation."""
+        self.masks = {'X': 0, 'O': 0}
+        self.index = 0
+        for i, val in enumerate(board):
+            if val in self.masks:
+                self.masks[val] |= 1 << i
+                self.index += DIGITS[val] * POWERS[i]
+        self.state = ''.join(board)
+        self.version += 1
+
+    def get_open_moves(self):
+        """Returns list of available moves given current states and next states."""
+        if self.hashed:
+            return self.get_open_indices()
+        actions = []
+        states = []
+        empty = FULL_MASK & ~(self.masks['X'] | self.masks['O'])
+        state = self.state
+        player = self.player
+        for i in range(9):
+            if empty & (1 << i):
+                actions.append(i)
+                states.append(state[:i] + player + state[i + 1:])
+        return states, actions
+
+    def canonical(self, state):
+        """Returns smallest of the 8 rotated and reflected states."""
+        if self.symmetry and self.hashed:
+            return self.canonical_indices[state]
+        return TicTacToe.canonical(self, state)
+
+    def get_actions(self):
+        """Returns list of available moves."""
+        empty = FULL_MASK & ~(self.masks['X'] | self.masks['O'])
+        return [i for i in range(9) if empty & (1 << i)]
+
+    def successor_key(self, position):
+        """Returns state after current player takes position."""
+        if self.hashed:
+            return self.index + DIGITS[self.player] * POWERS[position]
+        return self.state[:position] + self.player + self.state[position + 1:]
+
+    def get_state_index(self):
+        """Returns integer state index of current board."""
+        return self.index
+
+    def get_open_indices(self):
+        """Returns list of available moves given current state indices and next state indices."""
+        actions = []
+        indices = []
+        empty = FULL_MASK & ~(self.masks['X'] | self.masks['O'])
+        digit = DIGITS[self.player]
+        for i in range(9):
+            if empty & (1 << i):
+                actions.append(i)
+                indices.append(self.index + digit * POWERS[i])
+        return indices, actions
+
+    def is_win(self):
+        """Check the board for win condition.
+
+        Possible outputs are X, O, Draw, None.
+        """
+        if WINNING[self.masks['O']]:
+            return 'O'
+        elif WINNING[self.masks['X']]:
+            return 'X'
+        # Check draw condition
+        if (self.masks['X'] | self.masks['O']) == FULL_MASK:
+            return 'Draw'
+        return None
+
+    def is_valid_move(self, position):
+        """Check that potential move is in a valid position.
+
+        Valid means inbounds and not occupied.
+        """
+        if position >= 0 and position < 9:
+            return not ((self.masks['X'] | self.masks['O']) & (1 << position))
+        else:
+            return False
+
+    def apply_move(self, position):
+        """Sets position to player value and toggles player.
+
+        Returns position as undo token.
+        """
+        self.masks[self.player] |= 1 << position
+        self.state = self.state[:position] + self.player + self.state[position + 1:]
+        self.index += DIGITS[self.player] * POWERS[position]
+        self.player = 'O' if self.player == 'X' else 'X'
+        self.version += 1
+        return position
+
+    def undo_move(self, position):
+        """Clears position set by apply_move and toggles player back."""
+        self.player = 'O' if self.player == 'X' else 'X'
+        self.masks[self.player] &= ~(1 << position)
+        self.state = self.state[:position] + '-' + self.state[position + 1:]
+        self.index -= DIGITS[self.player] * POWERS[position]
+        self.version += 1
+
+    def make_move(self, position):
+        """Makes move by setting position to player value.
+
+        Also toggles player and returns is_win result.
+        """
+        self.apply_move(position)
+        return self.is_win()
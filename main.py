@@ -14,7 +14,17 @@ import ujson as json
 from game.tictactoe import TicTacToe
 from game.connectfour import ConnectFour
 from game.chomp import Chomp
+from game.registry import GAMES
 from rl.agent import Agent
+from rl.bounded import BoundedQTable
+from rl.checkpoint import Checkpoint
+from rl.hyper import best, grid, search, write_results
+from rl.mapped import open_binary
+from rl.memory import MemoryMeter
+from rl.profiling import profile
+from rl.timing import PhaseTimer
+from solver.connectfour import ConnectFourSolver
+from solver.exact import ExactSolver
 
 
 def process_args():
@@ -32,21 +42,82 @@ def process_args():
 
     parser.add_argument('-m', '--mode',
                         dest='mode',
-                        help='Mode for Agent can be train or demo.',
+                        help='Mode for Agent can be train, demo, hyper or solve. solve compares Tic Tac Toe against exact '
+                             'values and plays Connect Four against an alpha-beta solver.',
                         default=default_mode)
 
+    parser.add_argument('--resume',
+                        dest='resume',
+                        action='store_true',
+                        help='Resume training from the last checkpoint.')
+
+    parser.add_argument('--workers',
+                        dest='workers',
+                        type=int,
+                        help='Number of actor processes playing training episodes.',
+                        default=1)
+
+    parser.add_argument('--max-entries',
+                        dest='max_entries',
+                        type=int,
+                        help='Bound Connect Four qtable to this many states.',
+                        default=None)
+
+    parser.add_argument('--eviction',
+                        dest='eviction',
+                        help='Eviction policy of bounded qtable can be lru, lfu or lowq.',
+                        default='lru')
+
+    parser.add_argument('--timing',
+                        dest='timing',
+                        action='store_true',
+                        help='Time phases of training, writing data/<game>_timing.json and .csv.')
+
+    parser.add_argument('--profile',
+                        dest='profile',
+                        action='store_true',
+                        help='Profile the run with cProfile, writing data/<game>_<mode>.pstats.')
+
+    parser.add_argument('--profile-sampling',
+                        dest='profile_sampling',
+                        action='store_true',
+                        help='Profile the run by stack sampling, writing folded stacks to data/<game>_<mode>.folded.')
+
     options = parser.parse_args()
     return options
 
 
-def play_tictactoe(mode):
+def make_checkpoint(name, game, agent, resume):
+    """Returns training checkpoint of game and episode to start from, restoring agent if resume."""
+    checkpoint = Checkpoint('data/{}_checkpoint'.format(name), game)
+    if resume:
+        return checkpoint, checkpoint.restore(agent)
+    checkpoint.clear()
+    return checkpoint, 0
+
+
+def train_timed(name, agent, episodes, timing, **kwargs):
+    """Train agent, timing phases and saving them under name if timing.
+
+    Q-table bytes for the memory plots are sampled every 100 episodes.
+    """
+    timer = PhaseTimer(progress=True) if timing else None
+    history = agent.train(episodes, timer=timer, meter=MemoryMeter(interval=100), **kwargs)
+    if timer is not None:
+        timer.save_json('data/{}_timing.json'.format(name))
+        timer.save_csv('data/{}_timing.csv'.format(name))
+    return history
+
+
+def play_tictactoe(mode, resume=False, workers=1, timing=False):
     """Start TicTacToe game with RL Agent."""
     print('==TIC TAC TOE==')
     game = TicTacToe()
 
     if mode == 'train':
         agent = Agent(game)
-        history = agent.train(10000)
+        checkpoint, start = make_checkpoint('tictactoe', game, agent, resume)
+        history = train_timed('tictactoe', agent, 10000, timing, checkpoint=checkpoint, start=start, workers=workers)
         print('After 10000 Episodes')
 
         # Plot Reward Stats
@@ -91,26 +162,39 @@ def play_tictactoe(mode):
         plt.show()
 
         agent.save_values(path='data/tictactoe_qtable.json')
-        agent.stats()
+        agent.stats(width=0.02, workers=workers)
         agent.demo()
 
     elif mode == 'demo':
-        qtable = json.load(open('data/tictactoe_qtable.json'))
+        qtable = open_binary('data/tictactoe_qtable.json', game)
         agent = Agent(game, qtable=qtable)
         agent.demo()
 
+    elif mode == 'solve':
+        # Compare trained agent against exact values of every reachable state
+        qtable = json.load(open('data/tictactoe_qtable.json'))
+        solver = ExactSolver(game)
+        exact = solver.solve()
+        print('Policy error rate: {}'.format(solver.policy_error_rate(qtable)))
+        with open('data/tictactoe_exact.json', 'w') as out:
+            json.dump(exact, out)
+
     else:
         print('Mode {} is invalid.'.format(mode))
 
 
-def play_connectfour(mode):
+def play_connectfour(mode, resume=False, workers=1, max_entries=None, eviction='lru', timing=False):
     """Start Connect Four game and training."""
     print('==CONNECT FOUR==')
     game = ConnectFour()
 
     if mode == 'train':
-        agent = Agent(game)
-        history = agent.train(10000)
+        if max_entries:
+            agent = Agent(game, qtable=BoundedQTable(max_entries=max_entries, policy=eviction))
+        else:
+            agent = Agent(game)
+        checkpoint, start = make_checkpoint('connectfour', game, agent, resume)
+        history = train_timed('connectfour', agent, 10000, timing, checkpoint=checkpoint, start=start, workers=workers)
         print('After 10000 Episodes')
 
         # Plot Reward Stats
@@ -155,18 +239,31 @@ def play_connectfour(mode):
         plt.show()
 
         agent.save_values(path='data/connectfour_qtable.json')
+        if max_entries:
+            agent.qtable.print_stats()
         agent.demo()
 
     elif mode == 'demo':
-        qtable = json.load(open('data/connectfour_qtable.json'))
+        qtable = open_binary('data/connectfour_qtable.json', game)
         agent = Agent(game, qtable=qtable)
         agent.demo()
 
+    elif mode == 'solve':
+        # Score trained agent against alpha-beta reference opponent
+        qtable = open_binary('data/connectfour_qtable.json', game)
+        agent = Agent(game, qtable=qtable)
+        solver = ConnectFourSolver(rows=game.rows, cols=game.cols, depth=4)
+        print('Agent first')
+        agent.evaluate(solver, episodes=100, first=True)
+        print('Agent second')
+        agent.evaluate(solver, episodes=100, first=False)
+        solver.print_stats()
+
     else:
         print('Mode {} is invalid.'.format(mode))
 
 
-def play_chomp(mode):
+def play_chomp(mode, resume=False, workers=1, timing=False):
     """Start Chomp game and training."""
     print('=====CHOMP=====')
     # Square board has optimal strategy to allow for easy sanity check that agent is learning.
@@ -175,7 +272,8 @@ def play_chomp(mode):
         # Train agent to go first
         agent = Agent(game, epsilon=9e-3, learning_rate=25e-2)
         n = 10000
-        history = agent.train(n)
+        checkpoint, start = make_checkpoint('chomp', game, agent, resume)
+        history = train_timed('chomp', agent, n, timing, checkpoint=checkpoint, start=start, workers=workers)
         print('After {} Episodes'.format(n))
 
         # Plot Reward Stats
@@ -220,50 +318,57 @@ def play_chomp(mode):
         agent.save_values(path='data/chomp_qtable.json')
         agent.demo()
 
-    elif mode == 'hyper':
-        # Hyper parameter optimization
-        max_e = 0.0
-        max_lr = 0.0
-        max_reward = 0.0
-        epsilons = [1e-1, 2e-1, 9e-2, 1e-2, 9e-3]
-        learning_rates = [1e-1, 2e-1, 3e-1, 25e-2, 9e-2]
-        for epsilon in epsilons:
-            for learning_rate in learning_rates:
-                agent = Agent(game, qtable={}, player='X', epsilon=epsilon, learning_rate=learning_rate)
-                n = 10000
-                history = agent.train(n, history=[])
-                total = history[1][len(history[1]) - 1]
-                print(total)
-                if total > max_reward:
-                    max_reward = total
-                    max_e = epsilon
-                    max_lr = learning_rate
-        print('Max e: {}'.format(max_e))
-        print('Max lr: {}'.format(max_lr))
-        print('Max reward: {}'.format(max_reward))
-
     elif mode == 'demo':
-        qtable = json.load(open('data/chomp_qtable.json'))
+        qtable = open_binary('data/chomp_qtable.json', game)
         agent = Agent(game, qtable=qtable)
         agent.demo()
     else:
         print('Mode {} is invalid.'.format(mode))
 
 
-def main():
-    """Entry point."""
-    options = process_args()
-    if options.game == 'tictactoe':
-        play_tictactoe(options.mode)
+def hyper(name, workers=1):
+    """Hyper parameter search over epsilon and learning rate with successive halving."""
+    print('=====HYPER {}====='.format(name.upper()))
+    configs = grid(epsilon=[1e-1, 2e-1, 9e-2, 1e-2, 9e-3],
+                   learning_rate=[1e-1, 2e-1, 3e-1, 25e-2, 9e-2])
+    rows = search(name, configs, min_episodes=1000, max_episodes=10000, workers=workers)
+    write_results(rows, 'data/{}_hyper.csv'.format(name))
+    top = best(rows)
+    print('Max e: {}'.format(top['epsilon']))
+    print('Max lr: {}'.format(top['learning_rate']))
+    print('Max reward per episode: {}'.format(top['score']))
+
+
+def run(options):
+    """Run game and mode chosen by options."""
+    if options.mode == 'hyper':
+        if options.game not in GAMES:
+            print('Game choice {} is current unsupported.'
+                  .format(options.game))
+            sys.exit(1)
+        hyper(options.game, workers=options.workers)
+    elif options.game == 'tictactoe':
+        play_tictactoe(options.mode, resume=options.resume, workers=options.workers, timing=options.timing)
     elif options.game == 'connectfour':
-        play_connectfour(options.mode)
+        play_connectfour(options.mode, resume=options.resume, workers=options.workers,
+                         max_entries=options.max_entries, eviction=options.eviction, timing=options.timing)
     elif options.game == 'chomp':
-        play_chomp(options.mode)
+        play_chomp(options.mode, resume=options.resume, workers=options.workers, timing=options.timing)
     else:
         print('Game choice {} is current unsupported.'
               .format(options.game))
         sys.exit(1)
 
 
+def main():
+    """Entry point."""
+    options = process_args()
+    if options.profile or options.profile_sampling:
+        prefix = 'data/{}_{}'.format(options.game, options.mode)
+        profile(lambda: run(options), prefix, sampling=options.profile_sampling)
+    else:
+        run(options)
+
+
 if __name__ == '__main__':
     main()
@@ -5,18 +5,30 @@ import numpy as np
 import json
 import sys
 
+from game.batch import PLAYERS, make_batch
+from evaluation import evaluate_greedy
+from parallel import train_parallel
+from qtable import QTable
+from shared import SharedQTable, train_hogwild
+
 
 class Agent(object):
     """Agent is the reinforcement learning agent that learns optimal state action pairs."""
     def __init__(self, game, qtable=dict(), player='X', learning_rate=5e-1, discount=9e-1, epsilon=5e-1):
         """Initialize agent with properties
 
-        - qtable is json table with Q values Q(s,a)
+        - qtable is json table or QTable with Q values Q(s,a), keyed by String or integer states
         - game is reference to game being played
         - player is what player the agent is 'X' or 'O'
         - learning_rate is alpha value for gradient update
         - discount is discount factor for future expected rewards
         - epsilon is probability of exploration in epsilon greedy strategy
+        - dirty is set of states changed since the last checkpoint, None when not tracked
+        - meter counts bytes of inserted states while training with a meter, None otherwise
+        - successors caches the next states and actions of the position of game
+          version, see successor_moves
+        - replay is a ReplayBuffer that update records transitions into instead of
+          updating, see ReplayBuffer.for_game and replay_batch, None to update every step
         """
         self.game = game
         self.qtable = qtable
@@ -24,14 +36,67 @@ class Agent(object):
         self.learning_rate = learning_rate
         self.discount = discount
         self.epsilon = epsilon
+        self.dirty = None
+        self.meter = None
+        self.successors = None
+        self.replay = None
 
     def qvalue(self, state):
-        """Retrieve value from qtable or initialize if not found."""
+        """Retrieve value from qtable or initialize if not found.
+
+        States are looked up by the game's canonical state, so symmetric states share a value.
+        """
+        state = self.game.canonical(state)
         if state not in self.qtable:
             # Initialize Q-value at 0
             self.qtable[state] = 0.0
+            if self.dirty is not None:
+                self.dirty.add(state)
+            if self.meter is not None:
+                self.meter.insert(state)
         return self.qtable[state]
 
+    def qvalues(self, states):
+        """Returns list of Q-values of states, initializing missing states as qvalue does.
+
+        A QTable probes every state once in setdefault_many, where qvalue
+        probes a state to check it, again to read it and once more to add it.
+        """
+        if not isinstance(self.qtable, QTable):
+            return [self.qvalue(s) for s in states]
+        keys = [self.game.canonical(s) for s in states]
+        values, missing = self.qtable.setdefault_many(keys)
+        if missing.any():
+            new = set(key for key, miss in zip(keys, missing.tolist()) if miss)
+            if self.dirty is not None:
+                self.dirty.update(new)
+            if self.meter is not None:
+                for key in new:
+                    self.meter.insert(key)
+        return values.tolist()
+
+    def successor_moves(self):
+        """Returns next states and actions.
+
+        Results are cached with the game version, so the next states
+        update builds for the future value are reused by the next next_move
+        on the same position. Any move or reset of the game invalidates them.
+        """
+        if self.successors is not None and self.successors[0] == self.game.version:
+            return self.successors[1:]
+        states, actions = self.game.get_open_moves()
+        self.successors = (self.game.version, states, actions)
+        return states, actions
+
+    def open_moves(self):
+        """Returns next states, actions and their Q-values.
+
+        Q-values are read on every call, as updates may change them while the
+        next states stay cached.
+        """
+        states, actions = self.successor_moves()
+        return states, actions, self.qvalues(states)
+
     def argmax(self, values):
         """Returns index of max value."""
         vmax = np.max(values)
@@ -76,24 +141,37 @@ class Agent(object):
         return (winner, reward)
 
     def next_move(self):
-        """Selects next move in MDP following e-greedy strategy."""
-        states, actions = self.game.get_open_moves()
-        # Exploit
-        i = self.optimal_next(states)
+        """Selects next move in MDP following e-greedy strategy.
+
+        Exploration is decided first, so exploring builds only the selected next
+        state unless the next states are cached by open_moves.
+        """
+        cached = self.successors is not None and self.successors[0] == self.game.version
         if np.random.random_sample() < self.epsilon:
             # Explore
-            i = np.random.randint(0, len(states))
+            if cached:
+                _, states, actions = self.successors
+                i = np.random.randint(0, len(actions))
+                return states[i], actions[i]
+            actions = self.game.get_actions()
+            action = actions[np.random.randint(0, len(actions))]
+            return self.game.successor_key(action), action
+        # Exploit
+        states, actions, values = self.open_moves()
+        i = self.optimal_next(states, values)
         return states[i], actions[i]
 
-    def optimal_next(self, states):
+    def optimal_next(self, states, values=None):
         """Selects optimal next move.
 
         Input
         - states list of possible next states
+        - values list of their Q-values, looked up if not given
         Output
         - index of next state that produces maximum value
         """
-        values = [self.qvalue(s) for s in states]
+        if values is None:
+            values = self.qvalues(states)
         # Exploit
         if self.game.player == self.player:
             # Optimal move is max
@@ -126,24 +204,115 @@ class Agent(object):
         # Finding estimated future value by finding max(Q(s', a'))
         # If terminal condition is reached, future reward is 0
         future_val = 0
+        if self.replay is not None:
+            future_states = self.successor_moves()[0] if not winner else []
+            self.replay.add(self.game.canonical(state), reward, [self.game.canonical(s) for s in future_states],
+                            self.game.player == self.player)
+            return
         if not winner:
-            future_states, _ = self.game.get_open_moves()
-            i = self.optimal_next(future_states)
-            future_val = self.qvalue(future_states[i])
+            future_states, _, values = self.open_moves()
+            i = self.optimal_next(future_states, values)
+            future_val = values[i]
         # Q-value update
+        state = self.game.canonical(state)
+        self.qtable[state] = ((1 - self.learning_rate) * self.qvalue(state)) + (self.learning_rate * (reward + self.discount * future_val))
+        if self.dirty is not None:
+            self.dirty.add(state)
+
+    def learn(self, state, reward, future_states, maximize):
+        """Updates q-value from a transition observed elsewhere, as update does.
+
+        - future_states are the next states, empty if the game ended
+        - maximize is whether the agent picks the next move
+        Returns canonical state updated.
+        """
+        future_val = 0
+        if future_states:
+            values = self.qvalues(future_states)
+            future_val = max(values) if maximize else min(values)
+        state = self.game.canonical(state)
         self.qtable[state] = ((1 - self.learning_rate) * self.qvalue(state)) + (self.learning_rate * (reward + self.discount * future_val))
+        if self.dirty is not None:
+            self.dirty.add(state)
+        return state
+
+    def lookup_many(self, keys):
+        """Returns array of Q-values of an array of canonical states, 0.0 if missing.
+
+        Every distinct state is read once, a QTable in one get_many.
+        """
+        unique, inverse = np.unique(keys, return_inverse=True)
+        if isinstance(self.qtable, QTable):
+            values = self.qtable.get_many(unique.tolist())
+        else:
+            get = self.qtable.get
+            values = np.array([get(key, 0.0) for key in unique.tolist()])
+        return values[inverse]
+
+    def replay_batch(self, count=None):
+        """Updates q-values of a sampled batch of replayed transitions, as update does.
+
+        Values are read for the whole batch before any update is applied, and
+        a state sampled several times keeps the update of its last sample.
+        """
+        states, current, targets = self.replay.targets(self.replay.sample(count), self.lookup_many, self.discount)
+        values = ((1 - self.learning_rate) * current) + (self.learning_rate * targets)
+        if isinstance(self.qtable, QTable):
+            self.qtable.update_many(states.tolist(), values)
+        else:
+            for state, value in zip(states.tolist(), values.tolist()):
+                if self.meter is not None and state not in self.qtable:
+                    self.meter.insert(state)
+                self.qtable[state] = value
+        if self.dirty is not None:
+            self.dirty.update(states.tolist())
 
-    def train(self, episodes, history=[]):
+    def train(self, episodes, history=[], checkpoint=None, start=0, meter=None, workers=1, timer=None):
         """Trains by playing against self.
 
         Each episode is a full game
+        - checkpoint records changed states every checkpoint.interval episodes, see rl.checkpoint
+        - start is the episode counter to continue from, as returned by Checkpoint.restore
+        - meter measures qtable bytes every meter.interval episodes, see rl.memory,
+          and is detached when training returns
+        - with a replay buffer, a batch is replayed whenever batch_size transitions were added
+        - workers above 1 plays episodes in that many actor processes, see rl.parallel,
+          or with a SharedQTable in that many Hogwild processes, see rl.shared
+        - timer times phases of training in this process, see rl.timing
+
+        History holds episodes, cumulative reward, qtable KB after every
+        episode (the latest sample) and the samples of the meter. Without a
+        meter KB is sys.getsizeof of the qtable and there are no samples.
         """
-        x = range(episodes)
+        if timer is not None:
+            timer.start(self)
+            try:
+                return self.train(episodes, history=history, checkpoint=checkpoint, start=start, meter=meter,
+                                  workers=workers)
+            finally:
+                timer.stop()
+        if meter is not None and self.meter is not meter:
+            self.meter = meter
+            meter.start(self.qtable)
+            try:
+                return self.train(episodes, history=history, checkpoint=checkpoint, start=start, meter=meter,
+                                  workers=workers)
+            finally:
+                self.meter = None
+        if checkpoint is not None:
+            checkpoint.track(self)
+        if workers > 1 and isinstance(self.qtable, SharedQTable):
+            if checkpoint is not None or start:
+                raise ValueError('Hogwild training does not support checkpoints.')
+            return train_hogwild(self, episodes, workers, history)
+        if workers > 1:
+            return train_parallel(self, episodes, workers, history, checkpoint=checkpoint, start=start)
+        x = range(start, episodes)
         cumulative_reward = []
         memory = []
 
         total_reward = 0.0
-        for i in range(episodes):
+        for i in range(start, episodes):
             episode_reward = 0.0
             game_active = True
             # Rest of game follows strategy
@@ -153,52 +322,209 @@ class Agent(object):
                 if winner:
                     game_active = False
                     self.game.reset()
+            if self.replay is not None and self.replay.pending >= self.replay.batch_size:
+                self.replay_batch()
             total_reward += episode_reward
             cumulative_reward.append(total_reward)
-            memory.append(sys.getsizeof(self.qtable) / 1024)
+            memory.append(self.memory(i + 1))
             # Record total reward agent gains as training progresses
             if (i % (episodes / 10) == 0) and (i >= (episodes / 10)):
                 print('.')
+            if checkpoint is not None and (i + 1) % checkpoint.interval == 0:
+                checkpoint.record(self, i + 1)
+        history.append(x)
+        history.append(cumulative_reward)
+        history.append(memory)
+        history.append(self.memory_samples())
+        return history
+
+    def memory(self, episode):
+        """Returns qtable KB after episode, recorded by the meter when training with one."""
+        if self.meter is None:
+            return sys.getsizeof(self.qtable) / 1024.0
+        return self.meter.record(episode, self.qtable) / 1024.0
+
+    def memory_samples(self):
+        """Returns samples of the meter, empty without one."""
+        return self.meter.samples if self.meter is not None else []
+
+    def canonical_many(self, states):
+        """Returns array of canonical states of an array of integer states."""
+        if not getattr(self.game, 'symmetry', False):
+            return states
+        return np.array([self.game.canonical(s) for s in states.tolist()], dtype=states.dtype)
+
+    def batch_values(self, batch):
+        """Returns candidate states, legal mask and Q-values of every board in batch.
+
+        A QTable is read in one get_many, leaving missing states out of the table.
+        """
+        legal = batch.legal()
+        states = batch.candidate_states()
+        values = np.zeros(legal.shape)
+        if isinstance(self.qtable, QTable):
+            values[legal] = self.qtable.get_many(self.canonical_many(states[legal]))
+        else:
+            values[legal] = [self.qvalue(s) for s in states[legal].tolist()]
+        return states, legal, values
+
+    def batch_optimal(self, batch, legal, values):
+        """Returns index of optimal action and its value for every board in batch.
+
+        Optimal is max on boards where the agent moves, min elsewhere, ties broken at random.
+        """
+        signed = np.where((batch.players == PLAYERS[self.player])[:, None], values, -values)
+        signed[~legal] = -np.inf
+        best = signed.max(axis=1)
+        ties = (signed == best[:, None]) * np.random.random_sample(signed.shape)
+        optimal = np.argmax(ties, axis=1)
+        return optimal, values[np.arange(batch.n), optimal]
+
+    def train_batched(self, episodes, batch_size=1000, history=[], meter=None):
+        """Trains by playing against self on a batch of boards moving in lockstep.
+
+        The game must use integer states, see game.batch. Each step
+        - Selects e-greedy actions on every board from candidate Q-values
+        - Makes all moves at once, resetting finished boards
+        - Updates Q-values of the selected states as in update, reading
+          future values once for the whole batch before any update is applied
+          A QTable is updated in one update_many, where a state selected on
+          several boards keeps the update of the last board.
+
+        Each finished board is an episode, and history is as in train.
+        """
+        if meter is not None and self.meter is not meter:
+            self.meter = meter
+            meter.start(self.qtable)
+            try:
+                return self.train_batched(episodes, batch_size=batch_size, history=history, meter=meter)
+            finally:
+                self.meter = None
+        batch = make_batch(self.game, batch_size)
+        rows = np.arange(batch_size)
+        player = PLAYERS[self.player]
+        x = range(episodes)
+        cumulative_reward = []
+        memory = []
+
+        total_reward = 0.0
+        episode_rewards = np.zeros(batch_size)
+        states, legal, values = self.batch_values(batch)
+        while len(cumulative_reward) < episodes:
+            # Exploit
+            actions, _ = self.batch_optimal(batch, legal, values)
+            # Explore
+            explore = np.random.random_sample(batch_size) < self.epsilon
+            random_actions = np.argmax(legal * np.random.random_sample(legal.shape), axis=1)
+            actions = np.where(explore, random_actions, actions)
+            selected = states[rows, actions]
+
+            winners, done = batch.step(actions)
+            rewards = np.where(winners == player, 1.0, np.where(winners == 3 - player, -1.0, 0.0))
+            # Finding estimated future value of every board, 0 if terminal
+            states, legal, values = self.batch_values(batch)
+            _, future_values = self.batch_optimal(batch, legal, values)
+            future_values[done] = 0.0
+            targets = rewards + (self.discount * future_values)
+            # Q-value update
+            if isinstance(self.qtable, QTable):
+                selected = self.canonical_many(selected)
+                old_values = self.qtable.get_many(selected)
+                self.qtable.update_many(selected, ((1 - self.learning_rate) * old_values) + (self.learning_rate * targets))
+                if self.dirty is not None:
+                    self.dirty.update(selected.tolist())
+            else:
+                for state, target in zip(selected.tolist(), targets.tolist()):
+                    state = self.game.canonical(state)
+                    self.qtable[state] = ((1 - self.learning_rate) * self.qvalue(state)) + (self.learning_rate * target)
+                    if self.dirty is not None:
+                        self.dirty.add(state)
+
+            episode_rewards += rewards
+            for i in np.flatnonzero(done):
+                if len(cumulative_reward) == episodes:
+                    break
+                total_reward += episode_rewards[i]
+                cumulative_reward.append(total_reward)
+                memory.append(self.memory(len(cumulative_reward)))
+                # Record total reward agent gains as training progresses
+                n = len(cumulative_reward) - 1
+                if (n % (episodes / 10) == 0) and (n >= (episodes / 10)):
+                    print('.')
+            episode_rewards[done] = 0.0
         history.append(x)
         history.append(cumulative_reward)
         history.append(memory)
+        history.append(self.memory_samples())
         return history
 
-    def stats(self):
+    def stats(self, games=10000, width=None, workers=1, seed=0):
         """Agent plays optimally against self with no exploration.
 
-        Records win/loss/draw distribution.
+        Records win/loss/draw distribution with 95% confidence intervals,
+        stopping early once every interval is narrower than width. Games are
+        spread over workers processes and the qtable is only read, see
+        rl.evaluation. Returns the result of evaluate_greedy.
         """
-        x_wins = 0
-        o_wins = 0
+        result = evaluate_greedy(self, games=games, width=width, workers=workers, seed=seed)
+        print('    X: {:.3f} [{:.3f}, {:.3f}] Draw: {:.3f} [{:.3f}, {:.3f}] O: {:.3f} [{:.3f}, {:.3f}] '
+              '({} games)'.format(*(result['X'] + result['Draw'] + result['O'] + (result['games'],))))
+        return result
+
+    def evaluate(self, opponent, episodes=100, first=True):
+        """Agent plays optimally against opponent with no exploration.
+
+        Opponent picks moves with select_move(game), like ConnectFourSolver.
+        Returns win/draw/loss rates of the agent.
+        """
+        side = 'X' if first else 'O'
+        wins = 0
+        losses = 0
         draws = 0
-        episodes = 10000
         for i in range(episodes):
-            game_active = True
-            while(game_active):
-                states, actions = self.game.get_open_moves()
-                i = self.optimal_next(states)
-                winner = self.game.make_move(actions[i])
-                if winner:
-                    if (winner == 'X'):
-                        x_wins += 1
-                    elif (winner == 'O'):
-                        o_wins += 1
-                    else:
-                        draws += 1
-                    game_active = False
-                    self.game.reset()
-        print('    X: {} Draw: {} O: {}'.format((x_wins * 1.0) / episodes,
-                                                (draws * 1.0) / episodes,
-                                                (o_wins * 1.0) / episodes))
+            winner = None
+            while not winner:
+                if self.game.player == side:
+                    states, actions = self.game.get_open_moves()
+                    winner = self.game.make_move(actions[self.optimal_next(states)])
+                else:
+                    winner = self.game.make_move(opponent.select_move(self.game))
+            if winner == side:
+                wins += 1
+            elif winner == 'Draw':
+                draws += 1
+            else:
+                losses += 1
+            self.game.reset()
+        rates = ((wins * 1.0) / episodes, (draws * 1.0) / episodes, (losses * 1.0) / episodes)
+        print('    Win: {} Draw: {} Loss: {}'.format(*rates))
+        return rates
 
     def save_values(self, path='data/qtable.json'):
         """Save Q values to json."""
         with open(path, 'w') as out:
-            json.dump(self.qtable, out)
+            json.dump(dict(self.qtable), out)
+
+    def load_values(self, path='data/qtable.json'):
+        """Load Q values from json.
+
+        Json keys are always Strings, so keys of hashed games are converted back to integers.
+        A QTable stays a QTable.
+        """
+        with open(path) as f:
+            qtable = json.load(f)
+        if getattr(self.game, 'hashed', False):
+            qtable = dict((int(state), value) for state, value in qtable.items())
+        if isinstance(self.qtable, QTable):
+            qtable = QTable(qtable, dtype=self.qtable.dtype)
+        self.qtable = qtable
+        self.successors = None
+
+    def demo(self, first=True, opponent=None):
+        """Demo so users can play against trained agent.
 
-    def demo(self, first=True):
-        """Demo so users can play against trained agent."""
+        Opponent with select_move(game), like ConnectFourSolver, plays instead of the user.
+        """
         self.game.print_instructions()
         # Agent goes first
         game_active = True
@@ -211,8 +537,11 @@ class Agent(object):
                 self.game.print_board()
                 first = not first
             elif not first:
-                print('Select move:')
-                p = self.game.read_input()
+                if opponent:
+                    p = opponent.select_move(self.game)
+                else:
+                    print('Select move:')
+                    p = self.game.read_input()
                 if self.game.is_valid_move(p):
                     winner = self.game.make_move(p)
                     self.game.print_board()
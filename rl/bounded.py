@@ -0,0 +1,239 @@
+"""Memory-bounded Q-table with pluggable eviction."""
+
+
+import copy
+import sys
+from collections import OrderedDict
+from itertools import islice
+
+
+# Approximate bytes of bookkeeping per entry besides key and value objects
+ENTRY_OVERHEAD = 200
+
+
+class LRUPolicy(object):
+    """Evict the least recently used state."""
+
+    def __init__(self):
+        """Initialize empty recency order."""
+        self.order = OrderedDict()
+
+    def add(self, key):
+        """Track new state."""
+        self.order[key] = None
+
+    def touch(self, key):
+        """Mark state as most recently used."""
+        del self.order[key]
+        self.order[key] = None
+
+    def remove(self, key):
+        """Stop tracking state."""
+        del self.order[key]
+
+    def evict(self, qtable):
+        """Returns state to evict and stops tracking it."""
+        return self.order.popitem(last=False)[0]
+
+
+class LFUPolicy(object):
+    """Evict the least frequently used state, oldest first among equals.
+
+    States are kept in buckets of equal use count, so every operation is O(1).
+    """
+
+    def __init__(self):
+        """Initialize empty use counts."""
+        self.counts = {}
+        self.buckets = {}
+        self.min_count = 0
+
+    def add(self, key):
+        """Track new state with one use."""
+        self.counts[key] = 1
+        self.buckets.setdefault(1, OrderedDict())[key] = None
+        self.min_count = 1
+
+    def touch(self, key):
+        """Count one more use of state."""
+        count = self.counts[key]
+        bucket = self.buckets[count]
+        del bucket[key]
+        if not bucket:
+            del self.buckets[count]
+            if self.min_count == count:
+                self.min_count = count + 1
+        self.counts[key] = count + 1
+        self.buckets.setdefault(count + 1, OrderedDict())[key] = None
+
+    def remove(self, key):
+        """Stop tracking state."""
+        count = self.counts.pop(key)
+        bucket = self.buckets[count]
+        del bucket[key]
+        if not bucket:
+            del self.buckets[count]
+
+    def least_used(self):
+        """Returns bucket of least used states."""
+        # Minimum only moves up between adds, which reset it to 1
+        while self.min_count not in self.buckets:
+            self.min_count += 1
+        return self.buckets[self.min_count]
+
+    def evict(self, qtable):
+        """Returns state to evict and stops tracking it."""
+        key = next(iter(self.least_used()))
+        self.remove(key)
+        return key
+
+
+class LowValuePolicy(LFUPolicy):
+    """Evict the state with lowest |Q| among a sample of the least frequently used states."""
+
+    def __init__(self, sample=8):
+        """Initialize empty use counts, comparing sample states per eviction."""
+        LFUPolicy.__init__(self)
+        self.sample = sample
+
+    def evict(self, qtable):
+        """Returns state to evict and stops tracking it."""
+        candidates = islice(self.least_used(), self.sample)
+        key = min(candidates, key=lambda state: abs(qtable.table[state]))
+        self.remove(key)
+        return key
+
+
+POLICIES = {'lru': LRUPolicy, 'lfu': LFUPolicy, 'lowq': LowValuePolicy}
+
+
+class BoundedQTable(object):
+    """Q-table holding at most max_entries states or about max_bytes of memory.
+
+    Adding a state past the budget evicts one chosen by policy, which is
+    'lru', 'lfu', 'lowq' or a policy object. Lookups and evictions are
+    counted, see stats.
+
+    evicted is the set of states evicted since it was last cleared, None
+    when not tracked, see rl.checkpoint.
+    """
+
+    def __init__(self, max_entries=None, max_bytes=None, policy='lru'):
+        """Initialize empty table with an entry or memory budget."""
+        if max_entries is None and max_bytes is None:
+            raise ValueError('BoundedQTable needs max_entries or max_bytes.')
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        # Empty policy to build copies of the table from
+        self.template = POLICIES[policy]() if policy in POLICIES else copy.deepcopy(policy)
+        self.policy = copy.deepcopy(self.template)
+        self.table = {}
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.evicted = None
+
+    def empty(self):
+        """Returns empty table with the same budget and policy."""
+        return BoundedQTable(self.max_entries, self.max_bytes, self.template)
+
+    def entry_bytes(self, key):
+        """Returns approximate bytes of the entry of key."""
+        return sys.getsizeof(key) + sys.getsizeof(0.0) + ENTRY_OVERHEAD
+
+    def full(self, key):
+        """Returns whether adding key would exceed the budget."""
+        if self.max_entries is not None and len(self.table) >= self.max_entries:
+            return True
+        return self.max_bytes is not None and self.bytes + self.entry_bytes(key) > self.max_bytes
+
+    def __contains__(self, key):
+        """Returns whether key has a value, counting a hit or miss."""
+        if key in self.table:
+            self.hits += 1
+            return True
+        self.misses += 1
+        return False
+
+    def __getitem__(self, key):
+        """Returns value of key, marking it used."""
+        value = self.table[key]
+        self.policy.touch(key)
+        return value
+
+    def __setitem__(self, key, value):
+        """Set value of key, evicting another state if over budget."""
+        if key in self.table:
+            self.policy.touch(key)
+        else:
+            while self.table and self.full(key):
+                victim = self.policy.evict(self)
+                del self.table[victim]
+                self.bytes -= self.entry_bytes(victim)
+                self.evictions += 1
+                if self.evicted is not None:
+                    self.evicted.add(victim)
+            if self.evicted is not None:
+                self.evicted.discard(key)
+            self.policy.add(key)
+            self.bytes += self.entry_bytes(key)
+        self.table[key] = value
+
+    def __delitem__(self, key):
+        """Remove key."""
+        del self.table[key]
+        self.policy.remove(key)
+        self.bytes -= self.entry_bytes(key)
+
+    def __len__(self):
+        """Returns number of keys."""
+        return len(self.table)
+
+    def __iter__(self):
+        """Iterate over keys."""
+        return iter(self.table)
+
+    def __sizeof__(self):
+        """Returns approximate bytes of all entries."""
+        return object.__sizeof__(self) + self.bytes
+
+    def get(self, key, default=None):
+        """Returns value of key, or default if missing, without marking it used."""
+        return self.table.get(key, default)
+
+    def keys(self):
+        """Returns list of keys."""
+        return list(self.table.keys())
+
+    def values(self):
+        """Returns list of values."""
+        return list(self.table.values())
+
+    def items(self):
+        """Returns list of (key, value) pairs."""
+        return list(self.table.items())
+
+    def update(self, items):
+        """Set values of a mapping or list of (key, value) pairs."""
+        if hasattr(items, 'items'):
+            items = list(items.items())
+        for key, value in items:
+            self[key] = value
+
+    def stats(self):
+        """Returns lookup and eviction statistics."""
+        lookups = self.hits + self.misses
+        return {'entries': len(self.table),
+                'bytes': self.bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': (self.hits * 1.0) / lookups if lookups else 0.0,
+                'evictions': self.evictions}
+
+    def print_stats(self):
+        """Print lookup and eviction statistics."""
+        stats = self.stats()
+        print('    Entries: {} Hit rate: {:.3f} Evictions: {}'.format(stats['entries'],
+                                                                     stats['hit_rate'],
+                                                                     stats['evictions']))
@@ -0,0 +1,171 @@
+"""Append-only delta checkpoints of training.
+
+A checkpoint directory holds
+- snapshot.bin, a full binary Q-table (see rl.mapped) with the episode
+  counter and NumPy RNG state in its header
+- deltas.log, records of the entries changed since the snapshot
+
+Each delta record is a header of tag, count, key width (0 for integer
+states) and metadata length, then json metadata with the episode counter,
+RNG state and states evicted from a bounded table, the keys and their
+float64 values. Recording costs the
+number of changed entries, and every compact_every records the log is
+folded into a new snapshot.
+"""
+
+
+import json
+import numbers
+import os
+import struct
+import numpy as np
+
+from bounded import BoundedQTable
+from mapped import MappedQTable, save_binary
+from qtable import QTable
+
+
+RECORD = struct.Struct('<4sIII')
+TAG = b'QDLT'
+
+
+def get_rng_state():
+    """Returns json friendly state of the NumPy global RNG."""
+    name, keys, pos, has_gauss, cached_gaussian = np.random.get_state()
+    return [name, keys.tolist(), pos, has_gauss, cached_gaussian]
+
+
+def set_rng_state(state):
+    """Restore state of the NumPy global RNG from get_rng_state."""
+    name, keys, pos, has_gauss, cached_gaussian = state
+    np.random.set_state((str(name), np.array(keys, dtype=np.uint32), pos, has_gauss, cached_gaussian))
+
+
+class Checkpoint(object):
+    """Delta checkpoint log of an agent training on game."""
+
+    def __init__(self, path, game, interval=1000, compact_every=10):
+        """Initialize checkpoint in directory path.
+
+        - interval is the number of episodes between delta records
+        - compact_every is the number of delta records between snapshots
+        """
+        self.path = path
+        self.game = game
+        self.interval = interval
+        self.compact_every = compact_every
+        self.snapshot_path = os.path.join(path, 'snapshot.bin')
+        self.log_path = os.path.join(path, 'deltas.log')
+        self.records = 0
+        if not os.path.isdir(path):
+            os.makedirs(path)
+
+    def clear(self):
+        """Remove snapshot and delta log."""
+        for path in (self.snapshot_path, self.log_path):
+            if os.path.exists(path):
+                os.remove(path)
+        self.records = 0
+
+    def track(self, agent):
+        """Start tracking changed states of agent, and evicted states of a bounded table."""
+        if agent.dirty is None:
+            agent.dirty = set()
+        if isinstance(agent.qtable, BoundedQTable) and agent.qtable.evicted is None:
+            agent.qtable.evicted = set()
+
+    def record(self, agent, episode):
+        """Append entries changed since the last record, compacting every compact_every records."""
+        # States evicted from a bounded table since they changed are left out
+        keys = [key for key in agent.dirty if agent.qtable.get(key) is not None]
+        agent.dirty.clear()
+        evicted = []
+        if getattr(agent.qtable, 'evicted', None) is not None:
+            evicted = list(agent.qtable.evicted)
+            agent.qtable.evicted.clear()
+        values = np.array([agent.qtable.get(key) for key in keys], dtype=np.float64)
+        if keys and not isinstance(keys[0], numbers.Integral):
+            keys = np.array(keys, dtype=np.string_)
+            width = keys.dtype.itemsize
+        else:
+            keys = np.array(keys, dtype=np.uint64)
+            width = 0
+        meta = json.dumps({'episode': episode, 'rng': get_rng_state(), 'evicted': evicted}).encode('utf-8')
+        with open(self.log_path, 'ab') as out:
+            out.write(RECORD.pack(TAG, len(keys), width, len(meta)))
+            out.write(meta)
+            out.write(keys.tobytes())
+            out.write(values.tobytes())
+        self.records += 1
+        if self.records >= self.compact_every:
+            self.compact(agent, episode)
+
+    def compact(self, agent, episode):
+        """Write full snapshot of the agent table and start an empty delta log."""
+        extra = {'episode': episode, 'rng': get_rng_state()}
+        save_binary(agent.qtable, self.snapshot_path + '.tmp', self.game, dtype=np.float64, extra=extra)
+        os.rename(self.snapshot_path + '.tmp', self.snapshot_path)
+        open(self.log_path, 'wb').close()
+        self.records = 0
+
+    def read_log(self):
+        """Returns list of (metadata, keys, values) of complete delta records, skipping a torn tail."""
+        records = []
+        if not os.path.exists(self.log_path):
+            return records
+        with open(self.log_path, 'rb') as f:
+            data = f.read()
+        offset = 0
+        while offset + RECORD.size <= len(data):
+            tag, count, width, length = RECORD.unpack_from(data, offset)
+            dtype = np.dtype('S{}'.format(width)) if width else np.dtype(np.uint64)
+            end = offset + RECORD.size + length + (count * dtype.itemsize) + (count * 8)
+            if tag != TAG or end > len(data):
+                break
+            start = offset + RECORD.size
+            meta = json.loads(data[start:start + length].decode('utf-8'))
+            start += length
+            keys = np.frombuffer(data, dtype=dtype, count=count, offset=start)
+            values = np.frombuffer(data, dtype=np.float64, count=count, offset=start + (count * dtype.itemsize))
+            records.append((meta, keys.tolist(), values.tolist()))
+            offset = end
+        return records
+
+    def restore(self, agent):
+        """Rebuild agent table and RNG state from snapshot and deltas.
+
+        The table is rebuilt as the same kind as the agent table, a bounded
+        table with the same budget and policy. Returns episode counter to
+        continue from, 0 if there is no checkpoint.
+        """
+        episode = 0
+        rng = None
+        if isinstance(agent.qtable, QTable):
+            qtable = QTable(dtype=agent.qtable.dtype)
+        elif isinstance(agent.qtable, BoundedQTable):
+            qtable = agent.qtable.empty()
+        else:
+            qtable = {}
+        if os.path.exists(self.snapshot_path):
+            snapshot = MappedQTable(self.snapshot_path, game=self.game)
+            qtable.update(dict(snapshot.items()))
+            episode = snapshot.header['episode']
+            rng = snapshot.header['rng']
+        records = self.read_log()
+        for meta, keys, values in records:
+            if meta['episode'] <= episode:
+                # Already folded into the snapshot
+                continue
+            for key in meta.get('evicted', []):
+                if key in qtable:
+                    del qtable[key]
+            qtable.update(dict(zip(keys, values)))
+            episode = meta['episode']
+            rng = meta['rng']
+        if rng is not None:
+            set_rng_state(rng)
+        agent.qtable = qtable
+        agent.dirty = None
+        self.track(agent)
+        self.records = len(records)
+        return episode
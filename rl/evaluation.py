@@ -0,0 +1,105 @@
+"""Parallel greedy self-play evaluation with sequential stopping.
+
+Games are played in chunks, each with its own RandomState seeded by
+(seed, chunk index) for breaking ties between equal values, so results
+do not depend on the number of workers. The table is only read, with
+missing states counting as 0.0 as in Agent.qvalue. After every round of
+chunks the Wilson score interval of each outcome rate is computed, and
+evaluation stops once every interval is narrower than the requested width.
+
+Workers are forked after the agent is set in a module global, so neither
+the agent nor its table are pickled.
+"""
+
+
+import math
+import multiprocessing
+import numpy as np
+
+
+OUTCOMES = ('X', 'Draw', 'O')
+
+# Agent evaluated by forked workers
+evaluated = None
+
+
+def wilson(successes, trials, z=1.96):
+    """Returns Wilson score interval (low, high) of a binomial rate."""
+    if trials == 0:
+        return (0.0, 1.0)
+    p = (successes * 1.0) / trials
+    denominator = 1 + ((z * z) / trials)
+    center = (p + ((z * z) / (2 * trials))) / denominator
+    margin = (z * math.sqrt(((p * (1 - p)) / trials) + ((z * z) / (4 * trials * trials)))) / denominator
+    return (max(0.0, center - margin), min(1.0, center + margin))
+
+
+def play_greedy(agent, games, rng):
+    """Returns counts of X wins, draws and O wins of games of greedy self-play, reading the table only."""
+    game = agent.game
+    get = agent.qtable.get
+    canonical = game.canonical
+    counts = [0, 0, 0]
+    for i in range(games):
+        game.reset()
+        winner = None
+        while not winner:
+            states, actions = game.get_open_moves()
+            values = np.array([get(canonical(s), 0.0) for s in states])
+            best = values.max() if game.player == agent.player else values.min()
+            ties = np.flatnonzero(values == best)
+            winner = game.make_move(actions[ties[rng.randint(len(ties))]])
+        counts[OUTCOMES.index(winner)] += 1
+    game.reset()
+    return counts
+
+
+def play_chunk(args):
+    """Returns outcome counts of a chunk of games of the evaluated agent."""
+    games, seed, chunk = args
+    return play_greedy(evaluated, games, np.random.RandomState([seed, chunk]))
+
+
+def evaluate_greedy(agent, games=10000, width=None, workers=1, chunk=250, seed=0, z=1.96):
+    """Returns outcome rates of at most games games of greedy self-play.
+
+    - width stops once every interval is narrower, None plays every game
+    - workers is the number of processes, each round plays one chunk per worker
+    - chunk is the number of games per chunk
+    - z is the normal quantile of the interval, 1.96 for 95%
+
+    Result maps 'games' to games played and each of 'X', 'Draw' and 'O' to
+    (rate, low, high).
+    """
+    global evaluated
+    evaluated = agent
+    pool = multiprocessing.Pool(workers) if workers > 1 else None
+    counts = [0, 0, 0]
+    played = 0
+    index = 0
+    try:
+        while played < games:
+            sizes = []
+            for k in range(workers):
+                size = min(chunk, games - played - sum(sizes))
+                if size > 0:
+                    sizes.append(size)
+            tasks = [(size, seed, index + k) for k, size in enumerate(sizes)]
+            index += len(tasks)
+            results = pool.map(play_chunk, tasks) if pool is not None else [play_chunk(task) for task in tasks]
+            for result in results:
+                counts = [c + r for c, r in zip(counts, result)]
+            played += sum(sizes)
+            if width is not None and all(high - low < width for low, high in
+                                         [wilson(c, played, z) for c in counts]):
+                break
+    finally:
+        evaluated = None
+        if pool is not None:
+            pool.close()
+            pool.join()
+    result = {'games': played}
+    for outcome, count in zip(OUTCOMES, counts):
+        low, high = wilson(count, played, z)
+        result[outcome] = ((count * 1.0) / played, low, high)
+    return result
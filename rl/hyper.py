@@ -0,0 +1,116 @@
+"""Hyperparameter search with successive halving.
+
+Every configuration of a grid is a trial, trained in rungs of growing
+episode budgets. All trials of a rung train in parallel worker processes,
+each building its own game from game.registry. After each rung only the
+best 1/eta of the trials by score, the mean reward per episode over the
+episodes of that rung, continue to the next rung, whose budget is eta
+times larger, up to max_episodes.
+
+Trials carry their Q-table and RNG state from rung to rung, so no episode
+is played twice.
+"""
+
+
+import csv
+import itertools
+import json
+import math
+import multiprocessing
+import numpy as np
+
+from game.registry import make_game
+from agent import Agent
+
+
+def grid(**values):
+    """Returns list of configurations of every combination of values, e.g. grid(epsilon=[0.1, 0.2])."""
+    names = sorted(values)
+    return [dict(zip(names, combination)) for combination in itertools.product(*[values[name] for name in names])]
+
+
+def rungs(min_episodes, max_episodes, eta=3):
+    """Returns list of episode budgets growing by eta from min_episodes to max_episodes."""
+    budgets = [min_episodes]
+    while budgets[-1] < max_episodes:
+        budgets.append(min(budgets[-1] * eta, max_episodes))
+    return budgets
+
+
+def run_trial(task):
+    """Train a trial from start to end episodes.
+
+    Task is (game name, configuration, start, end, seed, state), where state
+    is the (qtable, RNG state) of the previous rung, None on the first.
+    Returns (score, state).
+    """
+    name, config, start, end, seed, state = task
+    if state is None:
+        qtable = {}
+        np.random.seed(seed)
+    else:
+        qtable, rng = state
+        np.random.set_state(rng)
+    agent = Agent(make_game(name), qtable=qtable, **config)
+    history = agent.train(end, history=[], start=start)
+    score = history[1][-1] / (end - start)
+    return score, (agent.qtable, np.random.get_state())
+
+
+def search(name, configs, min_episodes=1000, max_episodes=10000, eta=3, workers=1, seed=0):
+    """Returns list of result rows of successive halving over configs on the game registered as name.
+
+    Each row is a dict of trial, the configuration, rung, episodes, score
+    and whether the trial was promoted to the next rung, best first within
+    a rung.
+    """
+    pool = multiprocessing.Pool(workers) if workers > 1 else None
+    states = [None] * len(configs)
+    alive = range(len(configs))
+    start = 0
+    rows = []
+    try:
+        budgets = rungs(min_episodes, max_episodes, eta)
+        for rung, end in enumerate(budgets):
+            tasks = [(name, configs[t], start, end, seed + t, states[t]) for t in alive]
+            results = pool.map(run_trial, tasks) if pool is not None else [run_trial(task) for task in tasks]
+            scores = {}
+            for t, (score, state) in zip(alive, results):
+                scores[t] = score
+                states[t] = state
+            ranked = sorted(alive, key=lambda t: -scores[t])
+            keep = int(math.ceil(len(ranked) / float(eta))) if rung + 1 < len(budgets) else 0
+            for i, t in enumerate(ranked):
+                row = {'trial': t, 'rung': rung, 'episodes': end, 'score': scores[t], 'promoted': i < keep}
+                row.update(configs[t])
+                rows.append(row)
+            for t in ranked[keep:]:
+                # Free tables of pruned trials
+                states[t] = None
+            alive = sorted(ranked[:keep])
+            start = end
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+    return rows
+
+
+def best(rows):
+    """Returns row of the best trial of the last rung."""
+    last = max(row['rung'] for row in rows)
+    return max([row for row in rows if row['rung'] == last], key=lambda row: row['score'])
+
+
+def write_results(rows, path):
+    """Write result rows to path as JSON if it ends in .json, otherwise CSV."""
+    if path.endswith('.json'):
+        with open(path, 'w') as out:
+            json.dump(rows, out, indent=2)
+        return
+    fields = ['trial', 'rung', 'episodes', 'score', 'promoted']
+    fields += sorted(set(key for row in rows for key in row) - set(fields))
+    with open(path, 'w') as out:
+        writer = csv.DictWriter(out, fieldnames=fields)
+        writer.writeheader()
+        writer.writerows(rows)
@@ -0,0 +1,211 @@
+"""Memory-mapped binary Q-table files.
+
+File layout
+- 8 byte magic
+- uint32 length of the header, then the json header: game, board size,
+  state abstraction version, key and value dtypes and count
+- padding to 64 bytes
+- count sorted keys, uint64 integer states or fixed-width Strings
+- count values in the same order
+
+Files are opened with np.memmap, so processes reading the same file share
+one page cached copy and start without parsing anything.
+"""
+
+
+import json
+import numbers
+import os
+import struct
+import numpy as np
+
+
+MAGIC = b'QTABLE\x00\x01'
+# Version of the state keys of every game, bump when keys of a game change
+ABSTRACTION = 1
+ALIGN = 64
+# Game attributes recorded in the header, where the game has them
+ATTRIBUTES = ('rows', 'cols', 'window', 'hashed', 'symmetry', 'history', 'transpose')
+
+
+def describe(game):
+    """Returns header fields that identify the state keys of game."""
+    header = {'game': type(game).__name__, 'abstraction': ABSTRACTION}
+    for attr in ATTRIBUTES:
+        if hasattr(game, attr):
+            header[attr] = getattr(game, attr)
+    if getattr(game, 'hashed', False):
+        header['zobrist_seed'] = game.zobrist_seed
+    return header
+
+
+def save_binary(qtable, path, game, dtype=np.float32, extra=None):
+    """Write qtable of game to path as sorted keys and values, with extra header fields."""
+    # Read through items, which unlike lookups do not count as uses of a bounded table
+    items = list(qtable.items())
+    keys = [key for key, value in items]
+    values = np.array([value for key, value in items], dtype=dtype)
+    if keys and not isinstance(keys[0], numbers.Integral):
+        keys = np.array(keys, dtype=np.string_)
+    else:
+        keys = np.array(keys, dtype=np.uint64)
+    order = np.argsort(keys, kind='mergesort')
+    keys = keys[order]
+    values = values[order]
+    header = describe(game)
+    header.update(extra or {})
+    header.update({'count': len(keys), 'keys': keys.dtype.str, 'values': values.dtype.str})
+    blob = json.dumps(header, sort_keys=True).encode('utf-8')
+    with open(path, 'wb') as out:
+        out.write(MAGIC)
+        out.write(struct.pack('<I', len(blob)))
+        out.write(blob)
+        out.write(b'\x00' * (-(len(MAGIC) + 4 + len(blob)) % ALIGN))
+        out.write(keys.tobytes())
+        out.write(values.tobytes())
+
+
+def read_header(path):
+    """Returns header of binary Q-table file and offset of its keys."""
+    with open(path, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError('{} is not a binary Q-table file.'.format(path))
+        length = struct.unpack('<I', f.read(4))[0]
+        header = json.loads(f.read(length).decode('utf-8'))
+    offset = len(MAGIC) + 4 + length
+    return header, offset + (-offset % ALIGN)
+
+
+class MappedQTable(object):
+    """Read-mostly Q-table over a memory-mapped binary file.
+
+    Lookups binary search the sorted keys. Writes, like the 0.0 Agent.qvalue
+    stores for unseen states, go to an in-memory overlay and never touch the file.
+    """
+
+    def __init__(self, path, game=None):
+        """Open binary Q-table file, checking it holds states of game if given."""
+        self.path = path
+        self.header, offset = read_header(path)
+        if game is not None:
+            for field, value in describe(game).items():
+                if self.header.get(field) != value:
+                    raise ValueError('{} has {} {}, game has {}.'.format(path, field, self.header.get(field), value))
+        self.count = self.header['count']
+        key_dtype = np.dtype(str(self.header['keys']))
+        value_dtype = np.dtype(str(self.header['values']))
+        self.strings = key_dtype.kind == 'S'
+        if self.count:
+            self.base_keys = np.memmap(path, dtype=key_dtype, mode='r', offset=offset, shape=(self.count,))
+            self.base_values = np.memmap(path, dtype=value_dtype, mode='r',
+                                         offset=offset + (self.count * key_dtype.itemsize), shape=(self.count,))
+        else:
+            self.base_keys = np.zeros(0, dtype=key_dtype)
+            self.base_values = np.zeros(0, dtype=value_dtype)
+        self.overlay = {}
+        self.added = 0
+
+    def find(self, key):
+        """Returns index of key in the file, or -1 if missing."""
+        if not self.strings:
+            key = np.uint64(key)
+        i = np.searchsorted(self.base_keys, key)
+        if i < self.count and self.base_keys[i] == key:
+            return i
+        return -1
+
+    def get_many(self, keys, default=0.0):
+        """Returns float64 array of the values of keys, default where missing."""
+        if self.strings:
+            keys = np.array(keys, dtype=np.string_)
+        else:
+            keys = np.asarray(keys, dtype=np.uint64)
+        values = np.full(len(keys), default, dtype=np.float64)
+        if self.count:
+            found = np.minimum(np.searchsorted(self.base_keys, keys), self.count - 1)
+            hit = self.base_keys[found] == keys
+            values[hit] = self.base_values[found[hit]]
+        if self.overlay:
+            for i, key in enumerate(keys.tolist()):
+                if key in self.overlay:
+                    values[i] = self.overlay[key]
+        return values
+
+    def __contains__(self, key):
+        """Returns whether key has a value."""
+        return key in self.overlay or self.find(key) >= 0
+
+    def __getitem__(self, key):
+        """Returns value of key."""
+        if key in self.overlay:
+            return self.overlay[key]
+        i = self.find(key)
+        if i < 0:
+            raise KeyError(key)
+        return float(self.base_values[i])
+
+    def __setitem__(self, key, value):
+        """Set value of key in the overlay."""
+        if key not in self.overlay and self.find(key) < 0:
+            self.added += 1
+        self.overlay[key] = value
+
+    def __len__(self):
+        """Returns number of keys."""
+        return self.count + self.added
+
+    def __iter__(self):
+        """Iterate over keys."""
+        return iter(self.keys())
+
+    def __sizeof__(self):
+        """Returns bytes of the overlay, the mapped file is shared page cache."""
+        return object.__sizeof__(self) + self.overlay.__sizeof__()
+
+    def get(self, key, default=None):
+        """Returns value of key, or default if missing."""
+        return self[key] if key in self else default
+
+    def keys(self):
+        """Returns list of keys."""
+        keys = self.base_keys.tolist()
+        return keys + [key for key in self.overlay if self.find(key) < 0]
+
+    def values(self):
+        """Returns list of values."""
+        return [value for key, value in self.items()]
+
+    def items(self):
+        """Returns list of (key, value) pairs."""
+        items = list(zip(self.base_keys.tolist(), self.base_values.tolist()))
+        if self.overlay:
+            items = [(key, self.overlay.get(key, value)) for key, value in items]
+            items += [(key, value) for key, value in self.overlay.items() if self.find(key) < 0]
+        return items
+
+
+def json_to_binary(json_path, path, game):
+    """Convert json Q-table of game to a binary Q-table file.
+
+    Json keys are always Strings, so keys of hashed games are converted back to integers.
+    """
+    with open(json_path) as f:
+        qtable = json.load(f)
+    if getattr(game, 'hashed', False):
+        qtable = dict((int(state), value) for state, value in qtable.items())
+    save_binary(qtable, path, game)
+
+
+def binary_to_json(path, json_path):
+    """Convert binary Q-table file to a json Q-table."""
+    qtable = MappedQTable(path)
+    with open(json_path, 'w') as out:
+        json.dump(dict(qtable.items()), out)
+
+
+def open_binary(json_path, game):
+    """Returns MappedQTable of the binary file next to json_path, converting the json if newer."""
+    path = os.path.splitext(json_path)[0] + '.bin'
+    if not os.path.exists(path) or os.path.getmtime(path) < os.path.getmtime(json_path):
+        json_to_binary(json_path, path, game)
+    return MappedQTable(path, game=game)
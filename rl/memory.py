@@ -0,0 +1,62 @@
+"""Q-table memory accounting."""
+
+
+import sys
+
+
+class MemoryMeter(object):
+    """Tracks bytes of a Q-table as states are inserted.
+
+    A dict costs its hash array plus every key and value object. The key and
+    value bytes are summed once when the meter starts and then incrementally
+    by insert, so measuring is O(1). Tables with their own accounting, like
+    QTable or BoundedQTable, report it through sys.getsizeof.
+
+    On the first and every interval episodes record appends a sample of
+    (episode, bytes, counted), where counted is the bytes of a full count of
+    every entry, sampled every check_every records to cross-check the
+    incremental bytes, otherwise None.
+    """
+
+    def __init__(self, interval=1, check_every=None):
+        """Initialize meter recording every interval episodes, cross-checking every check_every samples."""
+        self.interval = interval
+        self.check_every = check_every
+        self.entry_bytes = 0
+        self.samples = []
+
+    def entry_size(self, key, value=0.0):
+        """Returns bytes of the key and value objects of one entry."""
+        return sys.getsizeof(key) + sys.getsizeof(value)
+
+    def start(self, qtable):
+        """Sum bytes of the entries already in qtable."""
+        self.entry_bytes = self.count_entries(qtable)
+
+    def count_entries(self, qtable):
+        """Returns bytes of the key and value objects of every entry of a dict, 0 for other tables."""
+        if type(qtable) is not dict:
+            return 0
+        return sum(self.entry_size(key, value) for key, value in qtable.items())
+
+    def insert(self, key):
+        """Count bytes of a new entry of key."""
+        self.entry_bytes += self.entry_size(key)
+
+    def measure(self, qtable):
+        """Returns bytes of qtable."""
+        if type(qtable) is dict:
+            return sys.getsizeof(qtable) + self.entry_bytes
+        return sys.getsizeof(qtable)
+
+    def record(self, episode, qtable):
+        """Record sample of qtable bytes if episode is on the interval.
+
+        Returns bytes of the last sample.
+        """
+        if episode % self.interval == 0 or not self.samples:
+            counted = None
+            if self.check_every and len(self.samples) % self.check_every == 0:
+                counted = sys.getsizeof(qtable) + self.count_entries(qtable)
+            self.samples.append((episode, self.measure(qtable), counted))
+        return self.samples[-1][1]
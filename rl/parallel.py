@@ -0,0 +1,130 @@
+"""Multiprocess actor/learner self-play.
+
+Actor processes play e-greedy episodes on their own copy of the agent and
+send the transitions of every episode to the learner. The learner, the
+calling process, applies the updates to the agent table and every sync
+episodes broadcasts the values changed since the last broadcast, which
+actors apply between episodes.
+
+Actors are forked with a copy of the agent, game and table, so no pickling
+of games is needed.
+"""
+
+
+import multiprocessing
+import numpy as np
+
+try:
+    from Queue import Empty
+except ImportError:
+    from queue import Empty
+
+
+def act(agent, episodes, seed, transitions, refreshes):
+    """Play episodes with a copy of agent, sending a list of transitions per episode.
+
+    Each transition is (state, reward, next states, whether the agent picks the next move).
+    """
+    np.random.seed(seed)
+    agent.dirty = None
+    agent.meter = None
+    game = agent.game
+    for i in range(episodes):
+        # Apply refreshed values from the learner
+        while True:
+            try:
+                refreshed = refreshes.get_nowait()
+            except Empty:
+                break
+            for state, value in refreshed.items():
+                agent.qtable[state] = value
+        steps = []
+        states, actions = game.get_open_moves()
+        winner = None
+        while not winner:
+            if np.random.random_sample() < agent.epsilon:
+                # Explore
+                j = np.random.randint(0, len(actions))
+            else:
+                j = agent.optimal_next(states)
+            state = states[j]
+            winner = game.make_move(actions[j])
+            if winner:
+                states = []
+            else:
+                states, actions = game.get_open_moves()
+            steps.append((state, agent.reward(winner), states, game.player == agent.player))
+        game.reset()
+        transitions.put(steps)
+
+
+def receive(transitions, actors, timeout=1.0):
+    """Returns transitions of the next episode, checking actors every timeout seconds of waiting.
+
+    Raises RuntimeError if an actor failed, or every actor exited, before the episode was sent.
+    """
+    while True:
+        try:
+            return transitions.get(timeout=timeout)
+        except Empty:
+            for actor in actors:
+                if actor.exitcode not in (None, 0):
+                    raise RuntimeError('Actor {} failed with exit code {}.'.format(actor.name, actor.exitcode))
+            if not any(actor.is_alive() for actor in actors):
+                raise RuntimeError('Actors exited before sending every episode.')
+
+
+def train_parallel(agent, episodes, workers, history, checkpoint=None, start=0, sync=100, timeout=1.0):
+    """Trains agent with workers actor processes, returning history as Agent.train.
+
+    Raises RuntimeError if an actor dies, see receive.
+    """
+    remaining = episodes - start
+    shares = [(remaining // workers) + (1 if k < remaining % workers else 0) for k in range(workers)]
+    transitions = multiprocessing.Queue(maxsize=64 * workers)
+    refreshes = [multiprocessing.Queue() for k in range(workers)]
+    seeds = np.random.randint(0, 2 ** 31 - 1, size=workers)
+    actors = [multiprocessing.Process(target=act, args=(agent, shares[k], seeds[k], transitions, refreshes[k]))
+              for k in range(workers) if shares[k]]
+    for actor in actors:
+        actor.daemon = True
+        actor.start()
+
+    x = range(start, episodes)
+    cumulative_reward = []
+    memory = []
+    changed = set()
+    total_reward = 0.0
+    try:
+        for i in range(start, episodes):
+            episode_reward = 0.0
+            for state, reward, states, maximize in receive(transitions, actors, timeout):
+                changed.add(agent.learn(state, reward, states, maximize))
+                episode_reward += reward
+            total_reward += episode_reward
+            cumulative_reward.append(total_reward)
+            memory.append(agent.memory(i + 1))
+            # Record total reward agent gains as training progresses
+            if (i % (episodes / 10) == 0) and (i >= (episodes / 10)):
+                print('.')
+            if checkpoint is not None and (i + 1) % checkpoint.interval == 0:
+                checkpoint.record(agent, i + 1)
+            if (i + 1 - start) % sync == 0:
+                refreshed = dict((state, agent.qtable.get(state)) for state in changed
+                                 if agent.qtable.get(state) is not None)
+                changed.clear()
+                for queue in refreshes:
+                    queue.put(refreshed)
+    finally:
+        for queue in refreshes:
+            # Finished actors never read their last refreshes
+            queue.cancel_join_thread()
+        for actor in actors:
+            actor.join(1)
+            if actor.is_alive():
+                actor.terminate()
+    history.append(x)
+    history.append(cumulative_reward)
+    history.append(memory)
+    history.append(agent.memory_samples())
+    return history
@@ -0,0 +1,139 @@
+"""Profiling of runs with hotspot reports.
+
+Runs are profiled either deterministically with cProfile, saved as a
+.pstats file, or by sampling the stack every interval seconds of CPU time
+with SIGPROF, saved as folded stacks ("frame;frame;frame count" lines) for
+flamegraph tools. Both print hotspots, the functions of the game package
+and rl/agent.py ranked by self time, with functions of the same file and
+name collapsed into one row.
+"""
+
+
+import cProfile
+import os
+import pstats
+import signal
+import sys
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PREFIXES = ('game/', 'rl/agent.py')
+
+
+def relative(filename):
+    """Returns filename relative to the repository root, unchanged if outside it."""
+    path = os.path.abspath(filename)
+    if path.startswith(ROOT + os.sep):
+        return os.path.relpath(path, ROOT).replace(os.sep, '/')
+    return filename
+
+
+def label(code):
+    """Returns 'file:function' label of a code object."""
+    return '{}:{}'.format(relative(code.co_filename), code.co_name)
+
+
+def stats_hotspots(stats, prefixes=PREFIXES):
+    """Returns list of (function, calls, self seconds, total seconds) of pstats.Stats, slowest first."""
+    rows = {}
+    for (filename, lineno, name), (primitive, calls, self_time, total, callers) in stats.stats.items():
+        path = relative(filename)
+        if not path.startswith(prefixes):
+            continue
+        key = '{}:{}'.format(path, name)
+        row = rows.get(key, (0, 0.0, 0.0))
+        rows[key] = (row[0] + calls, row[1] + self_time, row[2] + total)
+    return sorted([(key,) + row for key, row in rows.items()], key=lambda row: -row[2])
+
+
+def print_hotspots(rows, limit=20, out=sys.stdout):
+    """Print hotspot rows ranked by self time, calls blank when unknown."""
+    out.write('{:>10} {:>10} {:>10}  {}\n'.format('calls', 'self (s)', 'total (s)', 'function'))
+    for function, calls, self_time, total in rows[:limit]:
+        out.write('{:>10} {:>10.3f} {:>10.3f}  {}\n'.format('' if calls is None else calls, self_time, total,
+                                                             function))
+
+
+class SamplingProfiler(object):
+    """Samples the Python stack every interval seconds of CPU time."""
+
+    def __init__(self, interval=1e-3):
+        """Initialize profiler with no samples."""
+        self.interval = interval
+        self.stacks = {}
+        self.previous = None
+
+    def sample(self, signum, frame):
+        """Count folded stack of the interrupted frame."""
+        stack = []
+        while frame is not None:
+            stack.append(label(frame.f_code))
+            frame = frame.f_back
+        key = ';'.join(reversed(stack))
+        self.stacks[key] = self.stacks.get(key, 0) + 1
+
+    def start(self):
+        """Start sampling."""
+        self.previous = signal.signal(signal.SIGPROF, self.sample)
+        # Restart system calls interrupted by samples, such as queue reads
+        signal.siginterrupt(signal.SIGPROF, False)
+        signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+
+    def stop(self):
+        """Stop sampling."""
+        signal.setitimer(signal.ITIMER_PROF, 0, 0)
+        signal.signal(signal.SIGPROF, self.previous)
+
+    def runcall(self, function, *args, **kwargs):
+        """Returns result of function called while sampling."""
+        self.start()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            self.stop()
+
+    def hotspots(self, prefixes=PREFIXES):
+        """Returns list of (function, None, self seconds, total seconds) estimated from samples, slowest first.
+
+        Self time of a sample goes to its innermost function matching prefixes,
+        total time to every distinct matching function on the stack.
+        """
+        rows = {}
+        for stack, count in self.stacks.items():
+            frames = [frame for frame in stack.split(';') if frame.startswith(prefixes)]
+            for i, frame in enumerate(frames):
+                row = rows.get(frame, [0, 0])
+                if i == len(frames) - 1:
+                    row[0] += count
+                if frame not in frames[i + 1:]:
+                    row[1] += count
+                rows[frame] = row
+        return sorted([(frame, None, own * self.interval, total * self.interval)
+                       for frame, (own, total) in rows.items()], key=lambda row: -row[2])
+
+    def save_folded(self, path):
+        """Write folded stacks with their sample counts."""
+        with open(path, 'w') as out:
+            for stack, count in sorted(self.stacks.items()):
+                out.write('{} {}\n'.format(stack, count))
+
+
+def profile(function, prefix, sampling=False, interval=1e-3, limit=20, out=sys.stdout):
+    """Returns result of function profiled, printing its hotspots.
+
+    cProfile stats are saved to prefix.pstats, or with sampling, folded
+    stacks sampled every interval seconds to prefix.folded.
+    """
+    if sampling:
+        profiler = SamplingProfiler(interval)
+        try:
+            return profiler.runcall(function)
+        finally:
+            profiler.save_folded(prefix + '.folded')
+            print_hotspots(profiler.hotspots(), limit, out)
+    profiler = cProfile.Profile()
+    try:
+        return profiler.runcall(function)
+    finally:
+        profiler.dump_stats(prefix + '.pstats')
+        print_hotspots(stats_hotspots(pstats.Stats(prefix + '.pstats')), limit, out)
@@ -0,0 +1,275 @@
+"""Array-backed Q-table."""
+
+
+import numbers
+import numpy as np
+
+
+MASK64 = (1 << 64) - 1
+# Fibonacci hashing multiplier, spreading packed states over the whole index
+GOLDEN = 0x9E3779B97F4A7C15
+# Batches smaller than this are probed key by key
+SMALL = 32
+
+
+class QTable(object):
+    """Q-table with open addressing over NumPy arrays.
+
+    States are integers of up to 64 bits or Strings, fixed by the first state
+    stored. Slots are kept in parallel arrays of
+    - hashes, the integer states, or the Python hash of String states
+    - names, the String states themselves, None for integer states
+    - qvalues, contiguous float32 or float64 Q-values
+    - filled, flags of used slots
+    Lookups probe linearly from a Fibonacci hash of the state, and the table
+    doubles once more than max_load of the slots are filled.
+
+    QTable has the mapping interface Agent uses on a dict, plus get_many and
+    update_many to read and write a whole batch of states at once. Per-key
+    access goes through NumPy scalars and is 20-30x slower than a dict, so
+    hot paths should batch through get_many and update_many. The memory
+    saving is for integer states; String states still keep a copy of every
+    String in names, saving far less than integer hashes of the same states.
+    """
+
+    def __init__(self, items=None, capacity=1024, dtype=np.float32, max_load=0.75):
+        """Initialize empty table of at least capacity slots, then add items."""
+        self.dtype = dtype
+        self.max_load = max_load
+        self.strings = None
+        self.names = None
+        self.count = 0
+        size = 1
+        while size < capacity:
+            size *= 2
+        self.allocate(size)
+        if items:
+            self.update(items)
+
+    def allocate(self, capacity):
+        """Replace slots with capacity empty slots."""
+        self.capacity = capacity
+        self.shift = 64 - (capacity.bit_length() - 1)
+        self.hashes = np.zeros(capacity, dtype=np.uint64)
+        self.qvalues = np.zeros(capacity, dtype=self.dtype)
+        self.filled = np.zeros(capacity, dtype=bool)
+        if self.names is not None:
+            self.names = np.zeros(capacity, dtype=self.names.dtype)
+
+    def encode(self, keys):
+        """Returns uint64 hashes and String names array, None for integer states, of keys."""
+        if self.strings is None and len(keys):
+            self.strings = not isinstance(keys[0], numbers.Integral)
+        if not self.strings:
+            return np.asarray(keys, dtype=np.uint64), None
+        names = np.asarray(keys)
+        if self.names is None:
+            self.names = np.zeros(self.capacity, dtype=names.dtype)
+        elif names.dtype.itemsize > self.names.dtype.itemsize:
+            # Widen slots for longer states
+            self.names = self.names.astype(names.dtype)
+        return np.array([hash(key) & MASK64 for key in keys], dtype=np.uint64), names
+
+    def start(self, hashes):
+        """Returns first probed slot of every hash."""
+        mixed = hashes * np.uint64(GOLDEN)
+        return (mixed >> np.uint64(self.shift)).astype(np.int64)
+
+    def find(self, key):
+        """Returns slot of key and whether it is filled by key, or the empty slot ending its probe."""
+        if self.strings is None:
+            self.strings = not isinstance(key, numbers.Integral)
+        if self.strings:
+            h = hash(key) & MASK64
+            if self.names is None:
+                self.encode([key])
+        else:
+            h = int(key)
+        slot = ((h * GOLDEN) & MASK64) >> self.shift
+        while self.filled[slot]:
+            if int(self.hashes[slot]) == h and (not self.strings or self.names[slot] == key):
+                return slot, True
+            slot = (slot + 1) & (self.capacity - 1)
+        return slot, False
+
+    def find_many(self, hashes, names):
+        """Returns slot of every key, -1 where missing."""
+        found = np.full(len(hashes), -1, dtype=np.int64)
+        slots = self.start(hashes)
+        pending = np.arange(len(hashes))
+        while pending.size:
+            s = slots[pending]
+            filled = self.filled[s]
+            match = filled & (self.hashes[s] == hashes[pending])
+            if names is not None:
+                match &= self.names[s] == names[pending]
+            found[pending[match]] = s[match]
+            keep = filled & ~match
+            pending = pending[keep]
+            slots[pending] = (s[keep] + 1) & (self.capacity - 1)
+        return found
+
+    def insert_many(self, hashes, names, values):
+        """Insert keys, which must be distinct and missing, without growing."""
+        slots = self.start(hashes)
+        pending = np.arange(len(hashes))
+        while pending.size:
+            s = slots[pending]
+            free = ~self.filled[s]
+            # First key probing each free slot claims it
+            claimed, first = np.unique(s[free], return_index=True)
+            winners = pending[free][first]
+            self.filled[claimed] = True
+            self.hashes[claimed] = hashes[winners]
+            self.qvalues[claimed] = values[winners]
+            if names is not None:
+                self.names[claimed] = names[winners]
+            done = np.zeros(len(hashes), dtype=bool)
+            done[winners] = True
+            pending = pending[~done[pending]]
+            # Every other key moves on, its slot is now filled
+            slots[pending] = (slots[pending] + 1) & (self.capacity - 1)
+        self.count += len(hashes)
+
+    def reserve(self, count):
+        """Grow until count keys fit under the maximum load."""
+        capacity = self.capacity
+        while count > self.max_load * capacity:
+            capacity *= 2
+        if capacity != self.capacity:
+            slots = np.flatnonzero(self.filled)
+            hashes = self.hashes[slots]
+            values = self.qvalues[slots]
+            names = self.names[slots] if self.names is not None else None
+            self.allocate(capacity)
+            self.count = 0
+            self.insert_many(hashes, names, values)
+
+    def get_many(self, keys, default=0.0):
+        """Returns float64 array of the values of keys, default where missing."""
+        values = np.full(len(keys), default, dtype=np.float64)
+        if not len(keys) or not self.count:
+            return values
+        hashes, names = self.encode(keys)
+        found = self.find_many(hashes, names)
+        hit = found >= 0
+        values[hit] = self.qvalues[found[hit]]
+        return values
+
+    def setdefault_many(self, keys, default=0.0):
+        """Returns float64 array of the values of keys and mask of keys missing before the call, adding them as default.
+
+        Keys are read in one probe each, and only missing keys are probed
+        again to add them. Batches under SMALL keys probe key by key,
+        as NumPy call overhead outweighs vectorized probing for so few.
+        """
+        if len(keys) >= SMALL:
+            values = self.get_many(keys, default=np.nan)
+            missing = np.isnan(values)
+            if missing.any():
+                new = list(set(key for key, miss in zip(keys, missing.tolist()) if miss))
+                self.update_many(new, np.full(len(new), default))
+                values[missing] = default
+            return values, missing
+        values = np.full(len(keys), default, dtype=np.float64)
+        missing = np.zeros(len(keys), dtype=bool)
+        for i, key in enumerate(keys):
+            slot, found = self.find(key)
+            if found:
+                values[i] = self.qvalues[slot]
+            else:
+                missing[i] = True
+        for key in set(key for key, miss in zip(keys, missing.tolist()) if miss):
+            self[key] = default
+        return values, missing
+
+    def update_many(self, keys, values):
+        """Set values of keys, adding missing keys. Repeated keys keep their last value."""
+        if not len(keys):
+            return
+        hashes, names = self.encode(keys)
+        values = np.asarray(values, dtype=self.dtype)
+        # Last occurrence of every key
+        _, first = np.unique((hashes if names is None else names)[::-1], return_index=True)
+        last = len(hashes) - 1 - first
+        hashes = hashes[last]
+        names = names[last] if names is not None else None
+        values = values[last]
+        found = self.find_many(hashes, names)
+        hit = found >= 0
+        self.qvalues[found[hit]] = values[hit]
+        miss = ~hit
+        if miss.any():
+            self.reserve(self.count + miss.sum())
+            self.insert_many(hashes[miss], names[miss] if names is not None else None, values[miss])
+
+    def __contains__(self, key):
+        """Returns whether key has a value."""
+        return self.find(key)[1]
+
+    def __getitem__(self, key):
+        """Returns value of key."""
+        slot, found = self.find(key)
+        if not found:
+            raise KeyError(key)
+        return float(self.qvalues[slot])
+
+    def __setitem__(self, key, value):
+        """Set value of key."""
+        slot, found = self.find(key)
+        if not found:
+            if self.count + 1 > self.max_load * self.capacity:
+                self.reserve(self.count + 1)
+                slot, found = self.find(key)
+            if self.strings:
+                self.encode([key])
+                self.names[slot] = key
+                self.hashes[slot] = hash(key) & MASK64
+            else:
+                self.hashes[slot] = key
+            self.filled[slot] = True
+            self.count += 1
+        self.qvalues[slot] = value
+
+    def __len__(self):
+        """Returns number of keys."""
+        return self.count
+
+    def __iter__(self):
+        """Iterate over keys."""
+        return iter(self.keys())
+
+    def __sizeof__(self):
+        """Returns bytes held by the table arrays."""
+        size = object.__sizeof__(self) + self.hashes.nbytes + self.qvalues.nbytes + self.filled.nbytes
+        if self.names is not None:
+            size += self.names.nbytes
+        return size
+
+    def get(self, key, default=None):
+        """Returns value of key, or default if missing."""
+        slot, found = self.find(key)
+        return float(self.qvalues[slot]) if found else default
+
+    def keys(self):
+        """Returns list of keys."""
+        slots = np.flatnonzero(self.filled)
+        if self.strings:
+            return self.names[slots].tolist()
+        return self.hashes[slots].tolist()
+
+    def values(self):
+        """Returns list of values."""
+        return self.qvalues[np.flatnonzero(self.filled)].tolist()
+
+    def items(self):
+        """Returns list of (key, value) pairs."""
+        return list(zip(self.keys(), self.values()))
+
+    def update(self, items):
+        """Set values of a mapping or list of (key, value) pairs."""
+        if hasattr(items, 'items'):
+            items = list(items.items())
+        if items:
+            keys, values = zip(*items)
+            self.update_many(list(keys), list(values))
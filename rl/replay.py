@@ -0,0 +1,96 @@
+"""Experience replay ring buffer."""
+
+
+import numbers
+import numpy as np
+
+
+class ReplayBuffer(object):
+    """Fixed-capacity ring buffer of transitions in preallocated NumPy arrays.
+
+    Each transition is (canonical state, reward, canonical next states,
+    terminal) and whether the agent picks the next move. Next states are
+    padded to width columns. Once full, new transitions overwrite the oldest.
+    Integer states are kept in uint64 arrays, so targets are computed by
+    vectorized NumPy operations. String states need object arrays.
+    """
+
+    def __init__(self, width, capacity=10000, batch_size=512, dtype=np.uint64):
+        """Initialize empty buffer.
+
+        - width is the most next states of a position, e.g. the number of actions of the game
+        - batch_size is the number of transitions sampled per replay
+        - dtype is the dtype of state keys, object for String states
+        """
+        self.capacity = capacity
+        self.width = width
+        self.batch_size = batch_size
+        self.states = np.empty(capacity, dtype=dtype)
+        self.rewards = np.zeros(capacity)
+        self.successors = np.empty((capacity, width), dtype=dtype)
+        self.counts = np.zeros(capacity, dtype=np.int64)
+        self.terminal = np.zeros(capacity, dtype=bool)
+        self.maximize = np.zeros(capacity, dtype=bool)
+        self.position = 0
+        self.size = 0
+        self.pending = 0
+
+    @classmethod
+    def for_game(cls, game, capacity=10000, batch_size=512):
+        """Returns empty buffer sized for the states and actions of game.
+
+        Width is the number of actions of the current position, the most of
+        any later position of the supported games, where moves only ever
+        remove actions. dtype is uint64 for integer states, object for Strings.
+        """
+        states, actions = game.get_open_moves()
+        dtype = np.uint64 if isinstance(game.canonical(states[0]), numbers.Integral) else object
+        return cls(len(actions), capacity, batch_size, dtype)
+
+    def __len__(self):
+        """Returns number of stored transitions."""
+        return self.size
+
+    def add(self, state, reward, future_states, maximize):
+        """Store transition, overwriting the oldest once full.
+
+        - future_states are the canonical next states, empty if the game ended
+        - maximize is whether the agent picks the next move
+        """
+        if len(future_states) > self.width:
+            raise ValueError('Transition has {} next states, buffer width is {}.'.format(len(future_states),
+                                                                                         self.width))
+        i = self.position
+        self.states[i] = state
+        self.rewards[i] = reward
+        self.counts[i] = len(future_states)
+        self.successors[i, :len(future_states)] = future_states
+        self.terminal[i] = not future_states
+        self.maximize[i] = maximize
+        self.position = (i + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+        self.pending += 1
+
+    def sample(self, count=None):
+        """Returns array of count, default batch_size, indices drawn uniformly with replacement."""
+        self.pending = 0
+        return np.random.randint(0, self.size, size=count or self.batch_size)
+
+    def targets(self, indices, lookup, discount):
+        """Returns states, current values and update targets of the transitions at indices.
+
+        lookup is called once with the array of every state and valid next
+        state of the transitions and returns their Q-values. Future value is
+        the max or min over the next states, 0 if terminal.
+        """
+        states = self.states[indices]
+        valid = np.arange(self.width) < self.counts[indices][:, np.newaxis]
+        values = lookup(np.concatenate([states, self.successors[indices][valid]]))
+        current = values[:len(states)]
+        future = np.zeros(valid.shape)
+        future[valid] = values[len(states):]
+        best = np.where(self.maximize[indices],
+                        np.max(np.where(valid, future, -np.inf), axis=1),
+                        np.min(np.where(valid, future, np.inf), axis=1))
+        best[self.terminal[indices]] = 0.0
+        return states, current, self.rewards[indices] + (discount * best)
@@ -0,0 +1,143 @@
+"""Hogwild shared-memory Q-table.
+
+Python 2 has no multiprocessing.shared_memory, so values live in a
+multiprocessing.RawArray, which forked workers share without locks. The
+index from states to slots is fixed before forking, pre-sized from an
+enumeration of every reachable state (see enumerate_states), so workers
+never insert into shared memory and concurrent updates at worst lose one
+another, as in Hogwild.
+"""
+
+
+import ctypes
+import multiprocessing
+import sys
+import numpy as np
+
+from parallel import receive
+from solver.exact import ExactSolver
+
+
+def enumerate_states(game):
+    """Returns list of every canonical state reachable from the current position of game."""
+    return list(ExactSolver(game).solve().keys())
+
+
+class SharedQTable(object):
+    """Q-table with a fixed index and values in shared memory.
+
+    States missing from the index are kept in a local overflow dict of each
+    process, which is not shared, and counted in misses. train_hogwild adds
+    the misses of its workers to the misses of the table it forked from.
+    """
+
+    def __init__(self, states):
+        """Initialize shared values of 0.0 for every state."""
+        self.index = dict((state, i) for i, state in enumerate(states))
+        self.shared = multiprocessing.RawArray(ctypes.c_double, max(len(self.index), 1))
+        self.values_view = np.frombuffer(self.shared, dtype=np.float64)
+        self.overflow = {}
+        self.misses = 0
+
+    def __contains__(self, key):
+        """Returns whether key has a value."""
+        return key in self.index or key in self.overflow
+
+    def __getitem__(self, key):
+        """Returns value of key."""
+        i = self.index.get(key)
+        if i is None:
+            return self.overflow[key]
+        return self.shared[i]
+
+    def __setitem__(self, key, value):
+        """Set value of key, without locking."""
+        i = self.index.get(key)
+        if i is None:
+            if key not in self.overflow:
+                self.misses += 1
+            self.overflow[key] = value
+        else:
+            self.shared[i] = value
+
+    def __len__(self):
+        """Returns number of keys."""
+        return len(self.index) + len(self.overflow)
+
+    def __iter__(self):
+        """Iterate over keys."""
+        return iter(self.keys())
+
+    def __sizeof__(self):
+        """Returns bytes of the index, shared values and overflow."""
+        return (object.__sizeof__(self) + sys.getsizeof(self.index) + self.values_view.nbytes +
+                sys.getsizeof(self.overflow))
+
+    def get(self, key, default=None):
+        """Returns value of key, or default if missing."""
+        return self[key] if key in self else default
+
+    def keys(self):
+        """Returns list of keys."""
+        return list(self.index.keys()) + list(self.overflow.keys())
+
+    def values(self):
+        """Returns list of values."""
+        return [value for key, value in self.items()]
+
+    def items(self):
+        """Returns list of (key, value) pairs."""
+        values = self.values_view.tolist()
+        return [(key, values[i]) for key, i in self.index.items()] + list(self.overflow.items())
+
+
+def play(agent, episodes, seed, results):
+    """Train forked copy of agent on the shared table, sending back its episode rewards and misses."""
+    np.random.seed(seed)
+    agent.meter = None
+    misses = agent.qtable.misses
+    history = agent.train(episodes, history=[])
+    rewards = np.diff([0.0] + history[1]).tolist()
+    results.put((rewards, agent.qtable.misses - misses))
+
+
+def train_hogwild(agent, episodes, workers, history, timeout=1.0):
+    """Trains agent with workers processes updating its SharedQTable, returning history as Agent.train.
+
+    Cumulative reward joins the episodes of every worker in worker order.
+    Raises RuntimeError if a worker dies, see parallel.receive.
+    """
+    if episodes < 10 * workers:
+        raise ValueError('Hogwild training needs at least 10 episodes per worker.')
+    shares = [(episodes // workers) + (1 if k < episodes % workers else 0) for k in range(workers)]
+    seeds = np.random.randint(0, 2 ** 31 - 1, size=workers)
+    results = multiprocessing.Queue()
+    processes = [multiprocessing.Process(target=play, args=(agent, shares[k], seeds[k], results))
+                 for k in range(workers) if shares[k]]
+    for process in processes:
+        process.daemon = True
+        process.start()
+    rewards = []
+    try:
+        for process in processes:
+            worker_rewards, misses = receive(results, processes, timeout)
+            rewards.append(worker_rewards)
+            agent.qtable.misses += misses
+    finally:
+        for process in processes:
+            process.join(1)
+            if process.is_alive():
+                process.terminate()
+
+    cumulative_reward = []
+    total_reward = 0.0
+    for worker_rewards in rewards:
+        for reward in worker_rewards:
+            total_reward += reward
+            cumulative_reward.append(total_reward)
+    size = agent.memory(episodes)
+    history.append(range(episodes))
+    history.append(cumulative_reward)
+    history.append([size] * episodes)
+    history.append(agent.memory_samples())
+    return history
@@ -0,0 +1,159 @@
+"""Per-phase timing of training.
+
+PhaseTimer wraps the methods of one agent, its game and the NumPy RNG
+functions the agent draws from, counting calls and cumulative seconds of
+every phase
+- get_open_moves, get_actions and successor_key, move generation
+- make_move, including is_win
+- is_win
+- qvalue, Q lookups
+- update, Q updates including their future value lookups
+- rng, NumPy random_sample, randint and choice
+
+Times of nested phases are inclusive. Every interval episodes, counted by
+game resets, a sample of episodes and steps per second is recorded and an
+optional progress line printed. Methods are only wrapped between start and
+stop, so an agent trained without a timer runs unchanged code.
+"""
+
+
+import csv
+import json
+import sys
+import time
+import numpy as np
+
+
+GAME_PHASES = ('get_open_moves', 'get_actions', 'successor_key', 'make_move', 'is_win')
+AGENT_PHASES = ('qvalue', 'update')
+RNG_FUNCTIONS = ('random_sample', 'randint', 'choice')
+
+
+class PhaseTimer(object):
+    """Cumulative time and call counts of training phases."""
+
+    def __init__(self, interval=1000, progress=False, out=sys.stdout):
+        """Initialize timer sampling throughput every interval episodes, printing a progress line to out if progress."""
+        self.interval = interval
+        self.progress = progress
+        self.out = out
+        self.seconds = {}
+        self.calls = {}
+        self.samples = []
+        self.episodes = 0
+        self.wrapped = []
+        self.started = None
+        self.last = None
+
+    def phase(self, name, function):
+        """Returns function wrapped to count calls and time under phase name."""
+        self.seconds.setdefault(name, 0.0)
+        self.calls.setdefault(name, 0)
+        seconds = self.seconds
+        calls = self.calls
+        clock = time.time
+
+        def timed(*args, **kwargs):
+            begin = clock()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                seconds[name] += clock() - begin
+                calls[name] += 1
+        return timed
+
+    def wrap(self, owner, attribute, name):
+        """Replace owner.attribute with its timed version until stop."""
+        original = getattr(owner, attribute)
+        own = attribute in getattr(owner, '__dict__', {})
+        self.wrapped.append((owner, attribute, original, own))
+        setattr(owner, attribute, self.phase(name, original))
+
+    def start(self, agent):
+        """Wrap phases of agent and its game and start the clock."""
+        game = agent.game
+        for attribute in GAME_PHASES:
+            if hasattr(game, attribute):
+                self.wrap(game, attribute, attribute)
+        for attribute in AGENT_PHASES:
+            self.wrap(agent, attribute, attribute)
+        for attribute in RNG_FUNCTIONS:
+            self.wrap(np.random, attribute, 'rng')
+        reset = game.reset
+
+        def counted():
+            reset()
+            self.episode()
+        self.wrapped.append((game, 'reset', reset, 'reset' in game.__dict__))
+        game.reset = counted
+        self.started = time.time()
+        self.last = (self.started, 0, self.steps())
+
+    def stop(self):
+        """Restore wrapped methods."""
+        for owner, attribute, original, own in reversed(self.wrapped):
+            if own:
+                setattr(owner, attribute, original)
+            else:
+                # Drop the instance attribute to expose the class method again
+                delattr(owner, attribute)
+        self.wrapped = []
+        if self.progress:
+            self.out.write('\n')
+
+    def steps(self):
+        """Returns number of moves made."""
+        return self.calls.get('make_move', 0)
+
+    def episode(self):
+        """Count finished episode, sampling throughput every interval episodes."""
+        self.episodes += 1
+        if self.episodes % self.interval == 0:
+            self.sample()
+
+    def sample(self):
+        """Record sample of throughput since the last sample and the cumulative phases."""
+        now = time.time()
+        steps = self.steps()
+        since, episodes, previous_steps = self.last
+        elapsed = max(now - since, 1e-9)
+        sample = {'episode': self.episodes,
+                  'seconds': now - self.started,
+                  'episodes_per_second': (self.episodes - episodes) / elapsed,
+                  'steps_per_second': (steps - previous_steps) / elapsed}
+        for name in sorted(self.seconds):
+            sample[name + '_seconds'] = self.seconds[name]
+            sample[name + '_calls'] = self.calls[name]
+        self.samples.append(sample)
+        self.last = (now, self.episodes, steps)
+        if self.progress:
+            self.out.write('\r' + self.line(sample))
+            self.out.flush()
+
+    def line(self, sample):
+        """Returns progress line of a sample with the three slowest phases."""
+        top = sorted(self.seconds, key=lambda name: -self.seconds[name])[:3]
+        total = max(sample['seconds'], 1e-9)
+        phases = ' '.join('{} {:.0%}'.format(name, self.seconds[name] / total) for name in top)
+        return 'Episode {} | {:.0f} episodes/s {:.0f} steps/s | {}'.format(sample['episode'],
+                                                                          sample['episodes_per_second'],
+                                                                          sample['steps_per_second'],
+                                                                          phases)
+
+    def summary(self):
+        """Returns dict of phase name to (calls, seconds)."""
+        return dict((name, (self.calls[name], self.seconds[name])) for name in self.seconds)
+
+    def save_json(self, path):
+        """Write phases and samples as JSON."""
+        with open(path, 'w') as out:
+            json.dump({'phases': self.summary(), 'samples': self.samples}, out, indent=2)
+
+    def save_csv(self, path):
+        """Write samples as CSV, one row per sample."""
+        fields = ['episode', 'seconds', 'episodes_per_second', 'steps_per_second']
+        fields += sorted(set(key for sample in self.samples for key in sample) - set(fields))
+        with open(path, 'w') as out:
+            writer = csv.DictWriter(out, fieldnames=fields)
+            writer.writeheader()
+            writer.writerows(self.samples)
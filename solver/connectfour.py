@@ -0,0 +1,210 @@
+"""Alpha-beta Connect Four solver."""
+
+
+import time
+
+
+class SearchTimeout(Exception):
+    """Raised inside search when the time or node budget runs out."""
+
+
+# Transposition table entry flags
+EXACT = 0
+LOWER = 1
+UPPER = 2
+
+
+class ConnectFourSolver(object):
+    """Negamax alpha-beta Connect Four solver, used as an opponent for the agent.
+
+    Positions are two bitboards in the layout of BitboardConnectFour: the
+    tokens of the player to move and the mask of all tokens. Search uses
+    - Center-first move ordering, trying the transposition table move first
+    - Iterative deepening up to depth, stopping early at a forced result
+    - A bounded transposition table keyed by position + mask
+    - An optional time and node budget per move
+
+    Scores are from the player to move: WIN less the tokens played for a win,
+    and at the depth limit the difference in open cells completing a four.
+    """
+
+    WIN = 1000
+    INFINITY = 1000000
+
+    def __init__(self, rows=6, cols=7, depth=6, time_limit=None, node_limit=None, table_size=1 << 20):
+        """Initialize solver for a board size.
+
+        - depth is the maximum number of plies searched per move
+        - time_limit is the seconds allowed per move, None for no limit
+        - node_limit is the nodes allowed per move, None for no limit
+        - table_size is the number of transposition table slots
+        """
+        self.rows = rows
+        self.cols = cols
+        self.depth = depth
+        self.time_limit = time_limit
+        self.node_limit = node_limit
+        self.height = rows + 1
+        self.bottom_mask = 0
+        for col in range(cols):
+            self.bottom_mask |= 1 << (col * self.height)
+        self.board_mask = self.bottom_mask * ((1 << rows) - 1)
+        self.column_masks = [((1 << rows) - 1) << (col * self.height) for col in range(cols)]
+        # Center columns first
+        self.order = sorted(range(cols), key=lambda col: abs((2 * col) - (cols - 1)))
+        self.table = [None] * table_size
+        self.nodes = 0
+        self.probes = 0
+        self.hits = 0
+        self.seconds = 0.0
+
+    def load(self, game):
+        """Returns tokens of player to move, mask of all tokens and token count of game board."""
+        position = 0
+        mask = 0
+        moves = 0
+        for i, val in enumerate(game.board):
+            if val != '-':
+                height = self.rows - 1 - (i // self.cols)
+                bit = 1 << ((i % self.cols) * self.height + height)
+                mask |= bit
+                moves += 1
+                if val == game.player:
+                    position |= bit
+        return position, mask, moves
+
+    def winning_cells(self, position, mask):
+        """Returns empty cells that would complete a four for position."""
+        # Vertical
+        cells = (position << 1) & (position << 2) & (position << 3)
+        # Horizontal and both diagonals
+        for shift in (self.height, self.height - 1, self.height + 1):
+            pair = (position << shift) & (position << (2 * shift))
+            cells |= pair & (position << (3 * shift))
+            cells |= pair & (position >> shift)
+            pair = (position >> shift) & (position >> (2 * shift))
+            cells |= pair & (position << shift)
+            cells |= pair & (position >> (3 * shift))
+        return cells & (self.board_mask ^ mask)
+
+    def evaluate(self, position, mask):
+        """Returns heuristic score of position for player to move."""
+        mine = bin(self.winning_cells(position, mask)).count('1')
+        theirs = bin(self.winning_cells(position ^ mask, mask)).count('1')
+        return mine - theirs
+
+    def negamax(self, position, mask, moves, depth, alpha, beta):
+        """Returns score of position for player to move searched to depth."""
+        self.nodes += 1
+        if self.node_budget is not None and self.nodes >= self.node_budget:
+            raise SearchTimeout()
+        if self.deadline is not None and (self.nodes & 1023) == 0 and time.time() > self.deadline:
+            raise SearchTimeout()
+        possible = (mask + self.bottom_mask) & self.board_mask
+        if self.winning_cells(position, mask) & possible:
+            return self.WIN - (moves + 1)
+        if not possible:
+            # Draw
+            return 0
+        if depth == 0:
+            return self.evaluate(position, mask)
+
+        key = position + mask
+        slot = key % len(self.table)
+        entry = self.table[slot]
+        self.probes += 1
+        first = None
+        if entry is not None and entry[0] == key:
+            self.hits += 1
+            _, entry_depth, flag, value, first = entry
+            if entry_depth >= depth:
+                if flag == EXACT:
+                    return value
+                elif flag == LOWER:
+                    alpha = max(alpha, value)
+                else:
+                    beta = min(beta, value)
+                if alpha >= beta:
+                    return value
+
+        start_alpha = alpha
+        best = -self.INFINITY
+        best_col = None
+        opponent = position ^ mask
+        order = self.order if first is None else [first] + [col for col in self.order if col != first]
+        for col in order:
+            move = possible & self.column_masks[col]
+            if not move:
+                continue
+            score = -self.negamax(opponent, mask | move, moves + 1, depth - 1, -beta, -alpha)
+            if score > best:
+                best = score
+                best_col = col
+            if score > alpha:
+                alpha = score
+            if alpha >= beta:
+                break
+
+        if best <= start_alpha:
+            flag = UPPER
+        elif best >= beta:
+            flag = LOWER
+        else:
+            flag = EXACT
+        self.table[slot] = (key, depth, flag, best, best_col)
+        return best
+
+    def search(self, position, mask, moves, depth):
+        """Returns best score and column of position for player to move searched to depth."""
+        possible = (mask + self.bottom_mask) & self.board_mask
+        best = -self.INFINITY
+        best_col = None
+        for col in self.order:
+            move = possible & self.column_masks[col]
+            if not move:
+                continue
+            if self.winning_cells(position, mask) & move:
+                return self.WIN - (moves + 1), col
+            score = -self.negamax(position ^ mask, mask | move, moves + 1, depth - 1, -self.INFINITY, -best)
+            if best_col is None or score > best:
+                best = score
+                best_col = col
+        return best, best_col
+
+    def select_move(self, game):
+        """Returns best column for player to move in game, deepening until budget or depth runs out."""
+        position, mask, moves = self.load(game)
+        start = time.time()
+        self.deadline = start + self.time_limit if self.time_limit is not None else None
+        self.node_budget = self.nodes + self.node_limit if self.node_limit is not None else None
+        best_col = None
+        try:
+            for depth in range(1, self.depth + 1):
+                score, best_col = self.search(position, mask, moves, depth)
+                if abs(score) > self.WIN - (self.rows * self.cols) - 1:
+                    # Forced win or loss found
+                    break
+        except SearchTimeout:
+            pass
+        self.seconds += time.time() - start
+        if best_col is None:
+            # Budget ran out before depth 1 finished
+            possible = (mask + self.bottom_mask) & self.board_mask
+            best_col = [col for col in self.order if possible & self.column_masks[col]][0]
+        return best_col
+
+    def stats(self):
+        """Returns search statistics accumulated over every move."""
+        return {'nodes': self.nodes,
+                'seconds': self.seconds,
+                'nodes_per_second': self.nodes / self.seconds if self.seconds else 0.0,
+                'tt_probes': self.probes,
+                'tt_hits': self.hits,
+                'tt_hit_rate': (self.hits * 1.0) / self.probes if self.probes else 0.0}
+
+    def print_stats(self):
+        """Print search statistics."""
+        stats = self.stats()
+        print('    Nodes: {} Nodes/sec: {:.0f} TT hit rate: {:.3f}'.format(stats['nodes'],
+                                                                         stats['nodes_per_second'],
+                                                                         stats['tt_hit_rate']))
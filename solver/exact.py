@@ -0,0 +1,203 @@
+"""Exact memoized solvers for small games.
+
+Solvers produce the exact value of every reachable state in the key format of
+Agent.qtable, as the agent player sees it, and measure how often the greedy
+policy of a trained qtable picks a worse move than the solution.
+"""
+
+
+from game.chomp_young import YoungChomp
+
+
+class ExactSolver(object):
+    """Memoized minimax solver over the Game interface.
+
+    Values follow the fixed point of Agent.update: terminal states are worth
+    the reward of the winner, and other states are worth discount times the
+    best next value for the player to move. With discount=1.0 these are the
+    game-theoretic values 1.0, 0.0 and -1.0.
+
+    Every state is searched once, so this suits games with a few thousand
+    reachable states like TicTacToe or small Chomp boards.
+    """
+
+    def __init__(self, game, player='X', discount=1.0):
+        """Initialize solver of game from its current position."""
+        self.game = game
+        self.player = player
+        self.discount = discount
+        # Canonical state -> value
+        self.values = {}
+        # Canonical state (None for the start) -> (player to move, canonical next states)
+        self.positions = {}
+
+    def reward(self, winner):
+        """Returns reward of winner for the agent player."""
+        if winner == self.player:
+            return 1.0
+        elif winner == 'Draw':
+            return 0.0
+        return -1.0
+
+    def solve(self):
+        """Solves every position reachable from the game and returns the exact qtable."""
+        self.search(None)
+        return self.values
+
+    def search(self, key):
+        """Returns value of state key, which the game is in."""
+        states, actions = self.game.get_open_moves()
+        children = []
+        values = []
+        for state, action in zip(states, actions):
+            child = self.game.canonical(state)
+            if child not in self.values:
+                token = self.game.apply_move(action)
+                winner = self.game.is_win()
+                if winner:
+                    self.values[child] = self.reward(winner)
+                else:
+                    self.values[child] = self.search(child)
+                self.game.undo_move(token)
+            children.append(child)
+            values.append(self.values[child])
+        mover = self.game.player
+        self.positions[key] = (mover, children)
+        if mover == self.player:
+            return self.discount * max(values)
+        return self.discount * min(values)
+
+    def policy_error_rate(self, qtable):
+        """Returns fraction of solved positions where the greedy policy of qtable picks a worse move.
+
+        Missing states count as 0.0, as in Agent.qvalue, and ties count by the
+        fraction of tied moves that are worse.
+        """
+        errors = 0.0
+        for mover, children in self.positions.values():
+            exact = [self.values[child] for child in children]
+            learned = [qtable.get(child, 0.0) for child in children]
+            if mover == self.player:
+                best = max(exact)
+                target = max(learned)
+            else:
+                best = min(exact)
+                target = min(learned)
+            chosen = [e for e, v in zip(exact, learned) if v == target]
+            errors += sum([1.0 for e in chosen if e != best]) / len(chosen)
+        return errors / len(self.positions)
+
+
+class ChompSolver(object):
+    """Chomp solver over Young diagrams, for boards well beyond the reach of ExactSolver.
+
+    Chomp positions only depend on the remaining diagram, so the memo maps
+    column heights packed in base rows + 1 to whether the player to move
+    wins. States are emitted as YoungChomp keys, string or hashed, with values
+    1.0 and -1.0 as there is no Draw.
+    """
+
+    def __init__(self, game, player='X'):
+        """Initialize solver for the board size of a YoungChomp game without history."""
+        if not isinstance(game, YoungChomp) or game.history:
+            raise ValueError('ChompSolver needs YoungChomp without history, not {}.'.format(type(game).__name__))
+        self.game = game
+        self.player = player
+        self.rows = game.rows
+        self.cols = game.cols
+        self.wins = {}
+
+    def pack(self, heights):
+        """Returns heights packed in base rows + 1."""
+        packed = 0
+        for h in reversed(heights):
+            packed = (packed * (self.rows + 1)) + h
+        return packed
+
+    def unpack(self, packed):
+        """Returns heights of packed diagram."""
+        heights = []
+        for c in range(self.cols):
+            packed, h = divmod(packed, self.rows + 1)
+            heights.append(h)
+        return tuple(heights)
+
+    def children(self, heights):
+        """Returns diagrams after every move, in the order of YoungChomp.get_actions."""
+        children = []
+        for i in range(self.rows):
+            cap = self.rows - 1 - i
+            for j in range(self.cols):
+                if heights[j] <= cap:
+                    break
+                if cap == 0 and j == 0:
+                    # Poison
+                    continue
+                child = list(heights)
+                for c in range(j, self.cols):
+                    if child[c] <= cap:
+                        break
+                    child[c] = cap
+                children.append(tuple(child))
+        return children
+
+    def search(self, heights):
+        """Returns whether the player to move wins on heights."""
+        packed = self.pack(heights)
+        if packed not in self.wins:
+            # Search every child so every diagram is solved
+            results = [self.search(child) for child in self.children(heights)]
+            self.wins[packed] = not all(results)
+        return self.wins[packed]
+
+    def value(self, heights, moved):
+        """Returns value for the agent player of heights reached by a move of moved."""
+        if self.wins[self.pack(heights)]:
+            winner = 'O' if moved == 'X' else 'X'
+        else:
+            winner = moved
+        return 1.0 if winner == self.player else -1.0
+
+    def key(self, heights, moved):
+        """Returns YoungChomp state of heights reached by a move of moved."""
+        if self.game.hashed:
+            return self.game.get_hash(list(heights), moved)
+        return self.game.get_key(list(heights), moved)
+
+    def solve(self):
+        """Solves every diagram and returns the exact qtable."""
+        full = (self.rows,) * self.cols
+        self.search(full)
+        qtable = {}
+        for packed in self.wins:
+            heights = self.unpack(packed)
+            if heights != full:
+                for moved in ('X', 'O'):
+                    qtable[self.key(heights, moved)] = self.value(heights, moved)
+        return qtable
+
+    def policy_error_rate(self, qtable):
+        """Returns fraction of positions where the greedy policy of qtable picks a worse move.
+
+        Positions are every diagram solved by solve with either player to move,
+        scored as in ExactSolver.policy_error_rate.
+        """
+        errors = 0.0
+        count = 0
+        for packed in self.wins:
+            children = self.children(self.unpack(packed))
+            if not children:
+                continue
+            for mover in ('X', 'O'):
+                exact = [self.value(child, mover) for child in children]
+                learned = [qtable.get(self.key(child, mover), 0.0) for child in children]
+                if mover == self.player:
+                    best = max(exact)
+                    target = max(learned)
+                else:
+                    best = min(exact)
+                    target = min(learned)
+                chosen = [e for e, v in zip(exact, learned) if v == target]
+                errors += sum([1.0 for e in chosen if e != best]) / len(chosen)
+                count += 1
+        return errors / count
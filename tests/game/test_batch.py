@@ -0,0 +1,69 @@
+"""Test suite for batched board games.
+
+To run:
+    python -m unittest -v tests.game.test_batch.py
+
+"""
+
+
+import unittest
+import numpy as np
+from game.batch import BatchChomp, BatchConnectFour, BatchTicTacToe, VALUES, make_batch
+from game.chomp_young import YoungChomp
+from game.connectfour import ConnectFour
+from game.tictactoe import TicTacToe
+from game.tictactoe_bitmask import BitmaskTicTacToe
+
+
+class TestBatch(unittest.TestCase):
+    """Collection of unittests for batched board games."""
+
+    def check_matches(self, batch, make_game, steps=200):
+        """Play random moves on batch and check every board against its own game."""
+        rng = np.random.RandomState(0)
+        games = [make_game() for i in range(batch.n)]
+        for step in range(steps):
+            legal = batch.legal()
+            states = batch.candidate_states()
+            for i, game in enumerate(games):
+                expected_states, expected_actions = game.get_open_moves()
+                slots = np.flatnonzero(legal[i])
+                self.assertEqual(expected_actions, [batch.get_action(slot) for slot in slots])
+                self.assertEqual(expected_states, states[i, slots].tolist())
+            actions = np.argmax(legal * rng.random_sample(legal.shape), axis=1)
+            winners, done = batch.step(actions)
+            for i, game in enumerate(games):
+                winner = game.make_move(batch.get_action(actions[i]))
+                self.assertEqual(winner, VALUES.get(winners[i]))
+                self.assertEqual(bool(winner), done[i])
+                if winner:
+                    game.reset()
+
+    def test_tictactoe(self):
+        """Test batch of Tic Tac Toe boards matches BitmaskTicTacToe."""
+        self.check_matches(BatchTicTacToe(8), lambda: BitmaskTicTacToe(hashed=True))
+
+    def test_connectfour(self):
+        """Test batch of Connect Four boards matches ConnectFour for every window."""
+        for window in [1, 3, None]:
+            self.check_matches(BatchConnectFour(4, rows=4, cols=5, window=window),
+                               lambda: ConnectFour(rows=4, cols=5, window=window, hashed=True),
+                               steps=100)
+
+    def test_chomp(self):
+        """Test batch of Chomp boards matches YoungChomp."""
+        self.check_matches(BatchChomp(8, rows=4, cols=4), lambda: YoungChomp(rows=4, cols=4, hashed=True))
+        self.check_matches(BatchChomp(8, rows=3, cols=5), lambda: YoungChomp(rows=3, cols=5, hashed=True))
+
+    def test_make_batch(self):
+        """Test make_batch requires games with integer states."""
+        self.assertTrue(isinstance(make_batch(BitmaskTicTacToe(hashed=True), 2), BatchTicTacToe))
+        self.assertTrue(isinstance(make_batch(ConnectFour(hashed=True), 2), BatchConnectFour))
+        self.assertTrue(isinstance(make_batch(YoungChomp(hashed=True), 2), BatchChomp))
+        self.assertRaises(ValueError, make_batch, TicTacToe(hashed=True), 2)
+        self.assertRaises(ValueError, make_batch, ConnectFour(), 2)
+        self.assertRaises(ValueError, make_batch, YoungChomp(history=True, hashed=True), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
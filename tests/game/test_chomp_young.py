@@ -0,0 +1,147 @@
+"""Test suite for Young diagram Chomp.
+
+To run:
+    python -m unittest -v tests.game.test_chomp_young.py
+
+"""
+
+
+import copy
+import random
+import unittest
+from game.chomp import Chomp
+from game.chomp_young import YoungChomp, conjugate
+
+
+class TestYoungChomp(unittest.TestCase):
+    """Collection of unittests for Young diagram Chomp."""
+
+    def setUp(self):
+        """Initialize Young diagram Chomp game instance."""
+        self.game = YoungChomp(rows=3, cols=4)
+
+    def tearDown(self):
+        """Reinitialize Young diagram Chomp game instance."""
+        self.game = YoungChomp(rows=3, cols=4)
+
+    def test_init(self):
+        """Test __init__ method."""
+        self.assertEqual([3, 3, 3, 3], self.game.heights)
+        self.assertEqual([['-', '-', '-', '-'],
+                          ['-', '-', '-', '-'],
+                          ['P', '-', '-', '-']], self.game.board)
+        self.assertEqual('X', self.game.player)
+
+    def test_get_open_moves(self):
+        """Test get_open_moves method."""
+        self.game.make_move((1, 2))
+        states, actions = self.game.get_open_moves()
+        self.assertEqual([(0, 0), (0, 1), (1, 0), (1, 1), (2, 1), (2, 2), (2, 3)], actions)
+        self.assertEqual(['O2211', 'O3211', 'O1111', 'O3111',
+                          'O3000', 'O3300', 'O3310'], states)
+
+    def test_conjugate(self):
+        """Test conjugate of column heights is row lengths."""
+        self.assertEqual([4, 2, 1], conjugate([3, 2, 1, 1], 3))
+        self.assertEqual([2, 2, 0, 0], conjugate([2, 2, 0, 0], 4))
+
+    def test_transpose(self):
+        """Test transposed positions share a key on square boards."""
+        game = YoungChomp(rows=4, cols=4)
+        game.make_move((2, 1))
+        states, actions = game.get_open_moves()
+        key = states[actions.index((1, 0))]
+        game.reset()
+        game.make_move((2, 1))
+        # Transpose of chomping at row i, col j is row rows - 1 - j, col rows - 1 - i
+        self.assertEqual(key, game.get_open_moves()[0][actions.index((3, 2))])
+        self.assertFalse(YoungChomp(rows=4, cols=4, transpose=False).transpose)
+        self.assertFalse(YoungChomp(rows=3, cols=4).transpose)
+
+    def test_is_win(self):
+        """Test is_win method."""
+        self.assertEqual(None, self.game.is_win())
+        self.assertEqual(None, self.game.make_move((0, 1)))
+        self.assertEqual(None, self.game.make_move((1, 0)))
+        self.assertEqual('X', self.game.make_move((2, 1)))
+
+    def test_is_valid_move(self):
+        """Test is_valid_move method."""
+        self.game.make_move((1, 2))
+        self.assertFalse(self.game.is_valid_move((0, 2)))
+        self.assertFalse(self.game.is_valid_move((2, 0)))
+        self.assertFalse(self.game.is_valid_move((3, 0)))
+        self.assertTrue(self.game.is_valid_move((2, 2)))
+
+    def test_matches_chomp(self):
+        """Test random games match Chomp, with history keys equal to Chomp keys."""
+        rng = random.Random(0)
+        for rows, cols in [(3, 4), (4, 4), (5, 3)]:
+            reference = Chomp(rows=rows, cols=cols)
+            compact = YoungChomp(rows=rows, cols=cols)
+            history = YoungChomp(rows=rows, cols=cols, history=True)
+            for episode in range(50):
+                winner = None
+                while not winner:
+                    expected = reference.get_open_moves()
+                    self.assertEqual(expected, history.get_open_moves())
+                    self.assertEqual(expected[1], compact.get_open_moves()[1])
+                    action = rng.choice(expected[1])
+                    winner = reference.make_move(action)
+                    self.assertEqual(winner, history.make_move(action))
+                    self.assertEqual(winner, compact.make_move(action))
+                    self.assertEqual(reference.board, history.board)
+                reference.reset()
+                compact.reset()
+                history.reset()
+
+    def test_hashed(self):
+        """Test hashed states map one to one onto String states."""
+        rng = random.Random(0)
+        games = [(Chomp(rows=4, cols=4), Chomp(rows=4, cols=4, hashed=True)),
+                 (YoungChomp(rows=4, cols=4), YoungChomp(rows=4, cols=4, hashed=True)),
+                 (YoungChomp(rows=4, cols=5, history=True),
+                  YoungChomp(rows=4, cols=5, history=True, hashed=True))]
+        for game, hashed in games:
+            to_hash = {}
+            to_state = {}
+            for episode in range(50):
+                winner = None
+                while not winner:
+                    states, actions = game.get_open_moves()
+                    hashes, hashed_actions = hashed.get_open_moves()
+                    self.assertEqual(actions, hashed_actions)
+                    for state, h in zip(states, hashes):
+                        self.assertEqual(h, to_hash.setdefault(state, h))
+                        self.assertEqual(state, to_state.setdefault(h, state))
+                    action = rng.choice(actions)
+                    winner = game.make_move(action)
+                    self.assertEqual(winner, hashed.make_move(action))
+                game.reset()
+                hashed.reset()
+
+    def test_undo_move(self):
+        """Test undo_move restores board, player and states after every apply_move."""
+        rng = random.Random(0)
+        for game in [Chomp(rows=3, cols=4), Chomp(rows=3, cols=4, hashed=True), self.game,
+                     YoungChomp(rows=4, cols=4, hashed=True), YoungChomp(history=True),
+                     YoungChomp(history=True, hashed=True)]:
+            for episode in range(5):
+                winner = None
+                while not winner:
+                    board = copy.deepcopy(game.board)
+                    player = game.player
+                    moves = game.get_open_moves()
+                    for action in moves[1]:
+                        token = game.apply_move(action)
+                        self.assertNotEqual(player, game.player)
+                        game.undo_move(token)
+                        self.assertEqual(board, game.board)
+                        self.assertEqual(player, game.player)
+                        self.assertEqual(moves, game.get_open_moves())
+                    winner = game.make_move(rng.choice(moves[1]))
+                game.reset()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -6,6 +6,8 @@ To run:
 """
 
 
+import copy
+import random
 import unittest
 from game.connectfour import ConnectFour
 
@@ -32,6 +34,13 @@ class TestConnectFour(unittest.TestCase):
         self.assertEqual(4, self.game.rows)
         self.assertEqual(4, self.game.cols)
 
+    def test_init_window(self):
+        """Test __init__ rejects windows that are not None or a positive odd number of columns."""
+        for window in [0, -1, 2, 4, 9]:
+            self.assertRaises(ValueError, ConnectFour, rows=6, cols=7, window=window)
+        for window in [1, 3, 5, 7, None]:
+            self.assertEqual(window, ConnectFour(rows=6, cols=7, window=window).window)
+
     def test_reset(self):
         """Test reset method."""
         modified_board = ['-', '-', '-', '-',
@@ -47,7 +56,8 @@ class TestConnectFour(unittest.TestCase):
         self.assertNotEqual(modified_board, self.game.board)
 
     def test_get_open_moves(self):
-        """Test get_open_moves method."""
+        """Test get_open_moves method with full board state."""
+        self.game = ConnectFour(rows=4, cols=4, window=None)
         self.game.board = ['-', '-', 'X', 'X',
                            'O', '-', 'O', 'O',
                            'O', 'O', 'X', 'X',
@@ -58,8 +68,36 @@ class TestConnectFour(unittest.TestCase):
         self.assertEqual(['X-XXO-OOOOXXXXXO', '--XXOXOOOOXXXXXO'], states)
         self.assertEqual([0, 1], actions)
 
+    def test_get_open_moves_window(self):
+        """Test get_open_moves method with 1, 3 and 5 column states."""
+        board = ['-', '-', 'X', 'X',
+                 'O', '-', 'O', 'O',
+                 'O', 'O', 'X', 'X',
+                 'X', 'X', 'X', 'O']
+        # Window of 5 needs 5 columns, the full fifth column is outside both states
+        wide = ['-', '-', 'X', 'X', 'O',
+                'O', '-', 'O', 'O', 'X',
+                'O', 'O', 'X', 'X', 'O',
+                'X', 'X', 'X', 'O', 'X']
+        expected = {1: ['XOOX', '-XOX'],
+                    3: ['XOOX--OX', '-OOX-XOXXOXX'],
+                    5: ['XOOX--OXXOXX', '-OOX-XOXXOXXXOXO']}
+        for window, cols, start in [(1, 4, board), (3, 4, board), (5, 5, wide)]:
+            self.game = ConnectFour(rows=4, cols=cols, window=window)
+            self.game.board = list(start)
+            states, actions = self.game.get_open_moves()
+            self.assertEqual(expected[window], states)
+            self.assertEqual([0, 1], actions)
+            # Incrementally cached states match states rebuilt from board
+            self.game.make_move(1)
+            fresh = ConnectFour(rows=4, cols=cols, window=window)
+            fresh.board = list(self.game.board)
+            fresh.player = self.game.player
+            self.assertEqual(fresh.get_open_moves(), self.game.get_open_moves())
+
     def test_get_state(self):
-        """Test get_state method."""
+        """Test get_state method with full board state."""
+        self.game = ConnectFour(rows=4, cols=4, window=None)
         board1 = ['X', '-', 'X', 'X',
                   'O', 'O', 'O', 'O',
                   'O', 'O', 'X', 'X',
@@ -178,6 +216,68 @@ class TestConnectFour(unittest.TestCase):
         # Check toggled game player
         self.assertEqual('O', self.game.player)
 
+    def test_canonical(self):
+        """Test left-right mirrored states share a canonical state."""
+        self.game = ConnectFour(rows=4, cols=4, symmetry=True)
+        self.assertEqual('-------X', self.game.canonical('----' + '---X'))
+        self.assertEqual('-------X', self.game.canonical('---X' + '----'))
+        self.assertEqual('-------X--OX', self.game.canonical('--OX' + '---X' + '----'))
+        self.game = ConnectFour(rows=4, cols=4, window=None, symmetry=True)
+        board = ['-', '-', '-', '-',
+                 '-', '-', '-', '-',
+                 'O', '-', '-', '-',
+                 'X', 'X', '-', '-']
+        mirror = ['-', '-', '-', '-',
+                  '-', '-', '-', '-',
+                  '-', '-', '-', 'O',
+                  '-', '-', 'X', 'X']
+        self.assertEqual(self.game.canonical(''.join(board)), self.game.canonical(''.join(mirror)))
+        self.assertRaises(ValueError, ConnectFour, hashed=True, symmetry=True)
+
+    def test_hashed(self):
+        """Test hashed states map one to one onto String states for every window."""
+        rng = random.Random(0)
+        for window in [1, 3, 5, None]:
+            game = ConnectFour(window=window)
+            hashed = ConnectFour(window=window, hashed=True)
+            to_hash = {}
+            to_state = {}
+            for episode in range(20):
+                winner = None
+                while not winner:
+                    states, actions = game.get_open_moves()
+                    hashes, hashed_actions = hashed.get_open_moves()
+                    self.assertEqual(actions, hashed_actions)
+                    for state, h in zip(states, hashes):
+                        self.assertEqual(h, to_hash.setdefault(state, h))
+                        self.assertEqual(state, to_state.setdefault(h, state))
+                    action = rng.choice(actions)
+                    winner = game.make_move(action)
+                    self.assertEqual(winner, hashed.make_move(action))
+                game.reset()
+                hashed.reset()
+
+    def test_undo_move(self):
+        """Test undo_move restores board, player and states after every apply_move."""
+        rng = random.Random(0)
+        for game in [self.game, ConnectFour(window=None), ConnectFour(hashed=True),
+                     ConnectFour(window=None, hashed=True)]:
+            for episode in range(5):
+                winner = None
+                while not winner:
+                    board = copy.deepcopy(game.board)
+                    player = game.player
+                    moves = game.get_open_moves()
+                    for action in moves[1]:
+                        token = game.apply_move(action)
+                        self.assertNotEqual(player, game.player)
+                        game.undo_move(token)
+                        self.assertEqual(board, game.board)
+                        self.assertEqual(player, game.player)
+                        self.assertEqual(moves, game.get_open_moves())
+                    winner = game.make_move(rng.choice(moves[1]))
+                game.reset()
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,185 @@
+"""Test suite for Bitboard Connect Four.
+
+To run:
+    python -m unittest -v tests.game.test_connectfour_bitboard.py
+
+"""
+
+
+import copy
+import random
+import unittest
+from game.connectfour import ConnectFour
+from game.connectfour_bitboard import BitboardConnectFour
+
+
+class TestBitboardConnectFour(unittest.TestCase):
+    """Collection of unittests for Bitboard Connect Four."""
+
+    def setUp(self):
+        """Initialize Bitboard Connect Four game instance."""
+        self.game = BitboardConnectFour(rows=4, cols=4)
+
+    def tearDown(self):
+        """Reinitialize Bitboard Connect Four game instance."""
+        self.game = BitboardConnectFour(rows=4, cols=4)
+
+    def test_init(self):
+        """Test __init__ method."""
+        self.assertEqual(['-', '-', '-', '-',
+                          '-', '-', '-', '-',
+                          '-', '-', '-', '-',
+                          '-', '-', '-', '-'], self.game.board)
+        self.assertEqual('X', self.game.player)
+        self.assertEqual(None, self.game.winner)
+
+    def test_init_window(self):
+        """Test __init__ rejects windows ConnectFour rejects."""
+        for window in [0, 2, 9]:
+            self.assertRaises(ValueError, BitboardConnectFour, rows=6, cols=7, window=window)
+
+    def test_board_roundtrip(self):
+        """Test board setter and getter agree."""
+        board = ['-', '-', 'X', '-',
+                 'O', '-', 'O', '-',
+                 'O', 'O', 'X', '-',
+                 'X', 'X', 'X', 'O']
+        self.game.board = board
+        self.assertEqual(board, self.game.board)
+        self.assertEqual([3, 2, 4, 1], self.game.heights)
+
+    def test_get_open_moves(self):
+        """Test get_open_moves method."""
+        self.game.board = ['-', '-', 'X', 'X',
+                           'O', '-', 'O', 'O',
+                           'O', 'O', 'X', 'X',
+                           'X', 'X', 'X', 'O']
+        states, actions = self.game.get_open_moves()
+        self.assertEqual(['XOOX--OX', '-OOX-XOXXOXX'], states)
+        self.assertEqual([0, 1], actions)
+
+    def test_is_win_horizontal(self):
+        """Test is_win with horizontal win condition."""
+        self.game.board = ['-', '-', '-', '-',
+                           '-', '-', '-', '-',
+                           '-', '-', '-', '-',
+                           'O', 'O', 'O', 'O']
+        self.assertEqual('O', self.game.is_win())
+
+    def test_is_win_vertical(self):
+        """Test is_win with vertical win condition."""
+        self.game.board = ['-', '-', 'X', '-',
+                           '-', '-', 'X', '-',
+                           '-', '-', 'X', '-',
+                           '-', '-', 'X', '-']
+        self.assertEqual('X', self.game.is_win())
+
+    def test_is_win_diagonals(self):
+        """Test is_win with both diagonal win conditions."""
+        self.game.board = ['-', '-', '-', 'O',
+                           '-', '-', 'O', '-',
+                           '-', 'O', '-', '-',
+                           'O', '-', '-', '-']
+        self.assertEqual('O', self.game.is_win())
+        self.game.board = ['X', '-', '-', '-',
+                           '-', 'X', '-', '-',
+                           '-', '-', 'X', '-',
+                           '-', '-', '-', 'X']
+        self.assertEqual('X', self.game.is_win())
+
+    def test_is_win_no_wrap(self):
+        """Test lines do not wrap around between columns."""
+        self.game.board = ['-', '-', '-', '-',
+                           'X', '-', '-', '-',
+                           'X', '-', '-', '-',
+                           'X', 'X', '-', '-']
+        self.assertEqual(None, self.game.is_win())
+
+    def test_is_win_draw(self):
+        """Test is_win method with draw condition."""
+        self.game.board = ['O', 'X', 'O', 'X',
+                           'O', 'X', 'O', 'X',
+                           'X', 'O', 'X', 'O',
+                           'O', 'X', 'O', 'X']
+        self.assertEqual('Draw', self.game.is_win())
+
+    def test_is_valid_move(self):
+        """Test is_valid_move method."""
+        self.game.board = ['X', '-', '-', '-',
+                           'O', '-', '-', '-',
+                           'O', '-', '-', '-',
+                           'X', '-', '-', '-']
+        self.assertFalse(self.game.is_valid_move(-1))
+        self.assertFalse(self.game.is_valid_move(0))
+        self.assertFalse(self.game.is_valid_move(4))
+        self.assertTrue(self.game.is_valid_move(1))
+
+    def test_make_move(self):
+        """Test make_move method."""
+        self.assertEqual(None, self.game.make_move(0))
+        self.assertEqual(['-', '-', '-', '-',
+                          '-', '-', '-', '-',
+                          '-', '-', '-', '-',
+                          'X', '-', '-', '-'], self.game.board)
+        self.assertEqual('O', self.game.player)
+
+    def test_make_move_full_column(self):
+        """Test dropping into a full column leaves the board unchanged like ConnectFour."""
+        reference = ConnectFour(rows=4, cols=4)
+        for action in [0, 0, 0, 0]:
+            reference.make_move(action)
+            self.game.make_move(action)
+        board = copy.deepcopy(self.game.board)
+        states = self.game.get_open_moves()
+        self.assertEqual(None, self.game.apply_move(0))
+        self.assertEqual(board, self.game.board)
+        self.assertEqual([4, 0, 0, 0], self.game.heights)
+        self.assertEqual(reference.make_move(0), self.game.is_win())
+        self.assertEqual(reference.player, self.game.player)
+        self.game.undo_move(None)
+        self.assertEqual('X', self.game.player)
+        self.assertEqual(states, self.game.get_open_moves())
+
+    def test_matches_connectfour(self):
+        """Test random games match ConnectFour on every supported board size."""
+        rng = random.Random(0)
+        sizes = [(7, 6, 3), (8, 7, 3), (9, 7, 3), (10, 7, 3), (8, 8, 3),
+                 (7, 6, 1), (7, 6, 5), (7, 6, None)]
+        for cols, rows, window in sizes:
+            reference = ConnectFour(rows=rows, cols=cols, window=window)
+            game = BitboardConnectFour(rows=rows, cols=cols, window=window)
+            for episode in range(20):
+                winner = None
+                while not winner:
+                    expected = reference.get_open_moves()
+                    self.assertEqual(expected, game.get_open_moves())
+                    action = rng.choice(expected[1])
+                    winner = reference.make_move(action)
+                    self.assertEqual(winner, game.make_move(action))
+                    self.assertEqual(reference.board, game.board)
+                reference.reset()
+                game.reset()
+
+    def test_undo_move(self):
+        """Test undo_move restores board, player and states after every apply_move."""
+        rng = random.Random(0)
+        for game in [self.game, BitboardConnectFour(hashed=True)]:
+            for episode in range(5):
+                winner = None
+                while not winner:
+                    board = copy.deepcopy(game.board)
+                    player = game.player
+                    moves = game.get_open_moves()
+                    for action in moves[1]:
+                        token = game.apply_move(action)
+                        self.assertNotEqual(player, game.player)
+                        game.undo_move(token)
+                        self.assertEqual(board, game.board)
+                        self.assertEqual(player, game.player)
+                        self.assertEqual(moves, game.get_open_moves())
+                    winner = game.make_move(rng.choice(moves[1]))
+                game.reset()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+"""Test suite for the Game interface shared by every game.
+
+To run:
+    python -m unittest -v tests.game.test_game.py
+
+"""
+
+
+import random
+import unittest
+from game.chomp import Chomp
+from game.chomp_young import YoungChomp
+from game.connectfour import ConnectFour
+from game.connectfour_bitboard import BitboardConnectFour
+from game.game import Game
+from game.tictactoe import TicTacToe
+from game.tictactoe_bitmask import BitmaskTicTacToe
+
+
+class OpenMovesOnly(TicTacToe):
+    """Tic Tac Toe relying on the Game defaults of the lazy successor interface."""
+
+    def get_actions(self):
+        """Returns list of available moves with the Game default."""
+        return Game.get_actions(self)
+
+    def successor_key(self, position):
+        """Returns state after current player takes position with the Game default."""
+        return Game.successor_key(self, position)
+
+
+class TestGame(unittest.TestCase):
+    """Collection of unittests for the Game interface."""
+
+    def setUp(self):
+        """Initialize one instance of every game."""
+        self.games = [TicTacToe(), TicTacToe(hashed=True),
+                      BitmaskTicTacToe(), BitmaskTicTacToe(hashed=True),
+                      ConnectFour(rows=4, cols=5), ConnectFour(rows=4, cols=5, hashed=True),
+                      BitboardConnectFour(rows=4, cols=5, window=None),
+                      Chomp(), Chomp(hashed=True),
+                      YoungChomp(rows=4, cols=4), YoungChomp(history=True),
+                      YoungChomp(rows=4, cols=4, hashed=True),
+                      OpenMovesOnly()]
+
+    def test_successor_key(self):
+        """Test get_actions and successor_key agree with get_open_moves."""
+        rng = random.Random(0)
+        for game in self.games:
+            for episode in range(5):
+                winner = None
+                while not winner:
+                    states, actions = game.get_open_moves()
+                    self.assertEqual(actions, game.get_actions())
+                    self.assertEqual(states, [game.successor_key(action) for action in actions])
+                    winner = game.make_move(rng.choice(actions))
+                game.reset()
+
+    def test_canonical_default(self):
+        """Test states are their own canonical state by default."""
+        for game in self.games:
+            states, actions = game.get_open_moves()
+            self.assertEqual(states, [game.canonical(state) for state in states])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,34 @@
+"""Test suite for game registry.
+
+To run:
+    python -m unittest -v tests.game.test_registry.py
+
+"""
+
+
+import unittest
+from game.registry import make_game, register, GAMES
+from game.tictactoe import TicTacToe
+
+
+class TestRegistry(unittest.TestCase):
+    """Collection of unittests for game registry."""
+
+    def test_make_game(self):
+        """Test registered games are built fresh with overridden arguments."""
+        self.assertTrue(isinstance(make_game('tictactoe'), TicTacToe))
+        self.assertEqual(3, make_game('chomp', rows=3).rows)
+        self.assertRaises(ValueError, make_game, 'go')
+
+    def test_register(self):
+        """Test registering a game under a new name."""
+        register('tictactoe_hashed', TicTacToe, hashed=True)
+        try:
+            self.assertTrue(make_game('tictactoe_hashed').hashed)
+            self.assertIsNot(make_game('tictactoe_hashed'), make_game('tictactoe_hashed'))
+        finally:
+            del GAMES['tictactoe_hashed']
+
+
+if __name__ == '__main__':
+    unittest.main()
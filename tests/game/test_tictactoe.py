@@ -6,6 +6,8 @@ To run:
 """
 
 
+import copy
+import random
 import unittest
 from game.tictactoe import TicTacToe
 
@@ -129,6 +131,63 @@ class TestTicTacToe(unittest.TestCase):
         # Check toggled game player
         self.assertEqual('O', self.game.player)
 
+    def test_canonical(self):
+        """Test rotated and reflected states share a canonical state."""
+        self.assertEqual('X--------', self.game.canonical('X--------'))
+        self.assertEqual('--X------', self.game.canonical('--X------'))
+        self.game = TicTacToe(symmetry=True)
+        corners = ['X--------', '--X------', '------X--', '--------X']
+        self.assertEqual(set(['--------X']), set([self.game.canonical(s) for s in corners]))
+        state = 'XO-------'
+        symmetric = ['XO-------', 'X--O-----', '-OX------', '--X--O---',
+                     '------XO-', '---O--X--', '-----O--X', '-------OX']
+        self.assertEqual(set([self.game.canonical(state)]),
+                         set([self.game.canonical(s) for s in symmetric]))
+        self.assertEqual(self.game.canonical(state), min(symmetric))
+        self.assertRaises(ValueError, TicTacToe, hashed=True, symmetry=True)
+
+    def test_hashed(self):
+        """Test hashed states map one to one onto String states."""
+        rng = random.Random(0)
+        hashed = TicTacToe(hashed=True)
+        to_hash = {}
+        to_state = {}
+        for episode in range(200):
+            winner = None
+            while not winner:
+                states, actions = self.game.get_open_moves()
+                hashes, hashed_actions = hashed.get_open_moves()
+                self.assertEqual(actions, hashed_actions)
+                for state, h in zip(states, hashes):
+                    self.assertEqual(h, to_hash.setdefault(state, h))
+                    self.assertEqual(state, to_state.setdefault(h, state))
+                action = rng.choice(actions)
+                winner = self.game.make_move(action)
+                self.assertEqual(winner, hashed.make_move(action))
+                self.assertEqual(hashed.board_hash(hashed.board), hashed.hash)
+            self.game.reset()
+            hashed.reset()
+
+    def test_undo_move(self):
+        """Test undo_move restores board, player and states after every apply_move."""
+        rng = random.Random(0)
+        for game in [self.game, TicTacToe(hashed=True)]:
+            for episode in range(20):
+                winner = None
+                while not winner:
+                    board = copy.deepcopy(game.board)
+                    player = game.player
+                    moves = game.get_open_moves()
+                    for action in moves[1]:
+                        token = game.apply_move(action)
+                        self.assertNotEqual(player, game.player)
+                        game.undo_move(token)
+                        self.assertEqual(board, game.board)
+                        self.assertEqual(player, game.player)
+                        self.assertEqual(moves, game.get_open_moves())
+                    winner = game.make_move(rng.choice(moves[1]))
+                game.reset()
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,148 @@
+"""Test suite for Bitmask Tic Tac Toe.
+
+To run:
+    python -m unittest -v tests.game.test_tictactoe_bitmask.py
+
+"""
+
+
+import copy
+import random
+import unittest
+from game.tictactoe import TicTacToe
+from game.tictactoe_bitmask import BitmaskTicTacToe
+
+
+class TestBitmaskTicTacToe(unittest.TestCase):
+    """Collection of unittests for Bitmask Tic Tac Toe."""
+
+    def setUp(self):
+        """Initialize Bitmask Tic Tac Toe game instance."""
+        self.game = BitmaskTicTacToe()
+
+    def tearDown(self):
+        """Reinitialize Bitmask Tic Tac Toe game instance."""
+        self.game = BitmaskTicTacToe()
+
+    def test_init(self):
+        """Test __init__ method."""
+        self.assertEqual(['-', '-', '-',
+                          '-', '-', '-',
+                          '-', '-', '-'], self.game.board)
+        self.assertEqual('X', self.game.player)
+        self.assertEqual(0, self.game.get_state_index())
+
+    def test_get_open_moves(self):
+        """Test get_open_moves method."""
+        self.game.board = ['-', 'O', '-',
+                           'X', 'X', 'O',
+                           'O', 'X', '-']
+        states, actions = self.game.get_open_moves()
+        self.assertEqual(['XO-XXOOX-', '-OXXXOOX-', '-O-XXOOXX'], states)
+        self.assertEqual([0, 2, 8], actions)
+
+    def test_get_open_indices(self):
+        """Test get_open_indices matches base 3 packed candidate boards."""
+        self.game.board = ['-', 'O', '-',
+                           'X', 'X', 'O',
+                           'O', 'X', '-']
+        index = 2 * 3 + 1 * 27 + 1 * 81 + 2 * 243 + 2 * 729 + 1 * 2187
+        self.assertEqual(index, self.game.get_state_index())
+        indices, actions = self.game.get_open_indices()
+        self.assertEqual([index + 1, index + 9, index + 6561], indices)
+        self.assertEqual([0, 2, 8], actions)
+
+    def test_hashed(self):
+        """Test hashed states are the integer state indices."""
+        game = BitmaskTicTacToe(hashed=True)
+        game.make_move(4)
+        self.assertEqual(game.get_open_indices(), game.get_open_moves())
+
+    def test_canonical(self):
+        """Test state indices are canonical exactly when String states are."""
+        strings = BitmaskTicTacToe(symmetry=True)
+        indices = BitmaskTicTacToe(hashed=True, symmetry=True)
+        for action in [0, 4, 5]:
+            states, actions = strings.get_open_moves()
+            hashes, actions = indices.get_open_moves()
+            for state, index in zip(states, hashes):
+                canonical = BitmaskTicTacToe()
+                canonical.board = list(strings.canonical(state))
+                self.assertEqual(indices.canonical(canonical.get_state_index()),
+                                 indices.canonical(index))
+            strings.make_move(action)
+            indices.make_move(action)
+
+    def test_state_index_range(self):
+        """Test full board of O is the largest state index."""
+        self.game.board = ['O'] * 9
+        self.assertEqual(3 ** 9 - 1, self.game.get_state_index())
+
+    def test_is_win(self):
+        """Test is_win method for O, X, Draw and incomplete games."""
+        self.game.board = ['X', 'O', 'X',
+                           'X', 'O', 'X',
+                           'O', 'O', '-']
+        self.assertEqual('O', self.game.is_win())
+        self.game.board = ['-', 'O', 'O',
+                           'X', 'X', 'X',
+                           'O', 'X', '-']
+        self.assertEqual('X', self.game.is_win())
+        self.game.board = ['X', 'O', 'X',
+                           'X', 'O', 'O',
+                           'O', 'X', 'X']
+        self.assertEqual('Draw', self.game.is_win())
+        self.game.board = ['-', 'O', '-',
+                           'X', 'X', 'O',
+                           'O', 'X', '-']
+        self.assertEqual(None, self.game.is_win())
+
+    def test_is_valid_move(self):
+        """Test is_valid_move method."""
+        self.game.board = ['-', 'O', '-',
+                           'X', 'X', 'O',
+                           'O', 'X', '-']
+        self.assertFalse(self.game.is_valid_move(-1))
+        self.assertFalse(self.game.is_valid_move(9))
+        self.assertFalse(self.game.is_valid_move(1))
+        self.assertTrue(self.game.is_valid_move(0))
+
+    def test_matches_tictactoe(self):
+        """Test random games match TicTacToe."""
+        rng = random.Random(0)
+        reference = TicTacToe()
+        for episode in range(200):
+            winner = None
+            while not winner:
+                expected = reference.get_open_moves()
+                self.assertEqual(expected, self.game.get_open_moves())
+                action = rng.choice(expected[1])
+                winner = reference.make_move(action)
+                self.assertEqual(winner, self.game.make_move(action))
+                self.assertEqual(reference.board, self.game.board)
+            reference.reset()
+            self.game.reset()
+
+    def test_undo_move(self):
+        """Test undo_move restores board, player and states after every apply_move."""
+        rng = random.Random(0)
+        for game in [self.game, BitmaskTicTacToe(hashed=True)]:
+            for episode in range(20):
+                winner = None
+                while not winner:
+                    board = copy.deepcopy(game.board)
+                    player = game.player
+                    moves = game.get_open_moves()
+                    for action in moves[1]:
+                        token = game.apply_move(action)
+                        self.assertNotEqual(player, game.player)
+                        game.undo_move(token)
+                        self.assertEqual(board, game.board)
+                        self.assertEqual(player, game.player)
+                        self.assertEqual(moves, game.get_open_moves())
+                    winner = game.make_move(rng.choice(moves[1]))
+                game.reset()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -6,9 +6,17 @@ To run:
 """
 
 
+import numbers
 import unittest
+import numpy as np
+from game.chomp import Chomp
+from game.chomp_young import YoungChomp
+from game.connectfour import ConnectFour
+from game.connectfour_bitboard import BitboardConnectFour
 from game.tictactoe import TicTacToe
+from game.tictactoe_bitmask import BitmaskTicTacToe
 from rl.agent import Agent
+from rl.qtable import QTable
 
 
 class TestAgent(unittest.TestCase):
@@ -31,6 +39,117 @@ class TestAgent(unittest.TestCase):
         self.agent.qtable[state] = 1.0
         self.assertEqual(1.0, self.agent.qvalue(state))
 
+    def test_qvalue_hashed(self):
+        """Test qvalue accepts integer states of hashed games."""
+        self.agent = Agent(TicTacToe(hashed=True), qtable={})
+        states, actions = self.agent.game.get_open_moves()
+        self.assertEqual(0.0, self.agent.qvalue(states[0]))
+        self.agent.qtable[states[0]] = 1.0
+        self.assertEqual(1.0, self.agent.qvalue(states[0]))
+        self.agent.train(10, history=[])
+        self.assertTrue(all(isinstance(state, numbers.Integral) for state in self.agent.qtable))
+
+    def test_qvalues(self):
+        """Test batched qvalues of a QTable match qvalue of a dict, initializing missing states."""
+        for game in [TicTacToe(symmetry=True), TicTacToe(hashed=True)]:
+            states, actions = game.get_open_moves()
+            table = Agent(game, qtable={})
+            batched = Agent(game, qtable=QTable(dtype=np.float64))
+            batched.dirty = set()
+            table.qtable[game.canonical(states[0])] = 1.0
+            batched.qtable[game.canonical(states[0])] = 1.0
+            self.assertEqual([table.qvalue(s) for s in states], batched.qvalues(states))
+            self.assertEqual(sorted(table.qtable.items()), sorted(batched.qtable.items()))
+            self.assertEqual(set(table.qtable) - set([game.canonical(states[0])]), batched.dirty)
+
+    def test_symmetry(self):
+        """Test symmetric states share qtable entries."""
+        self.agent = Agent(TicTacToe(symmetry=True), qtable={})
+        self.agent.qtable['--------X'] = 1.0
+        self.assertEqual(1.0, self.agent.qvalue('X--------'))
+        self.agent.update(0.0, 'Draw', '--X------')
+        self.assertEqual(['--------X'], list(self.agent.qtable))
+        np.random.seed(0)
+        self.agent.train(100, history=[])
+        np.random.seed(0)
+        full = Agent(TicTacToe(), qtable={})
+        full.train(100, history=[])
+        self.assertTrue(len(self.agent.qtable) < len(full.qtable))
+
+    def test_train_batched(self):
+        """Test batched training learns values of states the game produces."""
+        np.random.seed(0)
+        self.agent = Agent(BitmaskTicTacToe(hashed=True), qtable={})
+        history = self.agent.train_batched(200, batch_size=32, history=[])
+        self.assertEqual(200, len(history[1]))
+        states, actions = self.agent.game.get_open_moves()
+        self.assertTrue(all(state in self.agent.qtable for state in states))
+        self.assertTrue(any(value != 0.0 for value in self.agent.qtable.values()))
+
+    def test_train_batched_qtable(self):
+        """Test batched and stepwise training on a QTable."""
+        np.random.seed(0)
+        self.agent = Agent(BitmaskTicTacToe(hashed=True), qtable=QTable())
+        self.agent.train_batched(200, batch_size=32, history=[])
+        states, actions = self.agent.game.get_open_moves()
+        self.assertTrue(all(state in self.agent.qtable for state in states))
+        self.assertTrue(any(value != 0.0 for value in self.agent.qtable.values()))
+        self.agent.train(10, history=[])
+        self.assertTrue(all(isinstance(state, numbers.Integral) for state in self.agent.qtable))
+
+    def test_next_move_explore(self):
+        """Test exploring builds only the selected next state."""
+        self.agent = Agent(TicTacToe(), qtable={}, epsilon=1.0)
+
+        def get_open_moves():
+            raise AssertionError('Exploring must not build every next state.')
+        self.agent.game.get_open_moves = get_open_moves
+        state, action = self.agent.next_move()
+        self.assertEqual(state, self.agent.game.successor_key(action))
+        self.assertEqual({}, self.agent.qtable)
+
+    def test_successor_cache(self):
+        """Test next move reuses next states of update until the game changes."""
+        self.agent = Agent(TicTacToe(), qtable={}, epsilon=0.0)
+        game = self.agent.game
+        self.agent.step()
+        calls = []
+        get_open_moves = game.get_open_moves
+
+        def counted():
+            calls.append(1)
+            return get_open_moves()
+        game.get_open_moves = counted
+        self.agent.next_move()
+        self.assertEqual([], calls)
+        # Human input moves the game on
+        game.make_move(game.get_actions()[0])
+        state, action = self.agent.next_move()
+        self.assertEqual(1, len(calls))
+        self.assertEqual(state, game.successor_key(action))
+        game.reset()
+        self.agent.next_move()
+        self.assertEqual(2, len(calls))
+        # Values of cached next states are read fresh
+        states, actions, values = self.agent.open_moves()
+        self.agent.learn(states[0], 1.0, [], True)
+        self.assertEqual(0.5, self.agent.open_moves()[2][0])
+        self.assertEqual(2, len(calls))
+
+    def test_successor_cache_board(self):
+        """Test assigning a board invalidates cached next states."""
+        for make_game in [TicTacToe, BitmaskTicTacToe, lambda: ConnectFour(rows=4, cols=4),
+                          lambda: BitboardConnectFour(rows=4, cols=4), lambda: Chomp(rows=3, cols=3),
+                          lambda: YoungChomp(rows=3, cols=3)]:
+            game = make_game()
+            other = make_game()
+            other.make_move(other.get_actions()[0])
+            agent = Agent(game, qtable={})
+            agent.successor_moves()
+            game.board = other.board
+            game.player = other.player
+            self.assertEqual(other.get_open_moves(), agent.successor_moves())
+
     def test_argmax(self):
         """Test argmax with values list."""
         values = [0, 1, 5, 3, 4]
@@ -0,0 +1,92 @@
+"""Test suite for the memory-bounded Q-table.
+
+To run:
+    python -m unittest -v tests.rl.test_bounded.py
+
+"""
+
+
+import sys
+import unittest
+import numpy as np
+from game.connectfour import ConnectFour
+from rl.agent import Agent
+from rl.bounded import BoundedQTable, LFUPolicy, LowValuePolicy
+
+
+class TestBoundedQTable(unittest.TestCase):
+    """Collection of unittests for the memory-bounded Q-table."""
+
+    def fill(self, qtable):
+        """Add states a, b and c, then use a twice and b once."""
+        qtable['a'] = 0.5
+        qtable['b'] = -0.5
+        qtable['c'] = 0.0
+        qtable['a']
+        qtable['a']
+        qtable['b']
+
+    def test_lru(self):
+        """Test least recently used state is evicted."""
+        qtable = BoundedQTable(max_entries=3, policy='lru')
+        self.fill(qtable)
+        qtable['c']
+        qtable['d'] = 1.0
+        self.assertEqual(['b', 'c', 'd'], sorted(qtable.keys()))
+
+    def test_lfu(self):
+        """Test least frequently used state is evicted, oldest first among equals."""
+        qtable = BoundedQTable(max_entries=3, policy='lfu')
+        self.fill(qtable)
+        qtable['d'] = 1.0
+        self.assertEqual(['a', 'b', 'd'], sorted(qtable.keys()))
+        qtable['e'] = 1.0
+        self.assertEqual(['a', 'b', 'e'], sorted(qtable.keys()))
+
+    def test_lowq(self):
+        """Test lowest |Q| among least used states is evicted."""
+        qtable = BoundedQTable(max_entries=3, policy=LowValuePolicy())
+        qtable['a'] = 0.5
+        qtable['b'] = 0.1
+        qtable['c'] = -0.9
+        qtable['d'] = 1.0
+        self.assertEqual(['a', 'c', 'd'], sorted(qtable.keys()))
+
+    def test_max_bytes(self):
+        """Test memory budget holds during training."""
+        qtable = BoundedQTable(max_bytes=100000, policy=LFUPolicy())
+        agent = Agent(ConnectFour(rows=5, cols=6, window=None), qtable=qtable)
+        agent.train(200, history=[])
+        self.assertTrue(sys.getsizeof(qtable) <= 100000 + 1000)
+        self.assertTrue(qtable.evictions > 0)
+
+    def test_stats(self):
+        """Test hit rate and eviction counts."""
+        np.random.seed(0)
+        qtable = BoundedQTable(max_entries=500, policy='lowq')
+        agent = Agent(ConnectFour(rows=5, cols=6, window=None), qtable=qtable)
+        agent.train(100, history=[])
+        stats = qtable.stats()
+        self.assertEqual(500, stats['entries'])
+        self.assertEqual(500, len(qtable))
+        self.assertTrue(stats['evictions'] > 0)
+        self.assertTrue(0.0 < stats['hit_rate'] < 1.0)
+
+        qtable = BoundedQTable(max_entries=10)
+        qtable['a'] = 0.5
+        qtable['b'] = 0.25
+        lookups = [key in qtable for key in ['a', 'b', 'c', 'a', 'd']]
+        self.assertEqual([True, True, False, True, False], lookups)
+        stats = qtable.stats()
+        self.assertEqual(3, stats['hits'])
+        self.assertEqual(2, stats['misses'])
+        self.assertEqual(0.6, stats['hit_rate'])
+        self.assertEqual(0, stats['evictions'])
+
+    def test_budget_required(self):
+        """Test a budget is required."""
+        self.assertRaises(ValueError, BoundedQTable)
+
+
+if __name__ == '__main__':
+    unittest.main()
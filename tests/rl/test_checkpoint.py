@@ -0,0 +1,131 @@
+"""Test suite for delta checkpoints of training.
+
+To run:
+    python -m unittest -v tests.rl.test_checkpoint.py
+
+"""
+
+
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+from game.connectfour import ConnectFour
+from game.tictactoe import TicTacToe
+from rl.agent import Agent
+from rl.bounded import BoundedQTable, LFUPolicy
+from rl.checkpoint import Checkpoint
+from rl.qtable import QTable
+
+
+class TestCheckpoint(unittest.TestCase):
+    """Collection of unittests for delta checkpoints of training."""
+
+    def setUp(self):
+        """Create temporary checkpoint directory."""
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, 'checkpoint')
+
+    def tearDown(self):
+        """Remove temporary checkpoint directory."""
+        shutil.rmtree(self.dir)
+
+    def check_resume(self, make_game, make_qtable):
+        """Check training resumed after a crash matches uninterrupted training."""
+        np.random.seed(0)
+        game = make_game()
+        full = Agent(game, qtable=make_qtable())
+        full.train(200, history=[], checkpoint=Checkpoint(self.path, game, interval=20, compact_every=3))
+
+        np.random.seed(0)
+        game = make_game()
+        checkpoint = Checkpoint(self.path, game, interval=20, compact_every=3)
+        checkpoint.clear()
+        crashed = Agent(game, qtable=make_qtable())
+        crashed.train(110, history=[], checkpoint=checkpoint)
+        # Scramble RNG, restore must bring it back
+        np.random.seed(1)
+
+        game = make_game()
+        checkpoint = Checkpoint(self.path, game, interval=20, compact_every=3)
+        resumed = Agent(game, qtable=make_qtable())
+        start = checkpoint.restore(resumed)
+        self.assertEqual(100, start)
+        history = resumed.train(200, history=[], checkpoint=checkpoint, start=start)
+        self.assertEqual(100, len(history[1]))
+        self.assertEqual(dict(full.qtable.items()), dict(resumed.qtable.items()))
+
+    def test_resume(self):
+        """Test resuming String and integer state tables."""
+        self.check_resume(TicTacToe, dict)
+        self.check_resume(lambda: ConnectFour(rows=4, cols=5, hashed=True), dict)
+        self.check_resume(lambda: ConnectFour(rows=4, cols=5, hashed=True), lambda: QTable(dtype=np.float64))
+
+    def test_resume_bounded(self):
+        """Test a bounded table is restored bounded, without states evicted since they were recorded."""
+        np.random.seed(0)
+        game = ConnectFour(rows=4, cols=5, hashed=True)
+        checkpoint = Checkpoint(self.path, game, interval=20, compact_every=3)
+        checkpoint.clear()
+        crashed = Agent(game, qtable=BoundedQTable(max_entries=300, policy='lfu'))
+        crashed.train(100, history=[], checkpoint=checkpoint)
+        self.assertTrue(crashed.qtable.evictions > 0)
+
+        resumed = Agent(ConnectFour(rows=4, cols=5, hashed=True), qtable=BoundedQTable(max_entries=300, policy='lfu'))
+        self.assertEqual(100, checkpoint.restore(resumed))
+        self.assertTrue(isinstance(resumed.qtable, BoundedQTable))
+        self.assertEqual(300, resumed.qtable.max_entries)
+        self.assertTrue(isinstance(resumed.qtable.policy, LFUPolicy))
+        self.assertTrue(len(resumed.qtable) <= 300)
+        self.assertEqual(set(crashed.qtable.keys()), set(resumed.qtable.keys()))
+        resumed.train(200, history=[], checkpoint=checkpoint, start=100)
+        self.assertTrue(len(resumed.qtable) <= 300)
+
+    def test_compact_bounded(self):
+        """Test writing a snapshot does not count as a use of bounded table entries."""
+        game = TicTacToe()
+        agent = Agent(game, qtable=BoundedQTable(max_entries=100, policy='lru'))
+        agent.train(20, history=[])
+        order = list(agent.qtable.policy.order)
+        Checkpoint(self.path, game).compact(agent, 20)
+        self.assertEqual(order, list(agent.qtable.policy.order))
+
+    def test_delta_size(self):
+        """Test delta records only hold entries changed since the last record."""
+        game = TicTacToe()
+        checkpoint = Checkpoint(self.path, game, interval=10, compact_every=100)
+        agent = Agent(game, qtable={})
+        agent.train(10, history=[], checkpoint=checkpoint)
+        self.assertEqual(len(agent.qtable), len(checkpoint.read_log()[0][1]))
+        checkpoint.record(agent, 11)
+        agent.qtable['X--------'] = 0.5
+        agent.dirty.add('X--------')
+        checkpoint.record(agent, 12)
+        records = checkpoint.read_log()
+        self.assertEqual(([], []), records[1][1:])
+        self.assertEqual((['X--------'], [0.5]), records[2][1:])
+        self.assertEqual(12, records[2][0]['episode'])
+
+    def test_torn_record(self):
+        """Test a partly written last record is ignored."""
+        game = TicTacToe()
+        checkpoint = Checkpoint(self.path, game, interval=10, compact_every=100)
+        agent = Agent(game, qtable={})
+        agent.train(30, history=[], checkpoint=checkpoint)
+        with open(checkpoint.log_path, 'rb') as f:
+            data = f.read()
+        with open(checkpoint.log_path, 'wb') as out:
+            out.write(data[:-5])
+        self.assertEqual(20, checkpoint.restore(Agent(game, qtable={})))
+
+    def test_restore_empty(self):
+        """Test restoring without a checkpoint starts from episode 0."""
+        game = TicTacToe()
+        agent = Agent(game, qtable={'X--------': 1.0})
+        self.assertEqual(0, Checkpoint(self.path, game).restore(agent))
+        self.assertEqual({}, agent.qtable)
+
+
+if __name__ == '__main__':
+    unittest.main()
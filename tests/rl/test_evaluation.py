@@ -0,0 +1,57 @@
+"""Test suite for parallel greedy self-play evaluation.
+
+To run:
+    python -m unittest -v tests.rl.test_evaluation.py
+
+"""
+
+
+import unittest
+import numpy as np
+from game.tictactoe import TicTacToe
+from rl.agent import Agent
+from rl.evaluation import evaluate_greedy, wilson
+
+
+class TestEvaluation(unittest.TestCase):
+    """Collection of unittests for parallel greedy self-play evaluation."""
+
+    def setUp(self):
+        """Initialize agent trained briefly on Tic Tac Toe."""
+        np.random.seed(0)
+        self.agent = Agent(TicTacToe(), qtable={})
+        self.agent.train(200, history=[])
+
+    def test_wilson(self):
+        """Test Wilson interval contains the rate and narrows with trials."""
+        low, high = wilson(50, 100)
+        self.assertAlmostEqual(0.4038, low, places=4)
+        self.assertAlmostEqual(0.5962, high, places=4)
+        self.assertTrue(wilson(500, 1000)[1] - wilson(500, 1000)[0] < high - low)
+        self.assertEqual(0.0, wilson(0, 10)[0])
+        self.assertEqual((0.0, 1.0), wilson(0, 0))
+
+    def test_read_only(self):
+        """Test evaluation leaves the table and game unchanged."""
+        qtable = dict(self.agent.qtable)
+        result = evaluate_greedy(self.agent, games=300, chunk=100)
+        self.assertEqual(qtable, self.agent.qtable)
+        self.assertEqual(['-'] * 9, self.agent.game.board)
+        self.assertEqual(300, result['games'])
+        self.assertAlmostEqual(1.0, sum(result[outcome][0] for outcome in ('X', 'Draw', 'O')))
+
+    def test_workers(self):
+        """Test results do not depend on the number of workers."""
+        serial = evaluate_greedy(self.agent, games=400, chunk=100, seed=3)
+        parallel = evaluate_greedy(self.agent, games=400, chunk=100, workers=2, seed=3)
+        self.assertEqual(serial, parallel)
+
+    def test_width(self):
+        """Test evaluation stops once intervals are narrower than width."""
+        result = evaluate_greedy(self.agent, games=10000, width=0.2, chunk=50)
+        self.assertTrue(result['games'] < 10000)
+        self.assertTrue(all(result[outcome][2] - result[outcome][1] < 0.2 for outcome in ('X', 'Draw', 'O')))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+"""Test suite for hyperparameter search with successive halving.
+
+To run:
+    python -m unittest -v tests.rl.test_hyper.py
+
+"""
+
+
+import csv
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from rl.hyper import best, grid, rungs, search, write_results
+
+
+class TestHyper(unittest.TestCase):
+    """Collection of unittests for hyperparameter search with successive halving."""
+
+    def test_grid(self):
+        """Test grid covers every combination."""
+        configs = grid(epsilon=[0.1, 0.2], learning_rate=[0.5])
+        self.assertEqual([{'epsilon': 0.1, 'learning_rate': 0.5}, {'epsilon': 0.2, 'learning_rate': 0.5}], configs)
+
+    def test_rungs(self):
+        """Test budgets grow by eta up to the maximum."""
+        self.assertEqual([100, 300, 900, 1000], rungs(100, 1000, eta=3))
+        self.assertEqual([100], rungs(100, 100))
+
+    def test_search(self):
+        """Test weak trials are pruned and survivors train to the maximum budget."""
+        configs = grid(epsilon=[0.1, 0.5, 0.9], learning_rate=[0.5])
+        rows = search('youngchomp', configs, min_episodes=20, max_episodes=60, workers=2)
+        self.assertEqual([3, 1], [len([row for row in rows if row['rung'] == rung]) for rung in (0, 1)])
+        self.assertEqual(1, len([row for row in rows if row['promoted']]))
+        self.assertEqual(60, best(rows)['episodes'])
+        self.assertEqual(rows, search('youngchomp', configs, min_episodes=20, max_episodes=60))
+
+    def test_write_results(self):
+        """Test results are written as CSV and JSON."""
+        rows = [{'trial': 0, 'rung': 0, 'episodes': 10, 'score': 0.5, 'promoted': True, 'epsilon': 0.1}]
+        path = tempfile.mkdtemp()
+        try:
+            write_results(rows, os.path.join(path, 'hyper.json'))
+            with open(os.path.join(path, 'hyper.json')) as f:
+                self.assertEqual(rows, json.load(f))
+            write_results(rows, os.path.join(path, 'hyper.csv'))
+            with open(os.path.join(path, 'hyper.csv')) as f:
+                written = list(csv.DictReader(f))
+            self.assertEqual('0.1', written[0]['epsilon'])
+            self.assertEqual('True', written[0]['promoted'])
+        finally:
+            shutil.rmtree(path)
+
+
+if __name__ == '__main__':
+    unittest.main()
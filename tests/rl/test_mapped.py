@@ -0,0 +1,110 @@
+"""Test suite for memory-mapped binary Q-table files.
+
+To run:
+    python -m unittest -v tests.rl.test_mapped.py
+
+"""
+
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+from game.connectfour import ConnectFour
+from game.tictactoe import TicTacToe
+from rl.agent import Agent
+from rl.mapped import MappedQTable, binary_to_json, json_to_binary, open_binary, read_header, save_binary
+
+
+class TestMapped(unittest.TestCase):
+    """Collection of unittests for memory-mapped binary Q-table files."""
+
+    def setUp(self):
+        """Create temporary directory for files."""
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, 'qtable.bin')
+
+    def tearDown(self):
+        """Remove temporary directory."""
+        shutil.rmtree(self.dir)
+
+    def trained(self, game):
+        """Returns qtable of agent trained on game."""
+        np.random.seed(0)
+        agent = Agent(game, qtable={})
+        agent.train(50, history=[])
+        return agent.qtable
+
+    def test_string_keys(self):
+        """Test String states round trip through a file."""
+        game = TicTacToe()
+        qtable = self.trained(game)
+        save_binary(qtable, self.path, game, dtype=np.float64)
+        mapped = MappedQTable(self.path, game=game)
+        self.assertEqual(len(qtable), len(mapped))
+        self.assertEqual(qtable, dict(mapped.items()))
+        for state, value in qtable.items():
+            self.assertTrue(state in mapped)
+            self.assertEqual(value, mapped[state])
+        self.assertFalse('XXXXXXXXX' in mapped)
+        keys = list(qtable)[:20] + ['XXXXXXXXX']
+        self.assertEqual([qtable.get(key, -1.0) for key in keys], mapped.get_many(keys, default=-1.0).tolist())
+
+    def test_integer_keys(self):
+        """Test 64 bit Zobrist states round trip through a file."""
+        game = ConnectFour(rows=4, cols=5, hashed=True)
+        qtable = self.trained(game)
+        save_binary(qtable, self.path, game, dtype=np.float64)
+        mapped = MappedQTable(self.path, game=game)
+        self.assertEqual(qtable, dict(mapped.items()))
+        self.assertTrue(any(state >= 2 ** 63 for state in mapped))
+        keys = list(qtable)[:20]
+        self.assertEqual([qtable[key] for key in keys], mapped.get_many(keys).tolist())
+
+    def test_header(self):
+        """Test header records the game and rejects other games."""
+        game = ConnectFour(rows=4, cols=5, hashed=True)
+        save_binary({}, self.path, game)
+        header, offset = read_header(self.path)
+        self.assertEqual('ConnectFour', header['game'])
+        self.assertEqual(4, header['rows'])
+        self.assertEqual(0, offset % 64)
+        self.assertEqual(0, len(MappedQTable(self.path, game=game)))
+        self.assertRaises(ValueError, MappedQTable, self.path, ConnectFour(rows=4, cols=5))
+        self.assertRaises(ValueError, MappedQTable, self.path, TicTacToe())
+
+    def test_overlay(self):
+        """Test writes stay in memory and playing on a mapped table works."""
+        game = TicTacToe()
+        save_binary(self.trained(game), self.path, game)
+        size = os.path.getsize(self.path)
+        mapped = MappedQTable(self.path, game=game)
+        count = len(mapped)
+        agent = Agent(game, qtable=mapped, epsilon=0.0)
+        agent.train(10, history=[])
+        self.assertTrue(len(mapped) >= count)
+        self.assertEqual(size, os.path.getsize(self.path))
+        self.assertEqual(count, len(MappedQTable(self.path)))
+
+    def test_json(self):
+        """Test json converters in both directions."""
+        game = ConnectFour(rows=4, cols=5, hashed=True)
+        qtable = self.trained(game)
+        json_path = os.path.join(self.dir, 'qtable.json')
+        with open(json_path, 'w') as out:
+            json.dump(qtable, out)
+        json_to_binary(json_path, self.path, game)
+        self.assertEqual(len(qtable), len(MappedQTable(self.path, game=game)))
+        copy_path = os.path.join(self.dir, 'copy.json')
+        binary_to_json(self.path, copy_path)
+        with open(copy_path) as f:
+            copy = json.load(f)
+        self.assertEqual(set(str(state) for state in qtable), set(copy))
+        mapped = open_binary(json_path, game)
+        self.assertEqual(os.path.join(self.dir, 'qtable.bin'), mapped.path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+"""Test suite for Q-table memory accounting.
+
+To run:
+    python -m unittest -v tests.rl.test_memory.py
+
+"""
+
+
+import sys
+import unittest
+from game.connectfour import ConnectFour
+from game.tictactoe import TicTacToe
+from rl.agent import Agent
+from rl.memory import MemoryMeter
+from rl.qtable import QTable
+
+
+class TestMemoryMeter(unittest.TestCase):
+    """Collection of unittests for Q-table memory accounting."""
+
+    def full_size(self, qtable):
+        """Returns bytes of dict with every key and value object."""
+        return sys.getsizeof(qtable) + sum([sys.getsizeof(k) + sys.getsizeof(v) for k, v in qtable.items()])
+
+    def test_incremental(self):
+        """Test incremental bytes match a full count of keys and values."""
+        for game in [TicTacToe(), ConnectFour(rows=4, cols=5, hashed=True)]:
+            agent = Agent(game, qtable={})
+            meter = MemoryMeter()
+            history = agent.train(50, history=[], meter=meter)
+            self.assertEqual(self.full_size(agent.qtable), meter.measure(agent.qtable))
+            self.assertEqual(self.full_size(agent.qtable) / 1024.0, history[2][-1])
+            self.assertTrue(history[2][-1] > sys.getsizeof(agent.qtable) / 1024.0)
+
+    def test_detached(self):
+        """Test the meter is only attached while training with one."""
+        agent = Agent(TicTacToe(), qtable={})
+        history = agent.train(20, history=[])
+        self.assertEqual(None, agent.meter)
+        self.assertEqual(sys.getsizeof(agent.qtable) / 1024.0, history[2][-1])
+        self.assertEqual([], history[3])
+        meter = MemoryMeter()
+        agent.train(20, history=[], meter=meter)
+        self.assertEqual(None, agent.meter)
+        count = len(meter.samples)
+        entry_bytes = meter.entry_bytes
+        agent.qvalue('unseen')
+        self.assertEqual(count, len(meter.samples))
+        self.assertEqual(entry_bytes, meter.entry_bytes)
+
+    def test_start(self):
+        """Test tables trained before metering are counted in full."""
+        agent = Agent(TicTacToe(), qtable={})
+        agent.train(20, history=[])
+        meter = MemoryMeter(interval=10)
+        agent.train(20, history=[], meter=meter)
+        self.assertEqual(self.full_size(agent.qtable), meter.measure(agent.qtable))
+
+    def test_interval(self):
+        """Test samples every interval episodes and history of every episode."""
+        meter = MemoryMeter(interval=10)
+        agent = Agent(TicTacToe(), qtable={})
+        history = agent.train(50, history=[], meter=meter)
+        self.assertEqual(50, len(history[2]))
+        # First episode is always sampled
+        self.assertEqual([1, 10, 20, 30, 40, 50], [sample[0] for sample in history[3]])
+        self.assertEqual(history[3][0][1] / 1024.0, history[2][0])
+        self.assertEqual(history[3][0][1] / 1024.0, history[2][8])
+        self.assertEqual(history[3][1][1] / 1024.0, history[2][9])
+
+    def test_own_accounting(self):
+        """Test tables with their own accounting are measured by sys.getsizeof."""
+        qtable = QTable()
+        agent = Agent(ConnectFour(rows=4, cols=5, hashed=True), qtable=qtable)
+        history = agent.train_batched(20, batch_size=8, history=[], meter=MemoryMeter())
+        self.assertEqual(sys.getsizeof(qtable), history[3][-1][1])
+
+    def test_cross_check(self):
+        """Test full counts every check_every samples match the incremental bytes."""
+        meter = MemoryMeter(interval=10, check_every=2)
+        agent = Agent(TicTacToe(), qtable={})
+        agent.train(50, history=[], meter=meter)
+        counted = [sample[2] for sample in meter.samples]
+        self.assertEqual(None, counted[1])
+        self.assertEqual([sample[1] for sample in meter.samples][::2], counted[::2])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+"""Test suite for multiprocess actor/learner self-play.
+
+To run:
+    python -m unittest -v tests.rl.test_parallel.py
+
+"""
+
+
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+from game.chomp_young import YoungChomp
+from game.tictactoe import TicTacToe
+from rl.agent import Agent
+from rl.checkpoint import Checkpoint
+
+
+class CrashingTicTacToe(TicTacToe):
+    """Tic Tac Toe whose process dies on the 20th move made."""
+
+    moves = 0
+
+    def make_move(self, pos):
+        """Make move, exiting the process without cleanup on the 20th."""
+        self.moves += 1
+        if self.moves == 20:
+            os._exit(3)
+        return TicTacToe.make_move(self, pos)
+
+
+class TestParallel(unittest.TestCase):
+    """Collection of unittests for multiprocess actor/learner self-play."""
+
+    def test_train(self):
+        """Test every episode of every worker reaches the learner."""
+        np.random.seed(0)
+        agent = Agent(TicTacToe(), qtable={})
+        history = agent.train(101, history=[], workers=3)
+        self.assertEqual(101, len(history[1]))
+        self.assertEqual(101, len(history[2]))
+        self.assertTrue(any(value != 0.0 for value in agent.qtable.values()))
+        # Learner game is never played on
+        self.assertEqual(['-'] * 9, agent.game.board)
+
+    def test_actor_failure(self):
+        """Test the learner raises instead of waiting forever when an actor dies."""
+        agent = Agent(CrashingTicTacToe(), qtable={})
+        self.assertRaises(RuntimeError, agent.train, 100, history=[], workers=2)
+
+    def test_learn(self):
+        """Test learn matches update on the game position."""
+        game = YoungChomp(rows=4, cols=4)
+        agent = Agent(game, qtable={}, learning_rate=0.5)
+        observer = Agent(YoungChomp(rows=4, cols=4), qtable={}, learning_rate=0.5)
+        states, actions = game.get_open_moves()
+        state = states[0]
+        game.make_move(actions[0])
+        future, _ = game.get_open_moves()
+        agent.qtable[future[1]] = 0.5
+        observer.qtable[future[1]] = 0.5
+        agent.update(0.0, None, state)
+        observer.learn(state, 0.0, future, game.player == agent.player)
+        self.assertEqual(agent.qtable, observer.qtable)
+
+    def test_checkpoint(self):
+        """Test parallel training records checkpoints."""
+        path = tempfile.mkdtemp()
+        try:
+            game = TicTacToe()
+            checkpoint = Checkpoint(os.path.join(path, 'checkpoint'), game, interval=20)
+            agent = Agent(game, qtable={})
+            agent.train(60, history=[], checkpoint=checkpoint, workers=2)
+            restored = Agent(TicTacToe(), qtable={})
+            self.assertEqual(60, checkpoint.restore(restored))
+            self.assertEqual(agent.qtable, restored.qtable)
+        finally:
+            shutil.rmtree(path)
+
+
+if __name__ == '__main__':
+    unittest.main()
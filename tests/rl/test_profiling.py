@@ -0,0 +1,80 @@
+"""Test suite for profiling with hotspot reports.
+
+To run:
+    python -m unittest -v tests.rl.test_profiling.py
+
+"""
+
+
+import os
+import pstats
+import shutil
+import tempfile
+import unittest
+from game.tictactoe import TicTacToe
+from rl.agent import Agent
+from rl.profiling import SamplingProfiler, profile, relative, stats_hotspots
+
+try:
+    from StringIO import StringIO
+except ImportError:
+    from io import StringIO
+
+
+class TestProfiling(unittest.TestCase):
+    """Collection of unittests for profiling with hotspot reports."""
+
+    def setUp(self):
+        """Initialize output directory and agent."""
+        self.path = tempfile.mkdtemp()
+        self.agent = Agent(TicTacToe(), qtable={})
+
+    def tearDown(self):
+        """Remove output directory."""
+        shutil.rmtree(self.path)
+
+    def test_relative(self):
+        """Test paths are shown relative to the repository root."""
+        import game.tictactoe
+        self.assertEqual('game/tictactoe.py', relative(game.tictactoe.__file__.replace('.pyc', '.py')))
+        self.assertEqual('<string>', relative('<string>'))
+
+    def test_profile(self):
+        """Test cProfile run saves stats and reports only game and agent functions."""
+        out = StringIO()
+        prefix = os.path.join(self.path, 'run')
+        history = profile(lambda: self.agent.train(50, history=[]), prefix, out=out)
+        self.assertEqual(50, len(history[1]))
+        rows = stats_hotspots(pstats.Stats(prefix + '.pstats'))
+        functions = [row[0] for row in rows]
+        self.assertIn('rl/agent.py:step', functions)
+        self.assertIn('game/tictactoe.py:is_win', functions)
+        self.assertTrue(all(function.startswith(('game/', 'rl/agent.py')) for function in functions))
+        self.assertEqual(sorted([row[2] for row in rows], reverse=True), [row[2] for row in rows])
+        self.assertIn('rl/agent.py:step', out.getvalue())
+
+    def test_sampling(self):
+        """Test sampled stacks are folded and saved."""
+        out = StringIO()
+        prefix = os.path.join(self.path, 'run')
+        profile(lambda: self.agent.train(2000, history=[]), prefix, sampling=True, interval=1e-3, out=out)
+        with open(prefix + '.folded') as f:
+            lines = f.read().splitlines()
+        self.assertTrue(lines)
+        stack, count = lines[0].rsplit(' ', 1)
+        self.assertTrue(int(count) > 0)
+        self.assertTrue(any('rl/agent.py:train;' in line for line in lines))
+        self.assertIn('rl/agent.py', out.getvalue())
+
+    def test_hotspots(self):
+        """Test self time goes to the innermost matching function."""
+        profiler = SamplingProfiler(interval=0.5)
+        profiler.stacks = {'main.py:main;rl/agent.py:step;game/a.py:f;numpy:g': 2, 'rl/agent.py:step': 1}
+        rows = dict((row[0], row[2:]) for row in profiler.hotspots())
+        self.assertEqual((1.0, 1.0), rows['game/a.py:f'])
+        self.assertEqual((0.5, 1.5), rows['rl/agent.py:step'])
+        self.assertNotIn('numpy:g', rows)
+
+
+if __name__ == '__main__':
+    unittest.main()
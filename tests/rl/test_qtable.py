@@ -0,0 +1,89 @@
+"""Test suite for the array-backed Q-table.
+
+To run:
+    python -m unittest -v tests.rl.test_qtable.py
+
+"""
+
+
+import json
+import random
+import sys
+import unittest
+import numpy as np
+from rl.qtable import QTable
+
+
+class TestQTable(unittest.TestCase):
+    """Collection of unittests for the array-backed Q-table."""
+
+    def check_matches(self, make_key):
+        """Write random keys one at a time and in batches and check the table matches a dict."""
+        rng = random.Random(0)
+        qtable = QTable(capacity=4, dtype=np.float64)
+        expected = {}
+        for i in range(2000):
+            key = make_key(rng)
+            qtable[key] = i * 0.5
+            expected[key] = i * 0.5
+            keys = [make_key(rng) for k in range(5)] + [key, key]
+            values = [rng.random() for k in keys]
+            qtable.update_many(keys, values)
+            expected.update(zip(keys, values))
+        self.assertEqual(len(expected), len(qtable))
+        self.assertEqual(expected, dict(qtable))
+        for key, value in expected.items():
+            self.assertTrue(key in qtable)
+            self.assertEqual(value, qtable[key])
+        keys = list(expected)[:50]
+        self.assertEqual([expected[key] for key in keys], qtable.get_many(keys).tolist())
+        # Small batches are probed key by key, large ones vectorized
+        for count in [7, 50]:
+            keys = list(expected)[:count] + [make_key(rng) for k in range(count)]
+            keys += keys[-2:]
+            missing = [key not in expected for key in keys]
+            values = [expected.setdefault(key, 0.0) for key in keys]
+            result = qtable.setdefault_many(keys)
+            self.assertEqual(values, result[0].tolist())
+            self.assertEqual(missing, result[1].tolist())
+            self.assertEqual(expected, dict(qtable))
+
+    def test_integer_keys(self):
+        """Test 64 bit integer states, like Zobrist hashes."""
+        self.check_matches(lambda rng: rng.getrandbits(64))
+        self.check_matches(lambda rng: rng.randint(0, 3000))
+
+    def test_string_keys(self):
+        """Test String states of any length."""
+        self.check_matches(lambda rng: ''.join([rng.choice('XO-') for i in range(rng.randint(1, 12))]))
+
+    def test_missing(self):
+        """Test missing states."""
+        qtable = QTable()
+        self.assertFalse('X--------' in qtable)
+        self.assertEqual(None, qtable.get('X--------'))
+        self.assertRaises(KeyError, lambda: qtable['X--------'])
+        qtable['X--------'] = 1.0
+        self.assertEqual([1.0, -1.0], qtable.get_many(['X--------', '-X-------'], default=-1.0).tolist())
+        self.assertFalse('-X-------' in qtable)
+
+    def test_float32(self):
+        """Test default float32 values."""
+        qtable = QTable([(5, 0.1)])
+        self.assertEqual(float(np.float32(0.1)), qtable[5])
+
+    def test_json(self):
+        """Test json export of a dict copy."""
+        qtable = QTable({'X--------': 0.5, '-X-------': -0.25})
+        self.assertEqual({'X--------': 0.5, '-X-------': -0.25}, json.loads(json.dumps(dict(qtable))))
+
+    def test_memory(self):
+        """Test table arrays are counted by sys.getsizeof and stay small per entry."""
+        qtable = QTable()
+        qtable.update_many(list(range(100000)), np.zeros(100000))
+        self.assertTrue(sys.getsizeof(qtable) >= qtable.hashes.nbytes + qtable.qvalues.nbytes)
+        self.assertTrue(sys.getsizeof(qtable) / len(qtable) < 40)
+
+
+if __name__ == '__main__':
+    unittest.main()
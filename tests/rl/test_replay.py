@@ -0,0 +1,80 @@
+"""Test suite for experience replay ring buffer.
+
+To run:
+    python -m unittest -v tests.rl.test_replay.py
+
+"""
+
+
+import unittest
+import numpy as np
+from game.chomp import Chomp
+from game.connectfour import ConnectFour
+from game.tictactoe import TicTacToe
+from rl.agent import Agent
+from rl.qtable import QTable
+from rl.replay import ReplayBuffer
+
+
+class TestReplay(unittest.TestCase):
+    """Collection of unittests for experience replay ring buffer."""
+
+    def test_ring(self):
+        """Test oldest transitions are overwritten once full."""
+        buffer = ReplayBuffer(capacity=3, width=2)
+        for i in range(5):
+            buffer.add(i, 0.0, [], True)
+        self.assertEqual(3, len(buffer))
+        self.assertEqual(5, buffer.pending)
+        self.assertEqual([3, 4, 2], buffer.states.tolist())
+        self.assertRaises(ValueError, buffer.add, 5, 0.0, [1, 2, 3], True)
+
+    def test_for_game(self):
+        """Test buffers take their width and dtype from the game."""
+        buffer = ReplayBuffer.for_game(Chomp(rows=4, cols=4))
+        self.assertEqual(15, buffer.width)
+        self.assertEqual(object, buffer.states.dtype)
+        buffer = ReplayBuffer.for_game(ConnectFour(hashed=True))
+        self.assertEqual(7, buffer.width)
+        self.assertEqual(np.uint64, buffer.successors.dtype)
+
+    def test_targets(self):
+        """Test future value is max or min of next states and 0 if terminal."""
+        buffer = ReplayBuffer(capacity=4, width=3)
+        buffer.add(1, 0.0, [2, 3], True)
+        buffer.add(4, 0.0, [2, 3, 5], False)
+        buffer.add(6, 1.0, [], True)
+        values = {1: 0.5, 2: 0.25, 3: -0.5, 5: 1.0}
+        lookup = lambda keys: np.array([values.get(key, 0.0) for key in keys.tolist()])
+        states, current, targets = buffer.targets(np.array([0, 1, 2]), lookup, 0.5)
+        self.assertEqual([1, 4, 6], states.tolist())
+        self.assertEqual([0.5, 0.0, 0.0], current.tolist())
+        self.assertEqual([0.125, -0.25, 1.0], targets.tolist())
+
+    def test_replay_batch(self):
+        """Test batched update matches update of each transition."""
+        game = TicTacToe()
+        agent = Agent(game, qtable={}, learning_rate=0.5)
+        agent.replay = ReplayBuffer.for_game(game, capacity=8)
+        agent.qtable['XO-------'] = -0.5
+        game.make_move(0)
+        agent.update(0.0, None, 'X--------')
+        self.assertEqual(1, len(agent.replay))
+        self.assertNotIn('X--------', agent.qtable)
+        agent.replay_batch(1)
+        self.assertAlmostEqual(-0.225, agent.qtable['X--------'])
+
+    def test_train(self):
+        """Test training with replay on dict and QTable, String and integer states."""
+        for game, qtable in ((TicTacToe(), {}), (TicTacToe(), QTable()), (TicTacToe(hashed=True), QTable()),
+                             (Chomp(rows=4, cols=4), {})):
+            np.random.seed(0)
+            agent = Agent(game, qtable=qtable)
+            agent.replay = ReplayBuffer.for_game(game, capacity=1000, batch_size=64)
+            history = agent.train(100, history=[])
+            self.assertEqual(100, len(history[1]))
+            self.assertTrue(any(value != 0.0 for value in agent.qtable.values()))
+
+
+if __name__ == '__main__':
+    unittest.main()
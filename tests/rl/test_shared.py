@@ -0,0 +1,102 @@
+"""Test suite for Hogwild shared-memory Q-table.
+
+To run:
+    python -m unittest -v tests.rl.test_shared.py
+
+"""
+
+
+import multiprocessing
+import os
+import unittest
+import numpy as np
+from game.chomp_young import YoungChomp
+from game.tictactoe import TicTacToe
+from rl.agent import Agent
+from rl.shared import SharedQTable, enumerate_states
+
+
+def write(qtable, key, value):
+    """Set value of key in a forked process."""
+    qtable[key] = value
+
+
+class CrashingYoungChomp(YoungChomp):
+    """Young Chomp whose process dies on the 20th move made."""
+
+    moves = 0
+
+    def make_move(self, action):
+        """Make move, exiting the process without cleanup on the 20th."""
+        self.moves += 1
+        if self.moves == 20:
+            os._exit(3)
+        return YoungChomp.make_move(self, action)
+
+
+class TestShared(unittest.TestCase):
+    """Collection of unittests for Hogwild shared-memory Q-table."""
+
+    def test_enumerate_states(self):
+        """Test enumeration covers every reachable afterstate."""
+        states = enumerate_states(TicTacToe(symmetry=True))
+        self.assertEqual(764, len(states))
+        self.assertIn('--------X', states)
+        self.assertNotIn(None, states)
+
+    def test_mapping(self):
+        """Test indexed and overflow keys."""
+        qtable = SharedQTable(['a', 'b'])
+        self.assertEqual(0.0, qtable['a'])
+        qtable['b'] = 0.5
+        qtable['c'] = -1.0
+        self.assertEqual(0.5, qtable['b'])
+        self.assertEqual(-1.0, qtable.get('c'))
+        self.assertIsNone(qtable.get('d'))
+        self.assertEqual(1, qtable.misses)
+        self.assertEqual(3, len(qtable))
+        self.assertEqual({'a': 0.0, 'b': 0.5, 'c': -1.0}, dict(qtable.items()))
+
+    def test_shared_write(self):
+        """Test forked processes write to the same values."""
+        qtable = SharedQTable([1, 2])
+        process = multiprocessing.Process(target=write, args=(qtable, 2, 0.25))
+        process.start()
+        process.join()
+        self.assertEqual(0.25, qtable[2])
+        self.assertEqual(0.0, qtable[1])
+
+    def test_train(self):
+        """Test workers train the shared table without leaving the index."""
+        np.random.seed(0)
+        game = YoungChomp(rows=3, cols=3)
+        agent = Agent(game, qtable=SharedQTable(enumerate_states(game)))
+        history = agent.train(60, history=[], workers=3)
+        self.assertEqual(60, len(history[1]))
+        self.assertEqual(0, agent.qtable.misses)
+        self.assertTrue(any(value != 0.0 for value in agent.qtable.values()))
+
+    def test_train_misses(self):
+        """Test misses of workers reach the learner table."""
+        np.random.seed(0)
+        game = YoungChomp(rows=3, cols=3)
+        states = enumerate_states(game)
+        agent = Agent(game, qtable=SharedQTable(states[:len(states) // 2]))
+        agent.train(60, history=[], workers=3)
+        self.assertTrue(agent.qtable.misses > 0)
+        self.assertEqual({}, agent.qtable.overflow)
+
+    def test_worker_failure(self):
+        """Test training raises instead of waiting forever when a worker dies."""
+        game = CrashingYoungChomp(rows=3, cols=3)
+        agent = Agent(game, qtable=SharedQTable(enumerate_states(YoungChomp(rows=3, cols=3))))
+        self.assertRaises(RuntimeError, agent.train, 40, history=[], workers=2)
+
+    def test_checkpoint(self):
+        """Test Hogwild training refuses a start episode."""
+        agent = Agent(TicTacToe(), qtable=SharedQTable([]))
+        self.assertRaises(ValueError, agent.train, 60, [], None, 10, None, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
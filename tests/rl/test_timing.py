@@ -0,0 +1,79 @@
+"""Test suite for per-phase timing of training.
+
+To run:
+    python -m unittest -v tests.rl.test_timing.py
+
+"""
+
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+from game.tictactoe import TicTacToe
+from rl.agent import Agent
+from rl.timing import PhaseTimer
+
+try:
+    from StringIO import StringIO
+except ImportError:
+    from io import StringIO
+
+
+class TestTiming(unittest.TestCase):
+    """Collection of unittests for per-phase timing of training."""
+
+    def test_phases(self):
+        """Test phases are counted and methods restored after training."""
+        np.random.seed(0)
+        agent = Agent(TicTacToe(), qtable={})
+        random_sample = np.random.random_sample
+        timer = PhaseTimer(interval=10)
+        agent.train(50, history=[], timer=timer)
+        summary = timer.summary()
+        steps = summary['make_move'][0]
+        self.assertEqual(steps, summary['is_win'][0])
+        self.assertEqual(steps, summary['update'][0])
+        self.assertTrue(summary['rng'][0] >= steps)
+        self.assertTrue(summary['qvalue'][0] > 0)
+        self.assertEqual(50, timer.episodes)
+        self.assertEqual([10, 20, 30, 40, 50], [sample['episode'] for sample in timer.samples])
+        self.assertTrue(all(sample['steps_per_second'] > 0 for sample in timer.samples))
+        # Unwrapped once stopped
+        self.assertNotIn('update', agent.__dict__)
+        self.assertNotIn('make_move', agent.game.__dict__)
+        self.assertIs(random_sample, np.random.random_sample)
+
+    def test_progress(self):
+        """Test progress line is printed every sample."""
+        out = StringIO()
+        agent = Agent(TicTacToe(), qtable={})
+        agent.train(20, history=[], timer=PhaseTimer(interval=10, progress=True, out=out))
+        self.assertEqual(2, out.getvalue().count('\rEpisode'))
+        self.assertIn('steps/s', out.getvalue())
+
+    def test_save(self):
+        """Test samples are written as JSON and CSV."""
+        agent = Agent(TicTacToe(), qtable={})
+        timer = PhaseTimer(interval=10)
+        agent.train(20, history=[], timer=timer)
+        path = tempfile.mkdtemp()
+        try:
+            timer.save_json(os.path.join(path, 'timing.json'))
+            with open(os.path.join(path, 'timing.json')) as f:
+                data = json.load(f)
+            self.assertEqual(2, len(data['samples']))
+            self.assertIn('make_move', data['phases'])
+            timer.save_csv(os.path.join(path, 'timing.csv'))
+            with open(os.path.join(path, 'timing.csv')) as f:
+                lines = f.read().splitlines()
+            self.assertEqual(3, len(lines))
+            self.assertTrue(lines[0].startswith('episode,seconds,episodes_per_second,steps_per_second'))
+        finally:
+            shutil.rmtree(path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+"""Test suite for the alpha-beta Connect Four solver.
+
+To run:
+    python -m unittest -v tests.solver.test_connectfour.py
+
+"""
+
+
+import random
+import unittest
+from game.connectfour import ConnectFour
+from game.connectfour_bitboard import BitboardConnectFour
+from rl.agent import Agent
+from solver.connectfour import ConnectFourSolver
+
+
+class TestConnectFourSolver(unittest.TestCase):
+    """Collection of unittests for the alpha-beta Connect Four solver."""
+
+    def setUp(self):
+        """Initialize solver and Connect Four game instance."""
+        self.solver = ConnectFourSolver(depth=4)
+        self.game = ConnectFour()
+
+    def play(self, game, moves):
+        """Make moves on game."""
+        for col in moves:
+            game.make_move(col)
+
+    def test_center_first(self):
+        """Test empty board opens in the center column."""
+        self.assertEqual([3, 2, 4, 1, 5, 0, 6], self.solver.order)
+        self.assertEqual(3, self.solver.select_move(self.game))
+
+    def test_immediate_win(self):
+        """Test solver completes a four when it can."""
+        self.play(self.game, [0, 6, 1, 6, 2, 5])
+        self.assertEqual(3, self.solver.select_move(self.game))
+
+    def test_block(self):
+        """Test solver blocks the opponent four."""
+        self.play(self.game, [0, 6, 1, 6, 2])
+        self.assertEqual(3, self.solver.select_move(self.game))
+
+    def test_load(self):
+        """Test bitboards loaded from the board match BitboardConnectFour."""
+        game = BitboardConnectFour()
+        self.play(game, [3, 3, 2, 4, 4, 0])
+        position, mask, moves = self.solver.load(game)
+        self.assertEqual(6, moves)
+        self.assertEqual(game.bitboards['X'] | game.bitboards['O'], mask)
+        self.assertEqual(game.bitboards[game.player], position)
+
+    def test_node_limit(self):
+        """Test search stops within the node budget and still returns a legal move."""
+        solver = ConnectFourSolver(depth=12, node_limit=50)
+        col = solver.select_move(self.game)
+        self.assertTrue(self.game.is_valid_move(col))
+        self.assertTrue(solver.stats()['nodes'] <= 50)
+
+    def test_stats(self):
+        """Test statistics count nodes and transposition table hits."""
+        self.solver.select_move(self.game)
+        stats = self.solver.stats()
+        self.assertTrue(stats['nodes'] > 0)
+        self.assertTrue(stats['tt_probes'] >= stats['tt_hits'] > 0)
+        self.assertTrue(0 < stats['tt_hit_rate'] <= 1)
+
+    def test_beats_random(self):
+        """Test solver never loses to random moves on a small board."""
+        rng = random.Random(0)
+        game = ConnectFour(rows=4, cols=5, window=None)
+        solver = ConnectFourSolver(rows=4, cols=5, depth=4)
+        for episode in range(10):
+            winner = None
+            while not winner:
+                if game.player == 'X':
+                    winner = game.make_move(solver.select_move(game))
+                else:
+                    winner = game.make_move(rng.choice(game.get_actions()))
+            self.assertNotEqual('O', winner)
+            game.reset()
+
+    def test_evaluate(self):
+        """Test agent evaluation against solver returns rates of every result."""
+        agent = Agent(ConnectFour(rows=4, cols=5), qtable={})
+        solver = ConnectFourSolver(rows=4, cols=5, depth=2)
+        for first in [True, False]:
+            rates = agent.evaluate(solver, episodes=5, first=first)
+            self.assertAlmostEqual(1.0, sum(rates))
+            self.assertTrue(rates[2] > 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
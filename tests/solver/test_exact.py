@@ -0,0 +1,97 @@
+"""Test suite for the exact memoized solvers.
+
+To run:
+    python -m unittest -v tests.solver.test_exact.py
+
+"""
+
+
+import unittest
+from game.chomp import Chomp
+from game.chomp_young import YoungChomp
+from game.tictactoe import TicTacToe
+from game.tictactoe_bitmask import BitmaskTicTacToe
+from rl.agent import Agent
+from solver.exact import ChompSolver, ExactSolver
+
+
+class TestExactSolver(unittest.TestCase):
+    """Collection of unittests for the exact memoized solvers."""
+
+    def test_tictactoe(self):
+        """Test every reachable Tic Tac Toe state is solved and the game is a draw."""
+        solver = ExactSolver(TicTacToe())
+        qtable = solver.solve()
+        # 5478 reachable positions less the empty board
+        self.assertEqual(5477, len(qtable))
+        self.assertEqual(0.0, solver.search(None))
+        self.assertEqual(1.0, qtable['XXXOO----'])
+        self.assertEqual(-1.0, qtable['XX-OOOX--'])
+        # Center after corner is the only draw
+        self.assertEqual(0.0, qtable['X---O----'])
+        self.assertEqual(1.0, qtable['X-O------'])
+
+    def test_key_formats(self):
+        """Test solutions use the state keys of symmetric and hashed games."""
+        strings = ExactSolver(TicTacToe()).solve()
+        symmetric = ExactSolver(TicTacToe(symmetry=True)).solve()
+        indices = ExactSolver(BitmaskTicTacToe(hashed=True)).solve()
+        game = TicTacToe(symmetry=True)
+        self.assertEqual(764, len(symmetric))
+        self.assertEqual(len(strings), len(indices))
+        for state, value in strings.items():
+            self.assertEqual(value, symmetric[game.canonical(state)])
+
+    def test_discount(self):
+        """Test discounted values are the fixed point of Agent.update."""
+        game = TicTacToe()
+        qtable = ExactSolver(game, discount=0.9).solve()
+        agent = Agent(game, qtable=dict(qtable), learning_rate=1.0, discount=0.9, epsilon=0.0)
+        for episode in range(10):
+            winner = None
+            while not winner:
+                winner, reward = agent.step()
+            game.reset()
+        self.assertEqual(qtable, agent.qtable)
+
+    def test_policy_error_rate(self):
+        """Test solution has no policy errors and an empty table has some."""
+        solver = ExactSolver(TicTacToe())
+        qtable = solver.solve()
+        self.assertEqual(0.0, solver.policy_error_rate(qtable))
+        self.assertTrue(0.0 < solver.policy_error_rate({}) < 1.0)
+        flipped = dict([(state, -value) for state, value in qtable.items()])
+        self.assertTrue(solver.policy_error_rate(flipped) > solver.policy_error_rate({}))
+
+    def test_chomp(self):
+        """Test square Chomp is a first player win."""
+        solver = ExactSolver(Chomp(rows=3, cols=3))
+        solver.solve()
+        self.assertEqual(1.0, solver.search(None))
+
+    def test_chomp_solver(self):
+        """Test Young diagram solver matches ExactSolver for every key format."""
+        for game in [YoungChomp(rows=4, cols=4), YoungChomp(rows=3, cols=5, hashed=True)]:
+            exact = ExactSolver(game).solve()
+            solver = ChompSolver(game)
+            qtable = solver.solve()
+            for state, value in exact.items():
+                self.assertEqual(value, qtable[state])
+            self.assertEqual(0.0, solver.policy_error_rate(qtable))
+            self.assertTrue(solver.policy_error_rate({}) > 0.0)
+        self.assertRaises(ValueError, ChompSolver, Chomp())
+        self.assertRaises(ValueError, ChompSolver, YoungChomp(history=True))
+
+    def test_chomp_solver_large(self):
+        """Test Young diagram solver reaches boards beyond 4x4."""
+        solver = ChompSolver(YoungChomp(rows=6, cols=7, hashed=True))
+        qtable = solver.solve()
+        # Rectangular boards are first player wins
+        self.assertTrue(solver.wins[solver.pack((6,) * 7)])
+        # Every diagram holding the poison block
+        self.assertEqual(1715, len(solver.wins))
+        self.assertEqual(2 * 1714, len(qtable))
+
+
+if __name__ == '__main__':
+    unittest.main()